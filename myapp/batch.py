@@ -0,0 +1,243 @@
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from .big_m import SimplexBigM
+from .limits import LimitReached, SolveLimits
+
+
+def solve_batch(problems, tolerance=1e-8, max_iterations=None, time_limit=None):
+    """Resolve muitos PLs pelo Big M, empilhando os de mesmo formato
+
+    `problems` é uma lista de dicts com c, A, b e opcionalmente sense,
+    constraints_type, lower e upper. Os tableaus de mesmo formato (m, colunas) são empilhados
+    em arrays 3-D e precificação, teste da razão e pivotamento são feitos para
+    o lote inteiro de uma vez. Retorna uma lista de resultados na mesma ordem;
+    problemas inválidos, ilimitados ou infactíveis recebem {'status': 'error',
+    'error': ...}; os resolvidos, 'status': 'optimal'; e os que atingem
+    `max_iterations` pivôs ou o prazo de `time_limit` segundos (contado do
+    início do lote), {'status': 'limit_reached', ...}. Problemas com limites
+    nas variáveis precisam do teste da razão com limites e são resolvidos um a
+    um por SimplexBigM.solve(); o mesmo vale para quem estaciona no lote por
+    SimplexBigM.STALL_PIVOTS pivôs, que continua dali com a regra de Bland.
+    """
+    limits = SolveLimits(max_iterations, time_limit)
+    limits.start()
+    results = [None] * len(problems)
+    groups = {}
+
+    for index, problem in enumerate(problems):
+        try:
+            solver = SimplexBigM(problem['c'], problem['A'], problem['b'],
+                                 sense=problem.get('sense', 'max'),
+                                 constraints_type=problem.get('constraints_type', None),
+                                 method='bigm', lower=problem.get('lower', None), upper=problem.get('upper', None))
+            if len(solver.c_original) != solver.n:
+                raise ValueError("Dimensões incompatíveis entre A e c")
+            if solver.bounds.active:
+                results[index] = _solve_single(solver, limits)
+                continue
+            tableau, c_extended, b, base, artificial_vars, _ = solver._build_tableau()
+            if sp.issparse(tableau):
+                tableau = tableau.toarray()
+        except KeyError as e:
+            results[index] = {'status': 'error', 'error': f"Campo obrigatório ausente: {e}"}
+            continue
+        except Exception as e:
+            results[index] = {'status': 'error', 'error': str(e)}
+            continue
+
+        groups.setdefault(tableau.shape, []).append((index, solver, tableau, c_extended, b, base, artificial_vars))
+
+    for members in groups.values():
+        for index, result in _solve_stacked(members, tolerance, limits):
+            results[index] = result
+
+    return results
+
+
+def _solve_stacked(members, tolerance, limits):
+    """Simplex Big M vetorizado sobre um lote de tableaus (k, m, N)
+
+    Usa a regra de Dantzig para o lote inteiro. Um problema cujo objetivo
+    não melhora por STALL_PIVOTS pivôs seguidos (possível ciclagem) sai do
+    lote e segue sozinho em SimplexBigM a partir da base em que parou.
+    """
+    T = np.stack([member[2] for member in members])
+    c = np.stack([member[3] for member in members])
+    b = np.stack([member[4] for member in members])
+    base = np.array([member[5] for member in members], dtype=int)
+    k, m, n_cols = T.shape
+
+    ids = np.arange(k)  # posição em `members` de cada problema ainda ativo
+    iterations = np.zeros(k, dtype=int)
+    stalled = np.zeros(k, dtype=int)
+    in_base = np.zeros((k, n_cols), dtype=bool)
+    np.put_along_axis(in_base, base, True, axis=1)
+    objective = np.einsum('km,km->k', np.take_along_axis(c, base, axis=1), b)
+
+    finished = []
+    stalled_out = []
+    while ids.size:
+        rows_k = np.arange(ids.size)
+
+        # Custos reduzidos de todos os problemas: c - c_B · T
+        c_base = np.take_along_axis(c, base, axis=1)
+        rc = c - np.einsum('km,kmn->kn', c_base, T)
+        rc[in_base] = -np.inf
+
+        entering = np.argmax(rc, axis=1)
+        optimal = rc[rows_k, entering] <= tolerance
+
+        # Teste da razão em lote
+        column = T[rows_k, :, entering]
+        positive = column > tolerance
+        unbounded = ~optimal & ~positive.any(axis=1)
+        ratios = np.full((ids.size, m), np.inf)
+        np.divide(b, column, out=ratios, where=positive)
+        leaving = np.argmin(ratios, axis=1)
+
+        # Limites: pivôs de cada problema e o prazo do lote inteiro
+        reason = None
+        limited = ~(optimal | unbounded)
+        if limits.deadline is not None and time.monotonic() >= limits.deadline:
+            reason = 'time'
+        elif limits.max_iterations is not None:
+            reason = 'iterations'
+            limited &= iterations[ids] >= limits.max_iterations
+        else:
+            limited[:] = False
+
+        done = optimal | unbounded | limited
+        for position in np.flatnonzero(done):
+            finished.append((ids[position], bool(unbounded[position]), reason if limited[position] else None,
+                             T[position], c[position], b[position], base[position]))
+
+        pivoting = np.flatnonzero(~done)
+        if pivoting.size:
+            p_rows = leaving[pivoting]
+            p_cols = entering[pivoting]
+
+            pivot_row = T[pivoting, p_rows] / column[pivoting, p_rows][:, None]
+            pivot_b = b[pivoting, p_rows] / column[pivoting, p_rows]
+
+            factors = column[pivoting]
+            factors[np.arange(pivoting.size), p_rows] = 0.0
+            T[pivoting] -= factors[:, :, None] * pivot_row[:, None, :]
+            b[pivoting] -= factors * pivot_b[:, None]
+            T[pivoting, p_rows] = pivot_row
+            b[pivoting, p_rows] = pivot_b
+            T[pivoting, :, p_cols] = 0.0
+            T[pivoting, p_rows, p_cols] = 1.0
+
+            in_base[pivoting, base[pivoting, p_rows]] = False
+            in_base[pivoting, p_cols] = True
+            base[pivoting, p_rows] = p_cols
+            iterations[ids[pivoting]] += 1
+
+            # Pivôs degenerados seguidos contam como estacionamento, como em
+            # PrimalSimplex._run_simplex
+            moved = ids[pivoting]
+            previous = objective[moved]
+            objective[moved] = np.einsum('km,km->k', np.take_along_axis(c[pivoting], base[pivoting], axis=1),
+                                         b[pivoting])
+            improved = objective[moved] > previous + tolerance * np.maximum(1.0, np.abs(previous))
+            stalled[moved] = np.where(improved, 0, stalled[moved] + 1)
+
+            leaving_batch = stalled[moved] >= SimplexBigM.STALL_PIVOTS
+            for position in pivoting[leaving_batch]:
+                stalled_out.append((ids[position], base[position].copy()))
+            pivoting = pivoting[~leaving_batch]
+
+        # Compactar: manter apenas os problemas que ainda pivotam
+        T, c, b, base, in_base = T[pivoting], c[pivoting], b[pivoting], base[pivoting], in_base[pivoting]
+        ids = ids[pivoting]
+
+    for position, unbounded, limited, tableau, costs, rhs, final_base in finished:
+        index, solver, _, _, _, _, artificial_vars = members[position]
+        yield index, _batch_result(solver, unbounded, limited, costs, rhs, final_base,
+                                   artificial_vars, int(iterations[position]))
+
+    for position, final_base in stalled_out:
+        index, solver = members[position][:2]
+        solver.warm_base = [int(v) for v in final_base]
+        yield index, _solve_single(solver, limits, int(iterations[position]))
+
+
+def _solve_single(solver, limits, iterations=0):
+    """Resultado de um membro do lote resolvido sozinho, no formato de _batch_result
+
+    Os `iterations` pivôs já feitos no lote e o prazo do lote contam para os
+    limites deste solve.
+    """
+    if limits.max_iterations is not None:
+        solver.limits.max_iterations = max(limits.max_iterations - iterations, 0)
+    if limits.deadline is not None:
+        solver.limits.time_limit = max(limits.deadline - time.monotonic(), 0.0)
+    try:
+        solution, obj_value = solver.solve()
+    except LimitReached as limit:
+        partial = limit.partial
+        return {
+            'status': 'limit_reached',
+            'reason': limit.reason,
+            'message': str(LimitReached(limit.reason, iterations + solver.iterations)),
+            'solution': partial['solution'],
+            'objective': partial['objective'],
+            'feasible': partial['feasible'],
+            'base': partial['base'],
+            'iterations': iterations + solver.iterations,
+        }
+    except ValueError as e:
+        return {'status': 'error', 'error': str(e)}
+    return {
+        'status': 'optimal',
+        'solution': solution.tolist(),
+        'optimal_value': obj_value,
+        'base': solver.base,
+        'iterations': iterations + solver.iterations,
+    }
+
+
+def _batch_result(solver, unbounded, limited, costs, rhs, base, artificial_vars, iterations):
+    """Mesmas verificações e extração de SimplexBigM.solve para um membro do lote
+
+    `limited` é o motivo da parada por limite ('iterations' ou 'time') ou None.
+    """
+    if unbounded:
+        return {'status': 'error', 'error': "Problema ilimitado"}
+
+    artificial_mask = np.zeros(costs.shape[0], dtype=bool)
+    artificial_mask[artificial_vars] = True
+    solution = np.zeros(costs.shape[0])
+    solution[base] = rhs
+
+    if limited:
+        # Base em que o lote parou, como a 'partial' de LimitReached
+        partial = solver.scaling.solution(solution[:solver.n])
+        return {
+            'status': 'limit_reached',
+            'reason': limited,
+            'message': str(LimitReached(limited, iterations)),
+            'solution': partial.tolist(),
+            'objective': float(solver.c_original @ partial),
+            'feasible': bool(np.all(np.abs(rhs[artificial_mask[base]]) <= 1e-6)),
+            'base': base.tolist(),
+            'iterations': iterations,
+        }
+
+    if np.any(np.abs(rhs[artificial_mask[base]]) > 1e-6):
+        return {'status': 'error', 'error': "Problema infactível - variável artificial não-zero na solução ótima"}
+
+    obj_value = float(costs[base] @ rhs + solver.M * solution[artificial_mask].sum())
+    if solver.sense == 'min':
+        obj_value = -obj_value
+
+    return {
+        'status': 'optimal',
+        'solution': solver.scaling.solution(solution[:solver.n]).tolist(),
+        'optimal_value': obj_value,
+        'base': base.tolist(),
+        'iterations': iterations,
+    }
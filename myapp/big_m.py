@@ -1,211 +1,443 @@
-from django.db import models
 import numpy as np
+import scipy.sparse as sp
+from scipy.linalg import lstsq, lu_factor, lu_solve
+from scipy.sparse.linalg import splu
 
-import matplotlib.pyplot as plt
-from matplotlib.patches import Polygon
-from itertools import combinations
+from .bounds import Bounds
+from .limits import LimitReached, SolveLimits
+from .presolve import Presolve
+from .pricing import Bland, make_pricing
+from .scaling import Scaling
+from .simplex_engine import PrimalSimplex, TableauEngine, RevisedSimplexEngine
 import warnings
 warnings.filterwarnings('ignore')
 
-class SimplexBigM:
-    def __init__(self, c, A, b, sense='max', constraints_type=None):
+class SimplexBigM(PrimalSimplex):
+    METHODS = ('bigm', 'revised', 'two_phase')
+    
+    def __init__(self, c, A, b, sense='max', constraints_type=None, method=None, base=None,
+                 trace=None, presolve=False, scaling=True, pricing=None, max_iterations=None,
+                 time_limit=None, lower=None, upper=None, at_upper=None):
         self.c_original = np.array(c, dtype=float)
-        self.A_original = np.array(A, dtype=float)
+        # Matrizes scipy.sparse (CSR/CSC) são mantidas esparsas
+        self.sparse = sp.issparse(A)
+        if self.sparse:
+            self.A_original = sp.csc_matrix(A, dtype=float)
+        else:
+            self.A_original = np.array(A, dtype=float)
         self.b_original = np.array(b, dtype=float)
         self.sense = sense
         self.constraints_type = constraints_type or ['<='] * len(b)
         self.M = 1e6  # Valor grande
         
+        # Entrada esparsa usa o simplex revisado por padrão: o tableau denso
+        # perderia a esparsidade já no primeiro pivô
+        if method is None:
+            method = 'revised' if self.sparse else 'bigm'
+        if method not in self.METHODS:
+            raise ValueError(f"Método desconhecido: {method}")
+        self.method = method
+        
+        # Base de partida opcional (warm start), p.ex. a `base` de uma solução
+        # anterior do mesmo modelo com algum coeficiente alterado
+        self.warm_base = None if base is None else [int(v) for v in base]
+        # Com limites, as não-básicas que estavam no limite superior nessa base
+        self.warm_at_upper = [] if at_upper is None else [int(v) for v in at_upper]
+        
+        # Sink de eventos (myapp.trace); None desliga o rastreamento
+        self.trace = trace
+        
+        # Reduções antes do simplex (myapp.presolve); a base e var_types
+        # passam a descrever o modelo reduzido, então não combinam com warm start
+        if presolve and base is not None:
+            raise ValueError("Base de partida não pode ser usada com presolve")
+        self.presolve = presolve
+        self.presolved = None
+        
+        # Escala automática de linhas e colunas (myapp.scaling): o tableau é
+        # montado sobre o modelo escalado e solução e duais são desescalados
+        self.auto_scaling = scaling
+        m, n = self.A_original.shape
+        self.scaling = Scaling.for_matrix(self.A_original) if scaling else Scaling.identity(m, n)
+        
+        # Regra da variável entrante (myapp.pricing): 'dantzig' (padrão),
+        # 'devex', 'steepest_edge', 'partial' ou 'multiple'
+        self.pricing = make_pricing(pricing)
+        
+        # Limite de pivôs e prazo em segundos (None desliga); ao atingi-los
+        # solve() levanta LimitReached com a melhor base em `partial`
+        self.limits = SolveLimits(max_iterations, time_limit)
+        self.fallback = Bland()
+        
+        # Limites l <= x <= u por variável (myapp.bounds), tratados pelo teste
+        # da razão dos engines em vez de linhas extras; None: x >= 0
+        self.bounds = Bounds(n, lower, upper)
+        
+        # Preenchidos por solve(): base final, tipo de cada coluna, não-básicas
+        # no limite superior, pivôs e duais (y_i = ∂valor ótimo/∂b_i de cada
+        # restrição original)
+        self.base = None
+        self.at_upper = []
+        self.var_types = None
+        self.iterations = 0
+        self.warm_started = False
+        self.engine = None
+        self.duals = None
+        
         self.m, self.n = self.A_original.shape
     
     def solve(self):
-        """Método Big M"""
-        print("\n=== MÉTODO BIG M ===")
-        print(f"Usando M = {self.M}")
+        """Método Big M
+
+        Com method='bigm' o tableau completo é atualizado a cada pivô; com
+        method='revised' apenas a fatoração LU da base é mantida e as colunas
+        são precificadas sob demanda (simplex revisado). Com method='two_phase'
+        a penalidade M é substituída pelas Fases I e II.
+
+        Ao final, `self.base` e `self.var_types` descrevem a base ótima no
+        layout de colunas de _build_tableau(); essa base pode ser passada como
+        `base=` numa nova solução para partir dela em vez da base inicial.
+        Com presolve=True o simplex roda sobre o modelo reduzido e solução e
+        duais são levados de volta ao modelo original. Com scaling=True
+        (padrão) o simplex pivota sobre o modelo escalado (myapp.scaling) e
+        solução e duais são desescalados na saída. Limites lower/upper são
+        aplicados antes da escala e desfeitos depois dela (myapp.bounds).
+
+        Se o objetivo estaciona por STALL_PIVOTS pivôs a regra de Bland
+        assume até ele voltar a melhorar. Ao atingir max_iterations ou
+        time_limit levanta LimitReached (um ValueError) com a base atual.
+        """
+        self.limits.start()
+        if self.presolve:
+            return self._solve_presolved()
+        
+        tableau, c_extended, b, base, artificial_vars, var_types = self._build_tableau()
+        
+        if self.trace is not None:
+            self.trace.emit({'event': 'start', 'method': self.method, 'M': self.M,
+                             'artificial': list(artificial_vars), 'pricing': self.pricing.name})
+            if self.scaling.active:
+                self.trace.emit(dict(self.scaling.stats(), event='scaling'))
+            if self.bounds.active:
+                self.trace.emit(dict(self.bounds.stats(), event='bounds'))
+        
+        self.iterations = 0
+        self.warm_started = False
+        self.var_types = var_types
+        
+        try:
+            if self.method == 'two_phase':
+                engine, final_base = self._solve_two_phase(tableau, c_extended, b, base, artificial_vars)
+                artificial_vars = []  # removidas ao final da Fase I
+            else:
+                engine_class = RevisedSimplexEngine if self.method == 'revised' else TableauEngine
+                engine = engine_class(tableau, c_extended, b, base, upper=self.column_upper)
+                if not self._warm_start(engine):
+                    engine = engine_class(tableau, c_extended, b, base, upper=self.column_upper)
+                self._run_simplex(engine)
+                final_base = engine.base
+                self.at_upper = [int(v) for v in np.flatnonzero(engine.at_upper)]
+        except LimitReached as limit:
+            self._limit_reached(limit, artificial_vars)
+            raise
+        
+        self.base = [int(v) for v in final_base]
+        self.engine = engine
+        self.artificial_vars = artificial_vars
+        
+        # Verificar se há variáveis artificiais na base com valor não-zero
+        artificial_mask = np.zeros(engine.n_cols, dtype=bool)
+        artificial_mask[artificial_vars] = True
+        basic_artificial = artificial_mask[engine.base]
+        if np.any(np.abs(engine.b[basic_artificial]) > 1e-6):
+            raise ValueError("Problema infactível - variável artificial não-zero na solução ótima")
+        
+        # Extrair solução
+        solution = engine.solution()
+        self.duals = self._duals(tableau, c_extended)
+        
+        # Remover contribuição das variáveis artificiais (que devem ser zero)
+        obj_value = engine.objective_value() + self.M * solution[artificial_mask].sum()
         
-        # Converter para maximização se necessário
         if self.sense == 'min':
-            c = -self.c_original
-        else:
-            c = self.c_original.copy()
-        
-        A = self.A_original.copy()
-        b = self.b_original.copy()
-        
-        # Tornar todos os b não-negativos
-        for i in range(self.m):
-            if b[i] < 0:
-                A[i] *= -1
-                b[i] *= -1
-                # Inverter tipo da restrição
-                if self.constraints_type[i] == '<=':
-                    self.constraints_type[i] = '>='
-                elif self.constraints_type[i] == '>=':
-                    self.constraints_type[i] = '<='
-        
-        # Construir tableau com variáveis de folga e artificiais
-        tableau_cols = []
-        c_extended = list(c)
-        base = []
-        artificial_vars = []
-        var_types = []  # Tipo de cada variável: 'original', 'slack', 'artificial'
-        
-        # Variáveis originais
-        for j in range(self.n):
-            col = np.zeros(self.m)
-            for i in range(self.m):
-                col[i] = A[i, j]
-            tableau_cols.append(col)
-            var_types.append('original')
-        
-        # Processar cada restrição
-        for i, constraint in enumerate(self.constraints_type):
-            if constraint == '<=':
-                # Adicionar variável de folga
-                col = np.zeros(self.m)
-                col[i] = 1
-                tableau_cols.append(col)
-                c_extended.append(0)
-                base.append(len(tableau_cols) - 1)
-                var_types.append('slack')
-                
-            elif constraint == '>=':
-                # Adicionar variável de folga negativa
-                col = np.zeros(self.m)
-                col[i] = -1
-                tableau_cols.append(col)
-                c_extended.append(0)
-                var_types.append('slack')
-                
-                # Adicionar variável artificial
-                col = np.zeros(self.m)
-                col[i] = 1
-                tableau_cols.append(col)
-                c_extended.append(-self.M)
-                base.append(len(tableau_cols) - 1)
-                artificial_vars.append(len(tableau_cols) - 1)
-                var_types.append('artificial')
-                
-            else:  # '='
-                # Adicionar variável artificial
-                col = np.zeros(self.m)
-                col[i] = 1
-                tableau_cols.append(col)
-                c_extended.append(-self.M)
-                base.append(len(tableau_cols) - 1)
-                artificial_vars.append(len(tableau_cols) - 1)
-                var_types.append('artificial')
+            obj_value = -obj_value
+        obj_value += self.bounds.constant(self.c_original)
         
-        # Construir tableau
-        tableau = np.column_stack(tableau_cols)
-        c_extended = np.array(c_extended)
+        return self.bounds.solution(self.scaling.solution(solution[:self.n])), obj_value
+    
+    def _solve_presolved(self):
+        """Presolve, simplex no modelo reduzido (mesmo método) e postsolve
+
+        O presolve trabalha já nas variáveis x' de self.bounds (0 <= x' <= u'),
+        e os limites do modelo reduzido seguem nativos para o simplex.
+        """
+        c, A, b = self.bounds.model(self.c_original, self.A_original, self.b_original)
+        reduction = Presolve(c, A, b, self.sense, self.constraints_type, upper=self.bounds.width)
+        self.presolved = reduction
+        if self.trace is not None:
+            self.trace.emit(dict(reduction.stats(), event='presolve'))
         
-        print(f"Variáveis artificiais: {[f'x_{v+1}' for v in artificial_vars]}")
+        self.base, self.var_types, self.iterations = [], [], 0
         
-        iteration = 0
-        print(f"Tableau inicial:")
-        self._print_tableau(tableau, c_extended, b, base)
+        def solve_reduced(c, A, b, constraints_type, upper):
+            solver = SimplexBigM(c, A, b, sense=self.sense, constraints_type=constraints_type,
+                                 method=self.method, trace=self.trace, scaling=self.auto_scaling,
+                                 pricing=self.pricing.name, max_iterations=self.limits.max_iterations,
+                                 time_limit=self.limits.time_limit, upper=upper)
+            try:
+                solution, _ = solver.solve()
+            finally:
+                self.base, self.var_types, self.iterations = solver.base, solver.var_types, solver.iterations
+                self.at_upper = solver.at_upper
+                self.engine, self.scaling, self.pricing = solver.engine, solver.scaling, solver.pricing
+            return solution, solver.duals
+        
+        try:
+            solution, self.duals = reduction.solve(solve_reduced)
+        except LimitReached as limit:
+            # Solução parcial levada ao modelo original (a base segue a do reduzido)
+            partial = limit.partial
+            solution, _ = reduction.postsolve(partial['solution'], np.zeros(reduction.rows.size))
+            solution = self.bounds.solution(solution)
+            limit.partial = dict(partial, solution=solution.tolist(),
+                                 objective=float(self.c_original @ solution))
+            raise
+        solution = self.bounds.solution(solution)
+        return solution, float(self.c_original @ solution)
+    
+    def _limit_reached(self, limit, artificial_vars):
+        """Preenche limit.partial com a base em que o simplex parou
+
+        No simplex primal o objetivo nunca piora, então essa é a melhor base
+        encontrada; ela só é factível se nenhuma artificial ficou positiva.
+        """
+        if self.trace is not None:
+            self.trace.emit({'event': 'limit', 'reason': limit.reason, 'message': str(limit)})
+        engine = limit.engine
+        columns = np.arange(engine.n_cols) if limit.columns is None else limit.columns
+        values = np.zeros(len(self.var_types))
+        values[columns] = engine.solution()
+        feasible = bool(np.all(engine.b >= -1e-9) and np.all(engine.b <= engine.upper[engine.base] + 1e-9)
+                        and np.all(np.abs(values[artificial_vars]) <= 1e-6))
         
+        solution = self.bounds.solution(self.scaling.solution(values[:self.n]))
+        self.base = [int(v) for v in columns[engine.base]]
+        self.at_upper = [int(v) for v in columns[engine.at_upper]]
+        self.engine = engine
+        limit.partial = {
+            'base': self.base,
+            'var_types': self.var_types,
+            'solution': solution.tolist(),
+            'objective': float(self.c_original @ solution),
+            'feasible': feasible,
+        }
+    
+    def _duals(self, tableau, c_extended):
+        """Multiplicadores y = c_B B^-1 das restrições originais
+
+        B são as colunas da base final no tableau inicial (antes dos pivôs).
+        Com linhas redundantes removidas nas duas fases a base tem menos
+        colunas que linhas e y sai por mínimos quadrados.
+        """
+        B = tableau[:, self.base]
+        costs = c_extended[self.base]
+        if B.shape[0] != B.shape[1]:
+            y = lstsq(B.toarray().T if sp.issparse(B) else B.T, costs)[0]
+        elif sp.issparse(B):
+            y = splu(sp.csc_matrix(B)).solve(costs, trans='T')
+        else:
+            y = lu_solve(lu_factor(B), costs, trans=1)
+        # Desfazer a escala, a troca de sinal das linhas com b < 0 e a conversão de min para max
+        y = self.scaling.duals(y * np.array(self.row_signs))
+        return -y if self.sense == 'min' else y
+    
+    def _warm_start(self, engine):
+        """Tenta instalar `self.warm_base` no engine
+
+        Retorna False (e o chamador recomeça da base inicial) se a base não
+        tiver m colunas distintas válidas, for singular ou primal infactível
+        (com as não-básicas de `self.warm_at_upper` no limite superior e as
+        demais no inferior).
+        """
+        warm_base = self.warm_base
+        if warm_base is None:
+            return True
+        at_upper = self.warm_at_upper
+        if (len(warm_base) != engine.m or len(set(warm_base)) != engine.m
+                or min(warm_base) < 0 or max(warm_base) >= engine.n_cols
+                or any(j in warm_base or not 0 <= j < engine.n_cols or np.isinf(engine.upper[j])
+                       for j in at_upper)):
+            self._emit_warm_start(warm_base, False, 'invalid')
+            return False
+        if (not engine.set_basis(warm_base, at_upper) or np.any(engine.b < -1e-9)
+                or np.any(engine.b > engine.upper[engine.base] + 1e-9)):
+            self._emit_warm_start(warm_base, False, 'singular_or_infeasible')
+            return False
+        
+        self._emit_warm_start(warm_base, True, None)
+        self.warm_started = True
+        return True
+    
+    def _emit_warm_start(self, warm_base, accepted, reason):
+        if self.trace is not None:
+            self.trace.emit({'event': 'warm_start', 'base': list(warm_base),
+                             'accepted': accepted, 'reason': reason})
+    
+    def _run_dual_simplex(self, engine):
+        """Simplex dual a partir de uma base dual factível (b pode ser negativo)"""
+        iteration = 0
         while True:
-            iteration += 1
-            print(f"\n--- Iteração {iteration} ---")
-            
-            # Calcular custos reduzidos
-            reduced_costs = []
-            for j in range(len(c_extended)):
-                if j not in base:
-                    rc = c_extended[j]
-                    for i, var in enumerate(base):
-                        rc -= c_extended[var] * tableau[i, j]
-                    reduced_costs.append((j, rc))
-            
-            # Teste de otimalidade
-            max_rc = max(reduced_costs, key=lambda x: x[1])
-            if max_rc[1] <= 1e-8:
-                print("Solução ótima encontrada!")
+            row = engine.dual_leaving_row()
+            if row is None:
                 break
             
-            # Variável entrante
-            entering = max_rc[0]
-            print(f"Variável entrante: x_{entering + 1}")
-            
-            # Teste de ilimitação
-            if all(tableau[i, entering] <= 1e-8 for i in range(self.m)):
-                raise ValueError("Problema ilimitado")
-            
-            # Variável sainte (teste da razão)
-            ratios = []
-            for i in range(self.m):
-                if tableau[i, entering] > 1e-8:
-                    ratios.append((i, b[i] / tableau[i, entering]))
-                else:
-                    ratios.append((i, float('inf')))
-            
-            leaving_idx = min(ratios, key=lambda x: x[1])[0]
-            leaving = base[leaving_idx]
-            print(f"Variável sainte: x_{leaving + 1}")
-            
-            # Pivotamento
-            pivot = tableau[leaving_idx, entering]
-            tableau[leaving_idx, :] /= pivot
-            b[leaving_idx] /= pivot
-            
-            for i in range(self.m):
-                if i != leaving_idx and abs(tableau[i, entering]) > 1e-8:
-                    factor = tableau[i, entering]
-                    tableau[i, :] -= factor * tableau[leaving_idx, :]
-                    b[i] -= factor * b[leaving_idx]
+            self.limits.check(self.iterations, engine)
+            iteration += 1
+            entering = engine.dual_entering_variable(row)
+            if entering is None:
+                raise ValueError("Problema infactível - nenhuma variável pode entrar na base (simplex dual)")
             
-            # Atualizar base
-            base[leaving_idx] = entering
+            leaving = engine.pivot(row, entering)
+            self.iterations += 1
             
-            self._print_tableau(tableau, c_extended, b, base)
+            if self.trace is not None:
+                self.trace.emit({'event': 'dual_iteration', 'iteration': iteration, 'entering': entering,
+                                 'leaving': leaving, 'objective': engine.objective_value()})
+                self._snapshot(engine)
         
-        # Verificar se há variáveis artificiais na base
-        artificial_in_base = [var for var in base if var in artificial_vars]
-        if artificial_in_base:
-            # Verificar se são zero
-            for i, var in enumerate(base):
-                if var in artificial_vars and abs(b[i]) > 1e-6:
-                    raise ValueError("Problema infactível - variável artificial não-zero na solução ótima")
+        return engine
+    
+    def _solve_two_phase(self, tableau, c_extended, b, base, artificial_vars):
+        """Fase I minimiza a soma das artificiais; Fase II otimiza sem elas
+
+        Retorna o engine da Fase II e a base final em índices do tableau
+        completo (o engine da Fase II não tem as colunas artificiais).
+        """
+        artificial_mask = np.zeros(tableau.shape[1], dtype=bool)
+        artificial_mask[artificial_vars] = True
         
-        # Extrair solução
-        solution = np.zeros(len(c_extended))
-        for i, var in enumerate(base):
-            solution[var] = b[i]
+        # Fase I: maximizar -(soma das artificiais) sobre o mesmo tableau
+        if self.trace is not None:
+            self.trace.emit({'event': 'phase', 'phase': 1})
+        engine = TableauEngine(tableau, -artificial_mask.astype(float), b, base, upper=self.column_upper)
+        if not self._warm_start(engine):
+            engine = TableauEngine(tableau, -artificial_mask.astype(float), b, base, upper=self.column_upper)
+        if np.any(artificial_mask[engine.base]):
+            self._run_simplex(engine)
         
-        obj_value = sum(c_extended[var] * solution[var] for var in base)
+        if engine.objective_value() < -1e-6:
+            raise ValueError("Problema infactível - variável artificial não-zero na solução ótima")
         
-        # Remover contribuição das variáveis artificiais (que devem ser zero)
-        for var in artificial_vars:
-            obj_value += self.M * solution[var]
+        # Expulsar da base as artificiais que restaram em nível zero
+        keep_rows = np.ones(engine.m, dtype=bool)
+        for row in np.flatnonzero(artificial_mask[engine.base]):
+            candidates = np.flatnonzero(~artificial_mask & (np.abs(engine.tableau[row]) > engine.tolerance))
+            if candidates.size:
+                engine.pivot(row, int(candidates[0]))
+            else:
+                keep_rows[row] = False  # restrição redundante
         
-        if self.sense == 'min':
-            obj_value = -obj_value
+        # Fase II: tableau menor, sem as colunas artificiais
+        if self.trace is not None:
+            self.trace.emit({'event': 'phase', 'phase': 2})
+        keep_cols = np.flatnonzero(~artificial_mask)
+        new_index = np.full(tableau.shape[1], -1)
+        new_index[keep_cols] = np.arange(keep_cols.size)
         
-        return solution[:self.n], obj_value
+        engine = TableauEngine(engine.tableau[np.ix_(keep_rows, keep_cols)],
+                               c_extended[keep_cols],
+                               engine.b[keep_rows],
+                               new_index[engine.base[keep_rows]],
+                               upper=self.column_upper[keep_cols],
+                               at_upper=engine.at_upper[keep_cols])
+        try:
+            self._run_simplex(engine)
+        except LimitReached as limit:
+            limit.columns = keep_cols
+            raise
+        
+        # Base final (e não-básicas em u_j) no layout completo de colunas (com artificiais)
+        self.at_upper = [int(v) for v in keep_cols[engine.at_upper]]
+        return engine, keep_cols[engine.base]
     
-    def _print_tableau(self, tableau, c, b, base):
-        """Imprime o tableau do simplex"""
-        print("\nTableau:")
-        print("Base\t", end="")
-        for j in range(tableau.shape[1]):
-            print(f"x_{j+1}\t", end="")
-        print("RHS")
-        
-        for i in range(len(base)):
-            print(f"x_{base[i]+1}\t", end="")
-            for j in range(tableau.shape[1]):
-                print(f"{tableau[i,j]:.3f}\t", end="")
-            print(f"{b[i]:.3f}")
-        
-        print("z\t", end="")
-        for j in range(len(c)):
-            if j not in base:
-                rc = c[j] - sum(c[base[i]] * tableau[i,j] for i in range(len(base)))
-                print(f"{rc:.3f}\t", end="")
-            else:
-                print("0.000\t", end="")
+    def _build_tableau(self):
+        """Monta o tableau inicial com variáveis de folga e artificiais
+
+        As colunas seguem a ordem: variáveis originais e, para cada restrição,
+        folga (<=), excesso + artificial (>=) ou artificial (=). Com entrada
+        esparsa a matriz estendida é montada em formato CSC. A, b e c entram
+        já nas variáveis de self.bounds e escalados por self.scaling; os
+        limites superiores de cada coluna ficam em self.column_upper.
+        """
+        c, A, b = self.scaling.model(*self.bounds.model(self.c_original, self.A_original, self.b_original))
+        
+        # Converter para maximização se necessário
+        if self.sense == 'min':
+            c = -c
+        constraints_type = np.array(self.constraints_type, dtype=object)
+        
+        # Tornar todos os b não-negativos (invertendo o tipo da restrição)
+        negative = b < 0
+        signs = np.where(negative, -1.0, 1.0)
+        b *= signs
+        if self.sparse:
+            A = sp.diags(signs) @ A
+        else:
+            A = A * signs[:, None]
+        flipped = constraints_type.copy()
+        flipped[negative & (constraints_type == '<=')] = '>='
+        flipped[negative & (constraints_type == '>=')] = '<='
+        constraints_type = flipped
+        
+        # Quantidade de colunas extras por restrição e seus deslocamentos
+        is_le = constraints_type == '<='
+        is_ge = constraints_type == '>='
+        n_extra = np.where(is_ge, 2, 1)
+        offsets = self.n + np.concatenate(([0], np.cumsum(n_extra)[:-1]))
+        total_cols = self.n + int(n_extra.sum())
+        
+        # Folga (+1) em <=, excesso (-1) em >=, artificial (+1) em >= e =
+        rows = np.arange(self.m)
+        slack_cols = offsets[is_le | is_ge]
+        slack_vals = np.where(is_ge[is_le | is_ge], -1.0, 1.0)
+        artificial_rows = rows[~is_le]
+        artificial_vars = (offsets[~is_le] + is_ge[~is_le]).tolist()
+        
+        extra_rows = np.concatenate((rows[is_le | is_ge], artificial_rows))
+        extra_cols = np.concatenate((slack_cols, artificial_vars)).astype(int)
+        extra_vals = np.concatenate((slack_vals, np.ones(len(artificial_vars))))
+        
+        # Base inicial: folga nas restrições <=, artificial nas demais
+        base = np.where(is_le, offsets, offsets + is_ge).tolist()
+        
+        # Colunas extras de cada restrição, a coluna identidade inicial
+        # (folga em <=, artificial nas demais) e o sinal aplicado à linha
+        self.row_columns = [list(range(offset, offset + k))
+                            for offset, k in zip(offsets.tolist(), n_extra.tolist())]
+        self.identity_columns = list(base)
+        self.row_signs = signs.tolist()
+        
+        var_types = ['original'] * self.n + [None] * (total_cols - self.n)
+        for col in slack_cols:
+            var_types[col] = 'slack'
+        for col in artificial_vars:
+            var_types[col] = 'artificial'
+        
+        c_extended = np.zeros(total_cols)
+        c_extended[:self.n] = c
+        c_extended[artificial_vars] = -self.M
+        
+        self.column_upper = np.full(total_cols, np.inf)
+        self.column_upper[:self.n] = self.scaling.upper(self.bounds.width)
+        
+        # Construir tableau
+        if self.sparse:
+            extra = sp.csc_matrix((extra_vals, (extra_rows, extra_cols - self.n)),
+                                  shape=(self.m, total_cols - self.n))
+            tableau = sp.hstack([A, extra], format='csc')
+        else:
+            tableau = np.zeros((self.m, total_cols))
+            tableau[:, :self.n] = A
+            tableau[extra_rows, extra_cols] = extra_vals
         
-        obj_value = sum(c[base[i]] * b[i] for i in range(len(base)))
-        print(f"{obj_value:.3f}")
+        return tableau, c_extended, b, base, artificial_vars, var_types
@@ -0,0 +1,73 @@
+import numpy as np
+import scipy.sparse as sp
+
+
+class Bounds:
+    """Limites l <= x <= u por variável, tratados nativamente pelo simplex
+
+    Cada variável é reescrita como x = shift + sign·x' com 0 <= x' <= width:
+    limite inferior finito desloca (shift = l, sign = +1, width = u - l) e,
+    sem limite inferior, o superior espelha a variável (shift = u, sign = -1,
+    width = ∞). O modelo transformado mantém as m linhas originais; os
+    limites superiores width ficam com os engines (teste da razão com
+    limites), sem linhas nem folgas extras. Variáveis livres (sem nenhum dos
+    dois limites) não são suportadas.
+
+    `lower` e `upper` aceitam None nas posições sem limite (-∞ e +∞); sem
+    nenhum dos dois vale o padrão x >= 0 e a transformação é a identidade.
+    """
+
+    def __init__(self, n, lower=None, upper=None):
+        self.lower = _limits(lower, n, 0.0, -np.inf)
+        self.upper = _limits(upper, n, np.inf, np.inf)
+        if self.lower.size != n or self.upper.size != n:
+            raise ValueError("Dimensões incompatíveis entre os limites e c")
+        invalid = np.isnan(self.lower) | np.isnan(self.upper) | (self.lower == np.inf) | (self.upper == -np.inf)
+        for j in np.flatnonzero(invalid):
+            raise ValueError(f"Limite inválido na variável x_{j + 1}")
+        for j in np.flatnonzero(np.isinf(self.lower) & np.isinf(self.upper)):
+            raise ValueError(f"Variável livre x_{j + 1} (sem limite inferior nem superior) não é suportada")
+        for j in np.flatnonzero(self.lower > self.upper):
+            raise ValueError(f"Problema infactível - limites inconsistentes na variável x_{j + 1} (l > u)")
+
+        mirrored = np.isinf(self.lower)
+        self.sign = np.where(mirrored, -1.0, 1.0)
+        self.shift = np.where(mirrored, self.upper, self.lower)
+        self.width = np.where(mirrored, np.inf, self.upper - self.lower)
+        self.active = bool(np.any(self.shift != 0) or np.any(mirrored) or np.any(np.isfinite(self.width)))
+
+    def model(self, c, A, b):
+        """(sign·c, A·diag(sign), b - A·shift): o modelo nas variáveis x'"""
+        if not self.active:
+            return c, A, b
+        b = b - A @ self.shift
+        if np.any(self.sign < 0):
+            if sp.issparse(A):
+                A = (A @ sp.diags(self.sign)).asformat(A.format)
+            else:
+                A = A * self.sign[None, :] + 0.0  # sem -0.0 no tableau
+        return c * self.sign, A, b
+
+    def solution(self, x):
+        """x = shift + sign·x' (variáveis originais)"""
+        if not self.active:
+            return x
+        return self.shift + self.sign * x
+
+    def constant(self, c):
+        """Parcela c·shift do objetivo que o modelo transformado não enxerga"""
+        return float(np.asarray(c, dtype=float) @ self.shift) if self.active else 0.0
+
+    def stats(self):
+        return {
+            'bounded': int(np.isfinite(self.width).sum()),
+            'shifted': int(np.count_nonzero(self.shift)),
+            'mirrored': int((self.sign < 0).sum()),
+        }
+
+
+def _limits(values, n, default, missing):
+    """Array de limites com None (ou ausência do vetor) trocado pelo valor padrão"""
+    if values is None:
+        return np.full(n, default)
+    return np.array([missing if v is None else v for v in values], dtype=float)
@@ -0,0 +1,200 @@
+import asyncio
+import atexit
+import importlib
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+
+class SolverTimeout(Exception):
+    """O solver excedeu o tempo limite da requisição"""
+
+
+def _worker_main(conn, preload):
+    """Laço de um processo do pool: recebe (func, args) e devolve o resultado"""
+    if os.environ.get('DJANGO_SETTINGS_MODULE'):
+        import django
+        django.setup()
+    # Importar os módulos das tarefas antes de sinalizar que está pronto, para
+    # que o custo dos imports não conte no tempo limite do primeiro solve
+    for module in preload:
+        importlib.import_module(module)
+    conn.send(('ready', None))
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+
+        func, args = task
+        try:
+            conn.send(('ok', func(*args)))
+        except Exception as e:
+            conn.send(('error', e))
+
+
+class _Worker:
+    def __init__(self, context, preload):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, preload), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    def wait_ready(self):
+        """Aguarda o fim da inicialização (imports) do processo filho"""
+        if not self.ready:
+            self.conn.recv()
+            self.ready = True
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.kill()
+
+
+class SolverPool:
+    """Pool de processos para solves pesados, com cancelamento por timeout
+
+    Cada worker é um processo persistente com seu próprio pipe, de modo que um
+    solve que estoura o tempo limite é cancelado matando apenas o processo que
+    o executa (que é substituído por um novo); os demais solves continuam.
+    Os processos são iniciados junto com o pool e o tempo limite só começa a
+    contar quando um worker já inicializado recebe a tarefa.
+    """
+
+    def __init__(self, workers, preload=('myapp.tasks',)):
+        self.workers = workers
+        self.preload = tuple(preload)
+        self._context = multiprocessing.get_context('spawn')
+        self._lock = threading.Lock()
+        self._available = threading.Semaphore(workers)
+        self._idle = [_Worker(self._context, self.preload) for _ in range(workers)]
+
+    def _acquire(self):
+        with self._lock:
+            return self._idle.pop()
+
+    def _release(self, worker):
+        with self._lock:
+            self._idle.append(worker)
+
+    def _discard(self, worker):
+        """Mata o worker e já inicia um substituto"""
+        worker.kill()
+        self._release(_Worker(self._context, self.preload))
+
+    def run(self, func, args, timeout=None):
+        """Executa func(*args) num worker; SolverTimeout se passar de `timeout` segundos"""
+        if not self._available.acquire(timeout=timeout):
+            raise SolverTimeout("Tempo limite excedido aguardando um processo livre")
+
+        try:
+            worker = self._acquire()
+            # Todo caminho de saída devolve o worker ao pool ou o substitui
+            healthy = False
+            try:
+                worker.wait_ready()
+                try:
+                    worker.conn.send((func, args))
+                except (pickle.PicklingError, TypeError, AttributeError):
+                    # A tarefa é serializada antes de ir ao pipe: nada foi
+                    # escrito e o worker continua utilizável
+                    healthy = True
+                    raise
+                if not worker.conn.poll(timeout):
+                    raise SolverTimeout("Tempo limite excedido - solver cancelado")
+                status, payload = worker.conn.recv()
+                healthy = True
+            except (EOFError, OSError):
+                raise RuntimeError("O processo do solver terminou inesperadamente")
+            finally:
+                if healthy:
+                    self._release(worker)
+                else:
+                    self._discard(worker)
+
+            if status == 'error':
+                raise payload
+            return payload
+        finally:
+            self._available.release()
+
+    def shutdown(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Pool compartilhado do processo (None se SOLVER_POOL_WORKERS = 0)"""
+    global _pool
+    workers = getattr(settings, 'SOLVER_POOL_WORKERS', 0)
+    if not workers:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = SolverPool(workers)
+            atexit.register(_pool.shutdown)
+    return _pool
+
+
+def run_solver(func, args, size):
+    """Resolve inline se o modelo for pequeno; senão, no pool com timeout
+
+    `size` (não-zeros de A) é comparado com SOLVER_INLINE_MAX_SIZE: abaixo dele
+    o custo de despachar para outro processo supera o do próprio solve.
+    """
+    if size <= getattr(settings, 'SOLVER_INLINE_MAX_SIZE', 2500):
+        return func(*args)
+    # O pool (e seus processos) só é criado quando algum modelo precisa dele
+    pool = get_pool()
+    if pool is None:
+        return func(*args)
+    return pool.run(func, args, timeout=getattr(settings, 'SOLVER_TIMEOUT', None))
+
+
+_thread_executor = None
+
+
+def get_thread_executor():
+    """Threads (SOLVER_ASYNC_WORKERS) em que as views assíncronas aguardam os solves"""
+    global _thread_executor
+    with _pool_lock:
+        if _thread_executor is None:
+            _thread_executor = ThreadPoolExecutor(max_workers=getattr(settings, 'SOLVER_ASYNC_WORKERS', 8),
+                                                  thread_name_prefix='solver')
+            atexit.register(_thread_executor.shutdown, wait=False)
+    return _thread_executor
+
+
+async def run_solver_async(func, args, size):
+    """run_solver sem bloquear o event loop
+
+    O solve (inline ou no pool de processos) roda numa das threads do executor
+    limitado, de modo que um único worker ASGI mantém várias requisições em
+    andamento; as excedentes aguardam na fila do executor.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_thread_executor(), run_solver, func, args, size)
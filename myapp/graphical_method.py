@@ -1,20 +1,62 @@
-from django.db import models
 import numpy as np
 
-import matplotlib.pyplot as plt
 from matplotlib.patches import Polygon
-from itertools import combinations
+from .half_planes import enumerate_vertices, intersect_half_planes, recession_interval, sort_ccw
+from .plot_renderer import new_figure, render_plot
 import warnings
 warnings.filterwarnings('ignore')
 
+class GraphicalResult:
+    """Resultado do método gráfico: vértices, ponto ótimo, valor e o gráfico
+
+    O gráfico só é desenhado no primeiro acesso a `figure` (e reaproveitado
+    depois); render() desenha numa figura própria, serializa e a descarta.
+    Desempacota como (ponto, valor), como o retorno antigo de solve().
+    """
+    
+    def __init__(self, method, vertices, point, value):
+        self.method = method
+        self.vertices = vertices
+        self.point = point
+        self.value = value
+        self._figure = None
+    
+    @property
+    def figure(self):
+        if self._figure is None:
+            self._figure = self.method._plot_solution(self.vertices, tuple(self.point))
+        return self._figure
+    
+    def render(self, options=None):
+        """Gráfico serializado conforme plot_options (formato, tamanho, DPI); retorna (bytes, mime)"""
+        return render_plot(lambda figure: self.method._plot_solution(self.vertices, tuple(self.point), figure),
+                           options)
+    
+    def geometry(self):
+        """Polígono, restrições, curvas de nível e ótimo para desenho no cliente"""
+        return self.method._geometry(self.vertices, tuple(self.point))
+    
+    def __iter__(self):
+        return iter((self.point, self.value))
+
 class GraphicalMethod:
-    def __init__(self, c, A, b, sense='max', constraints_type=None):
+    # Acima deste número de restrições o teste de todos os pares (O(m³)) perde
+    # para a interseção de semiplanos
+    PAIRWISE_MAX_ROWS = 64
+    
+    def __init__(self, c, A, b, sense='max', constraints_type=None, trace=None):
         self.c_original = np.array(c, dtype=float)
         self.A_original = np.array(A, dtype=float)  
         self.b_original = np.array(b, dtype=float)
         self.sense = sense
         self.constraints_type = constraints_type or ['<='] * len(b)
         
+        # Sink de eventos (myapp.trace); None desliga o rastreamento
+        self.trace = trace
+        
+        # Direções de recessão da região factível, preenchidas por _find_vertices
+        self.recession = None
+        
         # Converter para forma padrão (max com <=)
         if sense == 'min':
             self.c = -self.c_original
@@ -37,11 +79,12 @@ class GraphicalMethod:
         for i, constraint in enumerate(self.constraints_type):
             if constraint == '=':
                 # Converter A[i]x = b[i] em duas restrições:
-                # A[i]x <= b[i] e A[i]x >= b[i] (-A[i]x <= -b[i])
+                # A[i]x <= b[i] e A[i]x >= b[i] (a segunda é convertida
+                # para -A[i]x <= -b[i] junto com as demais >= abaixo)
                 expanded_A.append(self.A[i])        # A[i]x <= b[i]
-                expanded_A.append(-self.A[i])       # -A[i]x <= -b[i]
+                expanded_A.append(self.A[i])        # A[i]x >= b[i]
+                expanded_b.append(self.b[i])
                 expanded_b.append(self.b[i])
-                expanded_b.append(-self.b[i])
                 expanded_display.append('<=')
                 expanded_display.append('>=')
                 # Preservar originais para display
@@ -82,174 +125,94 @@ class GraphicalMethod:
         if self.n != 2:
             raise ValueError("Método gráfico só funciona para 2 variáveis")
         
-        print("\n=== MÉTODO GRÁFICO ===")
-        print(f"Problema: {'Minimizar' if self.sense == 'min' else 'Maximizar'} f(x) = {self.c_original[0]}x₁ + {self.c_original[1]}x₂")
-        print("Sujeito a:")
-        
-        # Mostrar restrições originais (antes da expansão)
-        constraint_index = 0
-        for i, constraint_type in enumerate(self.constraints_type):
-            if constraint_type == '=':
-                print(f"  {self.A_original[i,0]}x₁ + {self.A_original[i,1]}x₂ = {self.b_original[i]}")
-                constraint_index += 2  # Pula 2 porque igualdade vira 2 restrições
-            else:
-                print(f"  {self.A_original[i,0]}x₁ + {self.A_original[i,1]}x₂ {constraint_type} {self.b_original[i]}")
-                constraint_index += 1
-        
-        print("  x₁, x₂ ≥ 0")
+        trace = self.trace
+        if trace is not None:
+            trace.emit({
+                'event': 'start', 'method': 'graphical', 'sense': self.sense,
+                'c': self.c_original.tolist(), 'A': self.A_original.tolist(),
+                'b': self.b_original.tolist(), 'constraints_type': list(self.constraints_type),
+            })
         
         # Encontrar vértices da região factível
         vertices = self._find_vertices()
-        
+        return self._evaluate(vertices)
+    
+    def _evaluate(self, vertices):
+        """Ótimo sobre os vértices já calculados (e self.recession); retorna GraphicalResult"""
+        trace = self.trace
         if not vertices:
             raise ValueError("Região factível vazia - o problema é inviável")
         
-        # Verificar se região é limitada para problemas de maximização
-        if self.sense == 'max' and self._is_unbounded(vertices):
-            print("ATENÇÃO: A região factível pode ser ilimitada!")
-            print("Verificando se a função objetivo é limitada...")
+        # Verificar se a região é limitada
+        if self._is_unbounded(vertices):
+            if trace is not None:
+                trace.emit({'event': 'unbounded_region'})
         
-        # Avaliar função objetivo em cada vértice
-        best_value = float('-inf') if self.sense == 'max' else float('inf')
+        # Região ilimitada: o ótimo só existe se nenhuma direção de recessão
+        # melhorar a função objetivo (c já está na forma de maximização)
+        if self.recession is not None:
+            if max(self.c @ direction for direction in self.recession) > 1e-9:
+                raise ValueError("Problema ilimitado - a função objetivo cresce indefinidamente na região factível")
+        
+        # Avaliar função objetivo em cada vértice (valor interno, sempre maximizado)
+        best_value = float('-inf')
         best_point = None
         
-        print(f"\nVértices da região factível ({len(vertices)} encontrados):")
+        if trace is not None:
+            trace.emit({'event': 'vertices', 'count': len(vertices)})
         for i, (x_val, y_val) in enumerate(vertices):
             # Usar função objetivo original para avaliação final
             obj_value_original = self.c_original[0] * x_val + self.c_original[1] * y_val
             obj_value_internal = self.c[0] * x_val + self.c[1] * y_val
             
-            print(f"Vértice {i+1}: ({x_val:.4f}, {y_val:.4f}) -> f = {obj_value_original:.4f}")
+            if trace is not None:
+                trace.emit({'event': 'vertex', 'index': i + 1, 'point': [float(x_val), float(y_val)],
+                            'value': float(obj_value_original)})
             
             # Usar valor interno para comparação (já ajustado para max)
             if obj_value_internal > best_value:
                 best_value = obj_value_internal
                 best_point = (x_val, y_val)
         
-        # Plotar gráfico
-        self._plot_solution(vertices, best_point)
-        
         # Retornar valor original da função objetivo
         if self.sense == 'min':
             final_value = -best_value
         else:
             final_value = best_value
         
-        print(f"\nSolução ótima: x₁ = {best_point[0]:.4f}, x₂ = {best_point[1]:.4f}")
-        print(f"Valor ótimo: f* = {final_value:.4f}")
+        if trace is not None:
+            trace.emit({'event': 'graphical_optimal', 'point': [float(v) for v in best_point],
+                        'value': float(final_value)})
         
-        return np.array(best_point), final_value
+        return GraphicalResult(self, vertices, np.array(best_point), final_value)
     
     def _find_vertices(self):
-        """Encontra os vértices da região factível"""
-        lines = []
-        line_labels = []
-        
-        # Adicionar eixos (restrições de não-negatividade)
-        lines.append((1, 0, 0))  # x₁ = 0
-        lines.append((0, 1, 0))  # x₂ = 0
-        line_labels.extend(['x₁ = 0', 'x₂ = 0'])
-        
-        # Adicionar restrições funcionais (já expandidas)
-        constraint_counter = 1
-        original_index = 0
-        
-        for i in range(self.m):
-            lines.append((self.A[i, 0], self.A[i, 1], self.b[i]))
-            
-            # Identificar se é de igualdade original
-            if (original_index < len(self.constraints_type) and 
-                self.constraints_type[original_index] == '=' and 
-                i < len(self.display_constraints)):
-                
-                if self.display_constraints[i] == '<=':
-                    line_labels.append(f'R{constraint_counter}(=)')
-                else:
-                    line_labels.append(f'R{constraint_counter}(=)')
-                    constraint_counter += 1
-                    original_index += 1
-            else:
-                line_labels.append(f'R{constraint_counter}')
-                constraint_counter += 1
-                original_index += 1
-        
-        vertices = []
-        
-        # Encontrar todas as interseções possíveis
-        for i in range(len(lines)):
-            for j in range(i + 1, len(lines)):
-                vertex = self._line_intersection(lines[i], lines[j])
-                if vertex is not None:
-                    x_val, y_val = vertex
-                    
-                    # Tolerância mais rigorosa para não-negatividade
-                    if x_val >= -1e-10 and y_val >= -1e-10:
-                        # Verificar se satisfaz todas as restrições
-                        if self._is_feasible(x_val, y_val):
-                            vertices.append((max(0, x_val), max(0, y_val)))  # Garantir não-negatividade
-        
-        # Remover duplicatas com tolerância apropriada
-        return self._remove_duplicates(vertices)
-    
-    def _line_intersection(self, line1, line2):
-        """Calcula interseção entre duas retas ax + by = c"""
-        a1, b1, c1 = line1
-        a2, b2, c2 = line2
-        
-        det = a1 * b2 - a2 * b1
-        if abs(det) < 1e-12:  # Tolerância rigorosa
-            return None  # Linhas paralelas
-        
-        x_int = (c1 * b2 - c2 * b1) / det
-        y_int = (a1 * c2 - a2 * c1) / det
-        
-        return (x_int, y_int)
-    
-    def _is_feasible(self, x, y, tolerance=1e-10):
-        """Verifica se um ponto satisfaz todas as restrições"""
-        if x < -tolerance or y < -tolerance:  # Verificação de não-negatividade
-            return False
-        
-        for i in range(self.m):
-            constraint_value = self.A[i, 0] * x + self.A[i, 1] * y
-            if constraint_value > self.b[i] + tolerance:
-                return False
-        
-        return True
-    
-    def _remove_duplicates(self, vertices, tolerance=1e-8):
-        """Remove vértices duplicados"""
-        unique_vertices = []
-        for v in vertices:
-            is_duplicate = False
-            for uv in unique_vertices:
-                if abs(v[0] - uv[0]) < tolerance and abs(v[1] - uv[1]) < tolerance:
-                    is_duplicate = True
-                    break
-            if not is_duplicate:
-                unique_vertices.append(v)
-        
-        return unique_vertices
+        """Encontra os vértices da região factível, já em ordem anti-horária
+
+        Até PAIRWISE_MAX_ROWS restrições todos os pares de retas são testados
+        de uma vez com NumPy; acima disso, interseção de semiplanos em
+        O(m log m) (veja myapp.half_planes). Também guarda em self.recession as
+        direções de recessão (None se a região for limitada).
+        """
+        if self.m <= self.PAIRWISE_MAX_ROWS:
+            vertices = enumerate_vertices(self.A, self.b)
+        else:
+            vertices = intersect_half_planes(self.A, self.b)
+        self.recession = recession_interval(self.A) if vertices else None
+        return vertices
     
     def _is_unbounded(self, vertices):
-        """Verifica se a região factível é ilimitada (verificação básica)"""
-        if len(vertices) < 3:
-            return True
-        
-        # Verifica se existe algum vértice muito distante da origem
-        max_distance = max(np.sqrt(v[0]**2 + v[1]**2) for v in vertices)
-        return max_distance > 1e6  # Heurística simples
+        """Verifica se a região factível é ilimitada (cone de recessão não trivial)"""
+        return self.recession is not None
     
-    def _plot_solution(self, vertices, best_point):
-        """Plota a solução gráfica"""
-        fig, ax = plt.subplots(figsize=(12, 10))
+    def _plot_solution(self, vertices, best_point, fig=None):
+        """Plota a solução gráfica (numa figura Agg própria, sem o pyplot)"""
+        if fig is None:
+            fig = new_figure()
+        ax = fig.subplots()
         
         # Determinar limites do gráfico
-        if vertices:
-            max_coord = max(max(v[0], v[1]) for v in vertices)
-            plot_limit = max(10, max_coord * 1.3)
-        else:
-            plot_limit = 10
+        plot_limit = self._plot_limit(vertices)
         
         # Plotar região factível
         if len(vertices) >= 3:
@@ -342,21 +305,82 @@ class GraphicalMethod:
                     f'f(x) = {self.c_original[0]}x₁ + {self.c_original[1]}x₂', fontsize=14)
         ax.grid(True, alpha=0.3)
         ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
     
+    def _plot_limit(self, vertices):
+        """Limite superior dos eixos do gráfico (o inferior é -0.5)"""
+        if vertices:
+            max_coord = max(max(v[0], v[1]) for v in vertices)
+            return max(10, max_coord * 1.3)
+        return 10
+    
+    def _geometry(self, vertices, best_point):
+        """Geometria do gráfico para desenho no cliente, sem renderizar nada
+
+        Retorna a caixa do gráfico, o polígono factível em ordem anti-horária,
+        os segmentos das restrições e das curvas de nível da função objetivo
+        recortados à caixa (None quando a reta não cruza a caixa) e o ótimo.
+        """
+        plot_limit = self._plot_limit(vertices)
+        box = (-0.5, plot_limit, -0.5, plot_limit)
+        
+        constraints = []
+        for i, constraint_type in enumerate(self.constraints_type):
+            a1, a2, b = self.A_original[i, 0], self.A_original[i, 1], self.b_original[i]
+            constraints.append({
+                'index': i,
+                'type': constraint_type,
+                'label': f'R{i+1}: {a1}x₁ + {a2}x₂ {constraint_type} {b}',
+                'segment': _clip_line(a1, a2, b, box),
+            })
+        
+        objective_lines = []
+        if best_point is not None:
+            obj_at_optimum = self.c_original[0] * best_point[0] + self.c_original[1] * best_point[1]
+            for fraction in (0.25, 0.5, 0.75, 1.0):
+                level = obj_at_optimum * fraction
+                objective_lines.append({
+                    'value': float(level),
+                    'optimal': fraction == 1.0,
+                    'segment': _clip_line(self.c_original[0], self.c_original[1], level, box),
+                })
+        
+        return {
+            'box': [float(v) for v in box],
+            'polygon': [[float(x), float(y)] for x, y in self._sort_vertices_ccw(vertices)],
+            'vertices': [[float(x), float(y)] for x, y in vertices],
+            'constraints': constraints,
+            'objective_lines': objective_lines,
+            'optimum': None if best_point is None else [float(v) for v in best_point],
+        }
+    
     def _sort_vertices_ccw(self, vertices):
         """Ordena vértices no sentido anti-horário para formar polígono convexo"""
-        if len(vertices) < 3:
-            return vertices
-        
-        # Calcular centroide
-        center = np.mean(vertices, axis=0)
-        
-        # Calcular ângulos em relação ao centroide
-        def angle_from_center(vertex):
-            return np.arctan2(vertex[1] - center[1], vertex[0] - center[0])
-        
-        # Ordenar por ângulo
-        sorted_vertices = sorted(vertices, key=angle_from_center)
-        return sorted_vertices
\ No newline at end of file
+        return sort_ccw(vertices)
+
+def _clip_line(a1, a2, b, box, tolerance=1e-12):
+    """Segmento da reta a1·x + a2·y = b dentro da caixa (xmin, xmax, ymin, ymax)
+
+    Parametriza a reta por um ponto e sua direção e recorta o parâmetro contra
+    as quatro bordas (Liang–Barsky); retorna [[x, y], [x, y]] ou None.
+    """
+    norm = a1 * a1 + a2 * a2
+    if norm < tolerance:
+        return None
+    x0, y0 = a1 * b / norm, a2 * b / norm  # ponto da reta mais próximo da origem
+    dx, dy = -a2, a1
+    xmin, xmax, ymin, ymax = box
+    
+    t_low, t_high = -np.inf, np.inf
+    for p, q_low, q_high in ((dx, xmin - x0, xmax - x0), (dy, ymin - y0, ymax - y0)):
+        if abs(p) < tolerance:
+            if q_low > 0 or q_high < 0:
+                return None  # paralela à borda e fora da caixa
+            continue
+        t1, t2 = sorted((q_low / p, q_high / p))
+        t_low, t_high = max(t_low, t1), min(t_high, t2)
+    if t_low > t_high:
+        return None
+    return [[float(x0 + t_low * dx), float(y0 + t_low * dy)],
+            [float(x0 + t_high * dx), float(y0 + t_high * dy)]]
@@ -0,0 +1,308 @@
+from collections import deque
+
+import numpy as np
+
+
+def recession_interval(A, tolerance=1e-9):
+    """Direções de recessão de {x >= 0, A x <= b}: None (região limitada) ou (d_lo, d_hi)
+
+    Toda direção do primeiro quadrante é um múltiplo de d(s) = (1 - s, s),
+    s em [0, 1], e a_i · d(s) = a_i1 + (a_i2 - a_i1) s é linear em s: cada
+    restrição corta um intervalo de s e o cone de recessão é a interseção
+    deles, obtida em O(m). A região (não vazia) é ilimitada exatamente quando
+    esse intervalo não é vazio; seus extremos são os raios extremos do cone.
+    """
+    A = np.asarray(A, dtype=float)
+    norms = np.hypot(A[:, 0], A[:, 1])
+    scale = np.where(norms > 0, norms, 1.0)
+    start = A[:, 0] / scale          # a · d(0)
+    slope = (A[:, 1] - A[:, 0]) / scale
+
+    low, high = 0.0, 1.0
+    # start + slope·s <= 0
+    rising = slope > tolerance
+    falling = slope < -tolerance
+    flat = ~(rising | falling)
+    if np.any(start[flat] > tolerance):
+        return None
+    if rising.any():
+        high = min(high, float(np.min(-start[rising] / slope[rising])))
+    if falling.any():
+        low = max(low, float(np.max(-start[falling] / slope[falling])))
+    if low > high + tolerance:
+        return None
+    low = min(low, high)
+    return np.array([1.0 - low, low]), np.array([1.0 - high, high])
+
+
+def intersect_half_planes(A, b, tolerance=1e-9):
+    """Vértices de {x >= 0, A x <= b} em ordem anti-horária, em O(m log m)
+
+    Ordena os semiplanos pelo ângulo da reta e varre com um deque (algoritmo
+    clássico de interseção de semiplanos), dentro de uma caixa grande que
+    garante uma região limitada. Para tolerar regiões degeneradas (segmentos
+    de igualdades, pontos) todos os semiplanos são afrouxados por um epsilon
+    relativo; a estrutura combinatória vem do problema afrouxado e cada vértice
+    é recalculado exatamente como a interseção das duas retas originais que o
+    formam. Vértices sobre a caixa são descartados (a ilimitação é decidida
+    por recession_interval). Retorna [] se a região for vazia.
+    """
+    # Semiplanos originais + não-negatividade, normalizados (|a| = 1)
+    L, B = _with_nonnegativity(A, b)
+    norms = np.hypot(L[:, 0], L[:, 1])
+    null = norms <= tolerance
+    if np.any(B[null] < -tolerance):
+        return []  # 0 <= b negativo: infactível
+    rows = np.flatnonzero(~null)  # linha original de cada semiplano normalizado
+    A_all, b_all = L[rows] / norms[rows, None], B[rows] / norms[rows]
+    n_real = len(b_all)
+
+    # Caixa limitante (x, y <= R) e afrouxamento relativo
+    magnitude = max(1.0, float(np.max(np.abs(b_all))))
+    R = 1e6 * magnitude
+    epsilon = tolerance * magnitude
+    A_box = np.vstack([A_all, [[1.0, 0.0], [0.0, 1.0]]])
+    b_box = np.concatenate([b_all + epsilon, [R, R]])
+
+    # Reta de cada semiplano: ponto p e direção d com a região à esquerda
+    directions = np.column_stack([-A_box[:, 1], A_box[:, 0]])
+    points = A_box * b_box[:, None]
+    angles = np.arctan2(directions[:, 1], directions[:, 0])
+
+    # Ordenar por ângulo; entre paralelos de mesmo sentido fica o mais restritivo
+    order = np.lexsort((b_box, np.round(angles / tolerance)))
+    selected = []
+    last_angle = None
+    for k in order:
+        rounded = round(angles[k] / tolerance)
+        if rounded == last_angle:
+            continue
+        selected.append(int(k))
+        last_angle = rounded
+
+    def intersection(i, j):
+        cross = directions[i, 0] * directions[j, 1] - directions[i, 1] * directions[j, 0]
+        if abs(cross) < 1e-15:
+            return None
+        delta = points[j] - points[i]
+        t = (delta[0] * directions[j, 1] - delta[1] * directions[j, 0]) / cross
+        return points[i] + t * directions[i]
+
+    def outside(k, point):
+        return A_box[k] @ point > b_box[k] + 1e-12 * magnitude
+
+    lines = deque()
+    vertices = deque()  # vertices[i] = interseção de lines[i] e lines[i + 1]
+    for k in selected:
+        while vertices and outside(k, vertices[-1]):
+            vertices.pop()
+            lines.pop()
+        while vertices and outside(k, vertices[0]):
+            vertices.popleft()
+            lines.popleft()
+        if lines:
+            point = intersection(lines[-1], k)
+            if point is None:
+                # Paralelos opostos adjacentes: a faixa entre eles é vazia
+                if directions[lines[-1]] @ directions[k] < 0 and outside(k, points[lines[-1]]):
+                    return []
+                continue
+            vertices.append(point)
+        lines.append(k)
+
+    # Fechar o ciclo: descartar do fim e do início o que o outro extremo corta
+    while len(vertices) >= 2 and outside(lines[0], vertices[-1]):
+        vertices.pop()
+        lines.pop()
+    while len(vertices) >= 2 and outside(lines[-1], vertices[0]):
+        vertices.popleft()
+        lines.popleft()
+    if len(lines) < 3:
+        return []
+
+    # Vértices exatos a partir das retas originais (não normalizadas) de cada par
+    lines = np.array(lines)
+    following = np.roll(lines, -1)
+    real = (lines < n_real) & (following < n_real)  # pares com a caixa ficam no "infinito"
+    corners, valid = _pair_intersections(L[rows[lines[real]]], B[rows[lines[real]]],
+                                         L[rows[following[real]]], B[rows[following[real]]])
+    corners = np.maximum(corners[valid], 0.0)
+
+    result = []
+    for vertex in corners:
+        vertex = (float(vertex[0]), float(vertex[1]))
+        if not result or not _same_point(result[-1], vertex, epsilon):
+            result.append(vertex)
+    if len(result) > 1 and _same_point(result[0], result[-1], epsilon):
+        result.pop()
+
+    # Vértices afrouxados podem não satisfazer as restrições originais (região vazia por pouco)
+    if result and np.any(np.array(result) @ A_all.T > b_all + 1e-7 * magnitude):
+        return []
+    return result
+
+
+def enumerate_vertices(A, b, tolerance=1e-10):
+    """Vértices de {x >= 0, A x <= b} testando todos os pares de retas de uma vez
+
+    Determinantes e interseções de todos os pares saem por broadcasting e a
+    factibilidade de todos os candidatos é um único produto matricial; as
+    duplicatas são removidas por hash em grade. Custa O(m³) em memória e
+    tempo, mas sem laços em Python: é o caminho mais rápido para m pequeno.
+    Retorna os vértices em ordem anti-horária.
+    """
+    L, B = _with_nonnegativity(A, b)
+    i, j = np.triu_indices(len(B), k=1)
+    points, valid = _pair_intersections(L[i], B[i], L[j], B[j])
+    points = points[valid]
+
+    scale = np.maximum(1.0, np.abs(B))
+    feasible = np.all(points @ L.T <= B + tolerance * scale, axis=1)
+    points = np.maximum(points[feasible], 0.0)
+
+    return sort_ccw(dedupe_points(points))
+
+
+def dedupe_points(points, tolerance=1e-8):
+    """Remove pontos repetidos (a menos de `tolerance`) com hash em grade, em O(V)
+
+    Cada ponto cai numa célula de lado `tolerance`; um repetido só pode estar
+    na mesma célula ou numa vizinha, então basta consultar as 9 células em
+    volta em vez de comparar com todos os pontos já aceitos.
+    """
+    cells = {}
+    unique = []
+    for x, y in np.asarray(points, dtype=float).reshape(-1, 2).tolist():
+        cx, cy = int(np.floor(x / tolerance)), int(np.floor(y / tolerance))
+        neighbours = (cells.get((cx + dx, cy + dy), ()) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+        if any(abs(x - ux) < tolerance and abs(y - uy) < tolerance
+               for cell in neighbours for ux, uy in cell):
+            continue
+        cells.setdefault((cx, cy), []).append((x, y))
+        unique.append((x, y))
+    return unique
+
+
+def _with_nonnegativity(A, b):
+    """Restrições A x <= b acrescidas de -x1 <= 0 e -x2 <= 0"""
+    A = np.asarray(A, dtype=float).reshape(-1, 2)
+    b = np.asarray(b, dtype=float).reshape(-1)
+    return np.vstack([A, [[-1.0, 0.0], [0.0, -1.0]]]), np.concatenate([b, [0.0, 0.0]])
+
+
+def _pair_intersections(L1, B1, L2, B2, tolerance=1e-12):
+    """Interseções das retas L1[k]·x = B1[k] e L2[k]·x = B2[k] (regra de Cramer, vetorizada)"""
+    det = L1[:, 0] * L2[:, 1] - L1[:, 1] * L2[:, 0]
+    valid = np.abs(det) > tolerance
+    safe = np.where(valid, det, 1.0)
+    x = (B1 * L2[:, 1] - B2 * L1[:, 1]) / safe
+    y = (L1[:, 0] * B2 - L2[:, 0] * B1) / safe
+    return np.column_stack([x, y]), valid
+
+
+def sort_ccw(vertices):
+    """Ordena pontos de um polígono convexo pelo ângulo em torno do centroide"""
+    if len(vertices) < 3:
+        return vertices
+    points = np.array(vertices)
+    center = points.mean(axis=0)
+    order = np.argsort(np.arctan2(points[:, 1] - center[1], points[:, 0] - center[0]))
+    return [vertices[k] for k in order]
+
+
+def _same_point(p, q, tolerance):
+    return abs(p[0] - q[0]) <= 10 * tolerance and abs(p[1] - q[1]) <= 10 * tolerance
+
+
+def clip_polygon(polygon, lines, label, tolerance=1e-9):
+    """Recorta um polígono convexo pelo semiplano lines[label] (a1·x + a2·y <= b), em O(V)
+
+    `polygon` é uma lista [(ponto, aresta)] em ordem anti-horária, em que
+    `aresta` é o rótulo (chave de `lines`) da reta que liga o vértice ao
+    seguinte. Cada vértice novo é a interseção exata das duas retas que o
+    formam, de modo que recortes sucessivos não acumulam erro. Segmentos e
+    pontos (regiões degeneradas por igualdades) são recortados do mesmo modo.
+    """
+    if not polygon:
+        return []
+    a1, a2, b = lines[label]
+    norm = np.hypot(a1, a2)
+    if norm <= 1e-15:
+        return polygon if b >= -tolerance else []
+    values = [(a1 * x + a2 * y - b) / norm for (x, y), _ in polygon]
+    inside = [value <= tolerance for value in values]
+    if all(inside):
+        return polygon
+    if not any(inside):
+        return []
+
+    clipped = []
+    n = len(polygon)
+    for k in range(n):
+        point, edge = polygon[k]
+        following = (k + 1) % n
+        if inside[k]:
+            clipped.append((point, edge))
+        if inside[k] != inside[following]:
+            crossing = _line_intersection(lines[edge], lines[label])
+            if crossing is None:
+                # Aresta degenerada (quase paralela): interpolar ao longo dela
+                t = values[k] / (values[k] - values[following])
+                end = polygon[following][0]
+                crossing = (point[0] + t * (end[0] - point[0]), point[1] + t * (end[1] - point[1]))
+            # Saindo da região a aresta seguinte corre sobre a reta nova
+            clipped.append((crossing, label if inside[k] else edge))
+    return _close_ring(clipped, tolerance)
+
+
+def merge_pocket(polygon, pocket, label, opposite, tolerance=1e-9):
+    """União do polígono com o "bolso" do outro lado de uma de suas arestas
+
+    `polygon` tem uma aresta sobre a reta `label` e `pocket` (o resto da
+    região, do lado oposto) tem a mesma aresta percorrida no sentido contrário,
+    rotulada `opposite`. A união é convexa: basta emendar as duas cadeias de
+    vértices no lugar da aresta comum. Retorna None nos casos degenerados
+    (sem aresta comum bem definida), em que é preciso recalcular tudo.
+    """
+    if len(polygon) < 3 or len(pocket) < 3:
+        return None
+    shared = [k for k, (_, edge) in enumerate(polygon) if edge == label]
+    reverse = [k for k, (_, edge) in enumerate(pocket) if edge == opposite]
+    if len(shared) != 1 or len(reverse) != 1:
+        return None
+    n, m = len(polygon), len(pocket)
+    i, j = shared[0], reverse[0]
+    # polygon: u -> w sobre a reta; pocket: w -> u no sentido contrário
+    u, w = polygon[i][0], polygon[(i + 1) % n][0]
+    if not (_same_point(pocket[j][0], w, tolerance) and _same_point(pocket[(j + 1) % m][0], u, tolerance)):
+        return None
+
+    merged = [polygon[(i + 1 + k) % n] for k in range(n)]
+    merged[-1] = (u, pocket[(j + 1) % m][1])
+    merged += [pocket[(j + 2 + k) % m] for k in range(m - 2)]
+    return _close_ring(merged, tolerance)
+
+
+def _line_intersection(first, second, tolerance=1e-12):
+    """Ponto comum das retas (a1, a2, b) first e second, ou None se forem paralelas"""
+    det = first[0] * second[1] - first[1] * second[0]
+    scale = np.hypot(first[0], first[1]) * np.hypot(second[0], second[1])
+    if abs(det) <= tolerance * scale:
+        return None
+    return ((first[2] * second[1] - second[2] * first[1]) / det,
+            (first[0] * second[2] - second[0] * first[2]) / det)
+
+
+def _close_ring(polygon, tolerance):
+    """Funde vértices repetidos e remove os que ficam no meio de uma mesma reta"""
+    ring = []
+    for point, edge in polygon:
+        if ring and _same_point(ring[-1][0], point, tolerance):
+            ring[-1] = (ring[-1][0], edge)  # aresta de comprimento zero: vale a seguinte
+        else:
+            ring.append((point, edge))
+    while len(ring) > 1 and _same_point(ring[-1][0], ring[0][0], tolerance):
+        ring.pop()
+    if len(ring) >= 3:
+        ring = [vertex for k, vertex in enumerate(ring) if ring[k - 1][1] != vertex[1]]
+    return ring
@@ -0,0 +1,47 @@
+import time
+
+
+class LimitReached(ValueError):
+    """O simplex parou por limite de iterações ou de tempo antes da otimalidade
+
+    Subclasse de ValueError, de modo que quem só trata os erros do solver
+    continua funcionando. O solver preenche `partial` com a melhor base
+    encontrada (no simplex primal o objetivo nunca piora, então é a atual):
+    base, var_types, solução, valor do objetivo e se ela é factível. A base
+    pode ser passada como `base=` numa nova chamada para continuar dali.
+    """
+
+    MESSAGES = {
+        'iterations': "Limite de iterações atingido",
+        'time': "Limite de tempo atingido",
+    }
+
+    def __init__(self, reason, iterations, engine=None):
+        super().__init__(f"{self.MESSAGES[reason]} ({iterations} iterações)")
+        self.reason = reason
+        self.iterations = iterations
+        self.engine = engine
+        self.columns = None  # colunas do engine no layout completo (Fase II das duas fases)
+        self.partial = None
+
+
+class SolveLimits:
+    """Limite de iterações e prazo (segundos de relógio) de um solve
+
+    start() fixa o prazo a partir de agora; check() é chamado a cada pivô e
+    levanta LimitReached ao atingir qualquer um dos limites. None desliga.
+    """
+
+    def __init__(self, max_iterations=None, time_limit=None):
+        self.max_iterations = max_iterations
+        self.time_limit = time_limit
+        self.deadline = None
+
+    def start(self):
+        self.deadline = None if self.time_limit is None else time.monotonic() + self.time_limit
+
+    def check(self, iterations, engine):
+        if self.max_iterations is not None and iterations >= self.max_iterations:
+            raise LimitReached('iterations', iterations, engine)
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise LimitReached('time', iterations, engine)
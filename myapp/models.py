@@ -1,9 +1,15 @@
-from django.db import models
 import numpy as np
 
 import matplotlib.pyplot as plt
 from matplotlib.patches import Polygon
-from itertools import combinations
+from .big_m import SimplexBigM
+from .bounds import Bounds
+from .limits import LimitReached, SolveLimits
+from .presolve import Presolve
+from .pricing import Bland, make_pricing
+from .scaling import Scaling
+from .simplex_engine import PrimalSimplex, TableauEngine
+from .trace import PrintSink
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -368,8 +374,11 @@ class GraphicalMethod:
 # MÉTODO SIMPLEX PADRÃO - INÍCIO
 # ============================================================================
 
-class SimplexStandard:
-    def __init__(self, c, A, b, sense='max', constraints_type=None):
+class SimplexStandard(PrimalSimplex):
+    
+    def __init__(self, c, A, b, sense='max', constraints_type=None, trace=None, presolve=False,
+                 scaling=True, pricing=None, max_iterations=None, time_limit=None, lower=None,
+                 upper=None):
         self.c_original = np.array(c, dtype=float)
         self.A_original = np.array(A, dtype=float)
         self.b_original = np.array(b, dtype=float)
@@ -386,121 +395,137 @@ class SimplexStandard:
         self.b = self.b_original.copy()
         
         self.m, self.n = self.A.shape
-    
-    def solve(self):
-        """Simplex padrão (assume forma canônica)"""
-        print("\n=== MÉTODO SIMPLEX PADRÃO ===")
         
-        # Verificar se todas as restrições são <=
-        if not all(ct == '<=' for ct in self.constraints_type):
-            raise ValueError("Simplex padrão requer todas as restrições do tipo <=")
+        # Limites l <= x <= u (myapp.bounds): o modelo passa às variáveis x' e
+        # a forma canônica é exigida dele (b - A l >= 0)
+        self.bounds = Bounds(self.n, lower, upper)
+        self.c, self.A, self.b = self.bounds.model(self.c, self.A, self.b)
         
-        # Verificar se todos os b são não-negativos
-        if not all(bi >= 0 for bi in self.b):
-            raise ValueError("Simplex padrão requer todos os termos b ≥ 0")
+        # Sink de eventos (myapp.trace); None desliga o rastreamento
+        self.trace = trace
         
-        # Adicionar variáveis de folga
-        tableau = np.hstack([self.A, np.eye(self.m)])
-        c_extended = np.hstack([self.c, np.zeros(self.m)])
+        # Reduções antes do simplex (myapp.presolve) e duais da solução
+        self.presolve = presolve
+        self.presolved = None
+        self.duals = None
         
-        # Base inicial (variáveis de folga)
-        base = list(range(self.n, self.n + self.m))
+        # Escala automática de linhas e colunas (myapp.scaling)
+        self.auto_scaling = scaling
+        self.scaling = Scaling.for_matrix(self.A) if scaling else Scaling.identity(self.m, self.n)
         
-        iteration = 0
-        print(f"Tableau inicial:")
-        self._print_tableau(tableau, c_extended, self.b, base)
+        # Regra da variável entrante (myapp.pricing)
+        self.pricing = make_pricing(pricing)
+        self.fallback = Bland()
+        self.iterations = 0
         
-        while True:
-            iteration += 1
-            print(f"\n--- Iteração {iteration} ---")
-            
-            # Calcular custos reduzidos
-            reduced_costs = []
-            for j in range(len(c_extended)):
-                if j not in base:
-                    rc = c_extended[j]
-                    for i, var in enumerate(base):
-                        rc -= c_extended[var] * tableau[i, j]
-                    reduced_costs.append((j, rc))
-            
-            # Teste de otimalidade
-            max_rc = max(reduced_costs, key=lambda x: x[1])
-            if max_rc[1] <= 1e-8:
-                print("Solução ótima encontrada!")
-                break
-            
-            # Variável entrante
-            entering = max_rc[0]
-            print(f"Variável entrante: x_{entering + 1}")
-            
-            # Teste de ilimitação
-            if all(tableau[i, entering] <= 1e-8 for i in range(self.m)):
-                raise ValueError("Problema ilimitado")
-            
-            # Variável sainte (teste da razão)
-            ratios = []
-            for i in range(self.m):
-                if tableau[i, entering] > 1e-8:
-                    ratios.append((i, self.b[i] / tableau[i, entering]))
-                else:
-                    ratios.append((i, float('inf')))
-            
-            leaving_idx = min(ratios, key=lambda x: x[1])[0]
-            leaving = base[leaving_idx]
-            print(f"Variável sainte: x_{leaving + 1}")
-            
-            # Pivotamento
-            pivot = tableau[leaving_idx, entering]
-            tableau[leaving_idx, :] /= pivot
-            self.b[leaving_idx] /= pivot
-            
-            for i in range(self.m):
-                if i != leaving_idx and abs(tableau[i, entering]) > 1e-8:
-                    factor = tableau[i, entering]
-                    tableau[i, :] -= factor * tableau[leaving_idx, :]
-                    self.b[i] -= factor * self.b[leaving_idx]
-            
-            # Atualizar base
-            base[leaving_idx] = entering
-            
-            self._print_tableau(tableau, c_extended, self.b, base)
+        # Limite de pivôs e prazo em segundos (myapp.limits)
+        self.limits = SolveLimits(max_iterations, time_limit)
+    
+    def solve(self):
+        """Simplex padrão (assume forma canônica)
+
+        O tableau é montado sobre o modelo escalado; solução e duais são
+        desescalados na saída. Objetivo estacionado por STALL_PIVOTS pivôs
+        passa à regra de Bland; max_iterations e time_limit levantam
+        LimitReached com a base atual (sempre factível neste método). Os
+        limites superiores ficam no teste da razão, sem linhas extras.
+        """
+        trace = self.trace
+        self.limits.start()
+        if self.presolve:
+            self._check_canonical()
+            return self._solve_presolved()
+        
+        if trace is not None:
+            trace.emit({'event': 'start', 'method': 'standard', 'pricing': self.pricing.name})
+            if self.scaling.active:
+                trace.emit(dict(self.scaling.stats(), event='scaling'))
+            if self.bounds.active:
+                trace.emit(dict(self.bounds.stats(), event='bounds'))
+        
+        self._check_canonical()
+        
+        # Adicionar variáveis de folga (a escala das linhas preserva b >= 0)
+        c, A, b = self.scaling.model(self.c, self.A, self.b)
+        tableau = np.hstack([A, np.eye(self.m)])
+        c_extended = np.hstack([c, np.zeros(self.m)])
         
-        # Extrair solução
-        solution = np.zeros(self.n + self.m)
-        for i, var in enumerate(base):
-            solution[var] = self.b[i]
+        # Base inicial (variáveis de folga)
+        base = list(range(self.n, self.n + self.m))
         
-        obj_value = sum(c_extended[var] * solution[var] for var in base)
+        upper = np.concatenate([self.scaling.upper(self.bounds.width), np.full(self.m, np.inf)])
+        engine = TableauEngine(tableau, c_extended, b, base, upper=upper)
+        
+        try:
+            self._run_simplex(engine)
+        except LimitReached as limit:
+            if trace is not None:
+                trace.emit({'event': 'limit', 'reason': limit.reason, 'message': str(limit)})
+            solution = self.bounds.solution(self.scaling.solution(engine.solution()[:self.n]))
+            limit.partial = {
+                'base': [int(v) for v in engine.base],
+                'solution': solution.tolist(),
+                'objective': float(self.c_original @ solution),
+                'feasible': True,
+            }
+            raise
+        
+        # Extrair solução; os duais são os custos reduzidos das folgas com sinal trocado
+        self.b = engine.b
+        solution = engine.solution()
+        obj_value = engine.objective_value()
+        self.duals = self.scaling.duals(-engine.reduced_costs()[self.n:])
         
         if self.sense == 'min':
             obj_value = -obj_value
+            self.duals = -self.duals
+        obj_value += self.bounds.constant(self.c_original)
         
-        return solution[:self.n], obj_value
+        return self.bounds.solution(self.scaling.solution(solution[:self.n])), obj_value
     
-    def _print_tableau(self, tableau, c, b, base):
-        """Imprime o tableau do simplex"""
-        print("\nTableau:")
-        print("Base\t", end="")
-        for j in range(tableau.shape[1]):
-            print(f"x_{j+1}\t", end="")
-        print("RHS")
-        
-        for i in range(len(base)):
-            print(f"x_{base[i]+1}\t", end="")
-            for j in range(tableau.shape[1]):
-                print(f"{tableau[i,j]:.3f}\t", end="")
-            print(f"{b[i]:.3f}")
-        
-        print("z\t", end="")
-        for j in range(len(c)):
-            if j not in base:
-                rc = c[j] - sum(c[base[i]] * tableau[i,j] for i in range(len(base)))
-                print(f"{rc:.3f}\t", end="")
-            else:
-                print("0.000\t", end="")
+    def _check_canonical(self):
+        # Verificar se todas as restrições são <=
+        if not all(ct == '<=' for ct in self.constraints_type):
+            raise ValueError("Simplex padrão requer todas as restrições do tipo <=")
         
-        obj_value = sum(c[base[i]] * b[i] for i in range(len(base)))
-        print(f"{obj_value:.3f}")
+        # Verificar se todos os b são não-negativos
+        if not all(bi >= 0 for bi in self.b):
+            raise ValueError("Simplex padrão requer todos os termos b ≥ 0")
+    
+    def _solve_presolved(self):
+        """Presolve, simplex padrão no modelo reduzido e postsolve
+
+        A forma canônica se mantém: sem linhas >= não há limites inferiores
+        a deslocar, e os limites superiores seguem nativos para o simplex.
+        """
+        c, A, b = self.bounds.model(self.c_original, self.A_original, self.b_original)
+        reduction = Presolve(c, A, b, self.sense, self.constraints_type, upper=self.bounds.width)
+        self.presolved = reduction
+        if self.trace is not None:
+            self.trace.emit(dict(reduction.stats(), event='presolve'))
+        
+        def solve_reduced(c, A, b, constraints_type, upper):
+            solver = SimplexStandard(c, A, b, self.sense, constraints_type, trace=self.trace,
+                                     scaling=self.auto_scaling, pricing=self.pricing.name,
+                                     max_iterations=self.limits.max_iterations,
+                                     time_limit=self.limits.time_limit, upper=upper)
+            try:
+                solution, _ = solver.solve()
+            finally:
+                self.scaling, self.pricing, self.iterations = solver.scaling, solver.pricing, solver.iterations
+            return solution, solver.duals
+        
+        try:
+            solution, self.duals = reduction.solve(solve_reduced)
+        except LimitReached as limit:
+            # Solução parcial levada ao modelo original (a base segue a do reduzido)
+            solution, _ = reduction.postsolve(limit.partial['solution'], np.zeros(reduction.rows.size))
+            solution = self.bounds.solution(solution)
+            limit.partial = dict(limit.partial, solution=solution.tolist(),
+                                 objective=float(self.c_original @ solution))
+            raise
+        solution = self.bounds.solution(solution)
+        return solution, float(self.c_original @ solution)
 
 # ============================================================================
 # MÉTODO SIMPLEX PADRÃO - FIM
@@ -511,39 +536,59 @@ class SimplexStandard:
 # ============================================================================
 
 class SimplexMinimization:
-    def __init__(self, c, A, b, constraints_type=None):
+    def __init__(self, c, A, b, constraints_type=None, trace=None, presolve=False, scaling=True,
+                 pricing=None, max_iterations=None, time_limit=None, lower=None, upper=None):
         self.c_original = np.array(c, dtype=float)
         self.A_original = np.array(A, dtype=float)
         self.b_original = np.array(b, dtype=float)
         self.constraints_type = constraints_type or ['<='] * len(b)
         self.m, self.n = self.A_original.shape
+        self.trace = trace
+        self.presolve = presolve
+        self.presolved = None
+        self.duals = None
+        self.scaling = scaling
+        self.pricing = pricing
+        self.limits = {'max_iterations': max_iterations, 'time_limit': time_limit}
+        self.bounds = Bounds(self.n, lower, upper)
+        self.iterations = 0
     
     def solve(self):
         """Simplex para minimização"""
-        print("\n=== SIMPLEX PARA MINIMIZAÇÃO ===")
-        print("Convertendo problema de minimização para maximização...")
+        if self.trace is not None:
+            self.trace.emit({'event': 'start', 'method': 'minimization'})
         
         # Verificar se todas as restrições são <=
         if not all(ct == '<=' for ct in self.constraints_type):
             raise ValueError("Simplex para minimização requer todas as restrições do tipo <=")
         
-        # Verificar se todos os b são não-negativos
-        if not all(bi >= 0 for bi in self.b_original):
+        # Verificar se todos os b são não-negativos (já com x deslocado pelos limites)
+        _, _, b = self.bounds.model(self.c_original, self.A_original, self.b_original)
+        if not all(bi >= 0 for bi in b):
             raise ValueError("Simplex para minimização requer todos os termos b ≥ 0")
         
         # Converter min para max (multiplicar função objetivo por -1)
         c_max = -self.c_original
         
         # Usar simplex padrão para resolver o problema de maximização
-        simplex_solver = SimplexStandard(c_max, self.A_original, self.b_original, 'max', self.constraints_type)
-        solution, obj_value_max = simplex_solver.solve()
-        
-        # Converter resultado de volta para minimização
+        simplex_solver = SimplexStandard(c_max, self.A_original, self.b_original, 'max', self.constraints_type,
+                                         trace=self.trace, presolve=self.presolve, scaling=self.scaling,
+                                         pricing=self.pricing, lower=self.bounds.lower,
+                                         upper=self.bounds.upper, **self.limits)
+        try:
+            solution, obj_value_max = simplex_solver.solve()
+        except LimitReached as limit:
+            limit.partial = dict(limit.partial, objective=-limit.partial['objective'])
+            raise
+        self.presolved = simplex_solver.presolved
+        self.iterations = simplex_solver.iterations
+        
+        # Converter resultado de volta para minimização (duais também trocam de sinal)
         obj_value_min = -obj_value_max
+        self.duals = -simplex_solver.duals
         
-        print(f"\nConversão concluída:")
-        print(f"Valor da maximização: {obj_value_max:.6f}")
-        print(f"Valor da minimização: {obj_value_min:.6f}")
+        if self.trace is not None:
+            self.trace.emit({'event': 'conversion', 'max_value': obj_value_max, 'min_value': obj_value_min})
         
         return solution, obj_value_min
 
@@ -632,12 +677,12 @@ if __name__ == "__main__":
                 
             elif opcao == '2':
                 # Simplex Padrão
-                solver = SimplexStandard(c, A, b, sense, constraints_type)
+                solver = SimplexStandard(c, A, b, sense, constraints_type, trace=PrintSink())
                 solution, obj_value = solver.solve()
                 
             elif opcao == '3':
                 # Big M
-                solver = SimplexBigM(c, A, b, sense, constraints_type)
+                solver = SimplexBigM(c, A, b, sense, constraints_type, trace=PrintSink())
                 solution, obj_value = solver.solve()
                 
             elif opcao == '4':
@@ -645,14 +690,14 @@ if __name__ == "__main__":
                 if sense != 'min':
                     print("Erro: Esta opção é apenas para problemas de minimização!")
                     continue
-                solver = SimplexMinimization(c, A, b, constraints_type)
+                solver = SimplexMinimization(c, A, b, constraints_type, trace=PrintSink())
                 solution, obj_value = solver.solve()
                 
             else:
                 print("Opção inválida!")
                 continue
             
-            print(f"\n=== SOLUÇÃO FINAL ===")
+            print("\n=== SOLUÇÃO FINAL ===")
             for i, val in enumerate(solution):
                 print(f"x_{i+1} = {val:.6f}")
             print(f"Valor ótimo: {obj_value:.6f}")
@@ -0,0 +1,71 @@
+import io
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# Formatos aceitos e seus tipos MIME
+FORMATS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+    'webp': 'image/webp',
+}
+
+DEFAULT_OPTIONS = {'format': 'png', 'width': 12.0, 'height': 10.0, 'dpi': 100, 'quality': 80}
+
+# Limites para que uma requisição não peça um gráfico gigantesco
+MAX_INCHES = 20.0
+MIN_INCHES = 1.0
+MAX_DPI = 300
+MIN_DPI = 20
+
+
+def plot_options(options=None):
+    """Valida as opções de gráfico de um payload ({"format", "width", "height", "dpi", "quality"})
+
+    width e height em polegadas; quality (1-100) só vale para WebP. Opções
+    ausentes recebem o padrão (PNG 12x10 a 100 dpi, como o gráfico original).
+    """
+    merged = dict(DEFAULT_OPTIONS, **(options or {}))
+    if merged['format'] not in FORMATS:
+        raise ValueError(f"Formato de gráfico inválido: {merged['format']}")
+    width, height = float(merged['width']), float(merged['height'])
+    if not (MIN_INCHES <= width <= MAX_INCHES and MIN_INCHES <= height <= MAX_INCHES):
+        raise ValueError(f"Tamanho do gráfico deve estar entre {MIN_INCHES:g} e {MAX_INCHES:g} polegadas")
+    dpi = int(merged['dpi'])
+    if not MIN_DPI <= dpi <= MAX_DPI:
+        raise ValueError(f"DPI do gráfico deve estar entre {MIN_DPI} e {MAX_DPI}")
+    quality = int(merged['quality'])
+    if not 1 <= quality <= 100:
+        raise ValueError("Qualidade do gráfico deve estar entre 1 e 100")
+    return {'format': merged['format'], 'width': width, 'height': height, 'dpi': dpi, 'quality': quality}
+
+
+def new_figure(width=12.0, height=10.0, dpi=100):
+    """Figura ligada diretamente a um canvas Agg, fora do estado global do pyplot
+
+    Sem o registro do pyplot a figura é liberada assim que deixa de ser
+    referenciada, em vez de se acumular até o worker ser reciclado.
+    """
+    figure = Figure(figsize=(width, height), dpi=dpi)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def render_figure(figure, format='png', dpi=None, quality=80):
+    """Serializa a figura em bytes no formato pedido e libera seus artistas"""
+    buffer = io.BytesIO()
+    try:
+        kwargs = {'pil_kwargs': {'quality': quality, 'method': 4}} if format == 'webp' else {}
+        figure.savefig(buffer, format=format, dpi=dpi or figure.dpi, **kwargs)
+        return buffer.getvalue()
+    finally:
+        figure.clear()
+        buffer.close()
+
+
+def render_plot(draw, options=None):
+    """Cria a figura, chama draw(figure), serializa e a descarta; retorna (bytes, mime)"""
+    options = plot_options(options)
+    figure = new_figure(options['width'], options['height'], options['dpi'])
+    draw(figure)
+    return render_figure(figure, options['format'], options['dpi'], options['quality']), FORMATS[options['format']]
@@ -0,0 +1,52 @@
+import hashlib
+import json
+
+from django.conf import settings
+
+from .plot_renderer import plot_options
+from .result_cache import get_cache
+
+PLOT_PREFIX = 'plot:'
+
+
+def plot_spec(data):
+    """Tudo o que determina o gráfico de /grafico/: o modelo e as opções de renderização"""
+    m = len(data['b'])
+    return {
+        'c': [float(v) for v in data['c']],
+        'A': [[float(v) for v in row] for row in data['A']],
+        'b': [float(v) for v in data['b']],
+        'sense': data.get('sense', 'max'),
+        'constraints_type': list(data.get('constraints_type', None) or ['<='] * m),
+        'plot': plot_options(data.get('plot')),
+    }
+
+
+def plot_id(spec):
+    """Endereço do gráfico: sha256 da especificação canônica (a imagem é função dela)"""
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
+
+async def store_plot(data):
+    """Registra a especificação do gráfico no cache e retorna (id, extensão)
+
+    A imagem só é renderizada quando o endpoint de gráficos a recebe pela
+    primeira vez, de modo que a resposta JSON não espera pela codificação.
+    """
+    spec = plot_spec(data)
+    identifier = plot_id(spec)
+    timeout = getattr(settings, 'PLOT_CACHE_TIMEOUT', 86400)
+    cache = get_cache()
+    if not await cache.aadd(PLOT_PREFIX + identifier, {'spec': spec}, timeout):
+        await cache.atouch(PLOT_PREFIX + identifier, timeout)
+    return identifier, spec['plot']['format']
+
+
+async def load_plot(identifier):
+    return await get_cache().aget(PLOT_PREFIX + identifier)
+
+
+async def save_plot_image(identifier, entry, image):
+    timeout = getattr(settings, 'PLOT_CACHE_TIMEOUT', 86400)
+    await get_cache().aset(PLOT_PREFIX + identifier, dict(entry, image=image), timeout)
+
@@ -0,0 +1,271 @@
+import numpy as np
+import scipy.sparse as sp
+
+
+class Presolve:
+    """Reduções do modelo antes do simplex e o caminho de volta (postsolve)
+
+    Trabalha sobre max/min c·x, A x (<=, >=, =) b, 0 <= x <= upper (None:
+    sem limites superiores), acumulando limites l <= x <= u que vêm de
+    linhas singleton. As reduções se repetem até o modelo parar de mudar:
+      - linhas vazias: verifica 0 <tipo> b e descarta;
+      - linhas singleton viram limites da variável (o mais apertado vence);
+      - variáveis fixas (l = u) são substituídas em b;
+      - colunas vazias vão para o limite preferido pelo custo;
+      - linhas dominadas (satisfeitas para quaisquer x dentro dos limites) saem;
+      - linhas paralelas (múltiplas umas das outras) ficam só com as mais
+        apertadas, ou o modelo é declarado infactível.
+    O modelo reduzido desloca x por l e devolve os limites superiores
+    u_j - l_j à parte, para o simplex tratá-los nativamente (sem linhas
+    extras). postsolve() reconstrói x e os duais y_i = ∂(valor ótimo)/∂b_i do
+    modelo original: linhas descartadas têm dual zero e cada linha singleton
+    recebe o custo reduzido da sua variável quando o limite que ela criou
+    está ativo.
+    """
+
+    MAX_PASSES = 20
+    REDUCTIONS = ('empty_rows', 'singleton_rows', 'fixed_cols', 'empty_cols', 'dominated_rows', 'duplicate_rows')
+
+    def __init__(self, c, A, b, sense='max', constraints_type=None, tolerance=1e-9, upper=None):
+        self.sparse = sp.issparse(A)
+        self.A = sp.csr_matrix(A, dtype=float)
+        self.A.sum_duplicates()
+        self.A.eliminate_zeros()
+        self.columns = self.A.tocsc()
+        self.m, self.n = self.A.shape
+        self.c = np.array(c, dtype=float)
+        self.b = np.array(b, dtype=float)  # b com as variáveis fixas já substituídas
+        self.sense = sense
+        self.constraints_type = np.array(constraints_type or ['<='] * self.m, dtype=object)
+        if len(self.c) != self.n or len(self.b) != self.m or len(self.constraints_type) != self.m:
+            raise ValueError("Dimensões incompatíveis")
+        self.tolerance = tolerance
+
+        # Custos na forma de maximização (os duais internos também)
+        self.c_max = -self.c if sense == 'min' else self.c.copy()
+
+        self.lower = np.zeros(self.n)
+        self.upper = np.full(self.n, np.inf) if upper is None else np.array(upper, dtype=float)
+        # Linha singleton que definiu cada limite (-1: x >= 0 ou sem limite)
+        self.lower_row = np.full(self.n, -1)
+        self.upper_row = np.full(self.n, -1)
+
+        self.row_active = np.ones(self.m, dtype=bool)
+        self.col_active = np.ones(self.n, dtype=bool)
+        self.fixed = []  # (coluna, valor) na ordem em que saíram do modelo
+        self.removed = dict.fromkeys(self.REDUCTIONS, 0)
+
+        self._reduce()
+
+        self.rows = np.flatnonzero(self.row_active)
+        self.cols = np.flatnonzero(self.col_active)
+        self.bounded = np.flatnonzero(np.isfinite(self.upper[self.cols]))
+
+    def _reduce(self):
+        for _ in range(self.MAX_PASSES):
+            before = (self.row_active.sum(), self.col_active.sum(), len(self.fixed),
+                      self.lower.tobytes(), self.upper.tobytes())
+            for reduction in self.REDUCTIONS:
+                getattr(self, '_' + reduction)(self._working())
+            after = (self.row_active.sum(), self.col_active.sum(), len(self.fixed),
+                     self.lower.tobytes(), self.upper.tobytes())
+            if after == before:
+                break
+
+    def _working(self):
+        """A restrita às linhas e colunas ativas (as demais zeradas)"""
+        W = sp.diags(self.row_active.astype(float)) @ self.A @ sp.diags(self.col_active.astype(float))
+        W = sp.csr_matrix(W)
+        W.eliminate_zeros()
+        W.sort_indices()
+        return W
+
+    def _tolerance(self, values):
+        return self.tolerance * (1.0 + np.abs(values))
+
+    def _infeasible(self, row):
+        raise ValueError(f"Problema infactível - restrição {row + 1} não pode ser satisfeita (presolve)")
+
+    def _empty_rows(self, W):
+        counts = np.diff(W.indptr)
+        for i in np.flatnonzero(self.row_active & (counts == 0)):
+            kind, rhs = self.constraints_type[i], self.b[i]
+            tolerance = self._tolerance(rhs)
+            if ((kind == '<=' and rhs < -tolerance) or (kind == '>=' and rhs > tolerance)
+                    or (kind == '=' and abs(rhs) > tolerance)):
+                self._infeasible(i)
+            self.row_active[i] = False
+            self.removed['empty_rows'] += 1
+
+    def _singleton_rows(self, W):
+        counts = np.diff(W.indptr)
+        for i in np.flatnonzero(self.row_active & (counts == 1)):
+            j, a = W.indices[W.indptr[i]], W.data[W.indptr[i]]
+            value = self.b[i] / a
+            kind = self.constraints_type[i]
+            if a < 0:
+                kind = {'<=': '>=', '>=': '<='}.get(kind, kind)
+            if kind in ('<=', '=') and value < self.upper[j]:
+                self.upper[j], self.upper_row[j] = value, i
+            if kind in ('>=', '=') and value > self.lower[j]:
+                self.lower[j], self.lower_row[j] = value, i
+            if self.lower[j] > self.upper[j] + self._tolerance(self.upper[j]):
+                self._infeasible(i)
+            self.row_active[i] = False
+            self.removed['singleton_rows'] += 1
+
+    def _fixed_cols(self, W):
+        fixed = np.flatnonzero(self.col_active & (self.upper - self.lower <= self._tolerance(self.lower)))
+        if fixed.size == 0:
+            return
+        values = self.lower[fixed]
+        self.b -= W[:, fixed] @ values
+        self.col_active[fixed] = False
+        self.fixed.extend(zip(fixed.tolist(), values.tolist()))
+        self.removed['fixed_cols'] += fixed.size
+
+    def _empty_cols(self, W):
+        counts = np.bincount(W.indices, minlength=self.n)
+        for j in np.flatnonzero(self.col_active & (counts == 0)):
+            if self.c_max[j] > self._tolerance(self.c_max[j]):
+                if not np.isfinite(self.upper[j]):
+                    continue  # ilimitado se o resto for factível: fica para o solver
+                value = self.upper[j]
+            else:
+                value = self.lower[j]
+            self.col_active[j] = False
+            self.fixed.append((int(j), float(value)))
+            self.removed['empty_cols'] += 1
+
+    def _dominated_rows(self, W):
+        """Descarta linhas sempre satisfeitas dentro dos limites (e detecta as impossíveis)"""
+        active = self.row_active & (np.diff(W.indptr) > 0)
+        if not active.any():
+            return
+        positive, negative = W.copy(), W.copy()
+        positive.data = np.maximum(positive.data, 0.0)
+        negative.data = np.minimum(negative.data, 0.0)
+        infinite = np.isinf(self.upper)
+        upper = np.where(infinite, 0.0, self.upper)
+
+        # Atividade mínima e máxima de cada linha; *_inf conta termos infinitos
+        max_activity = positive @ upper + negative @ self.lower
+        min_activity = positive @ self.lower + negative @ upper
+        max_inf = (positive != 0) @ infinite
+        min_inf = (negative != 0) @ infinite
+
+        kind = self.constraints_type
+        tolerance = self._tolerance(self.b)
+        upper_side = (kind == '<=') | (kind == '=')
+        lower_side = (kind == '>=') | (kind == '=')
+        impossible = active & (
+            (upper_side & (min_inf == 0) & (min_activity > self.b + tolerance))
+            | (lower_side & (max_inf == 0) & (max_activity < self.b - tolerance)))
+        if impossible.any():
+            self._infeasible(int(np.flatnonzero(impossible)[0]))
+
+        redundant = active & (
+            ((kind == '<=') & (max_inf == 0) & (max_activity <= self.b + tolerance))
+            | ((kind == '>=') & (min_inf == 0) & (min_activity >= self.b - tolerance)))
+        self.row_active[redundant] = False
+        self.removed['dominated_rows'] += int(redundant.sum())
+
+    def _duplicate_rows(self, W):
+        """Linhas paralelas: fica a de menor lado direito (<=) e a de maior (>=)"""
+        groups = {}
+        for i in np.flatnonzero(self.row_active & (np.diff(W.indptr) > 1)):
+            start, end = W.indptr[i], W.indptr[i + 1]
+            scale = W.data[start]
+            key = W.indices[start:end].tobytes() + np.round(W.data[start:end] / scale, 10).tobytes()
+            groups.setdefault(key, []).append((i, scale))
+
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+            # Cada linha como limite superior e/ou inferior de (a/scale)·x
+            high, low = None, None
+            for i, scale in members:
+                kind = self.constraints_type[i]
+                if scale < 0:
+                    kind = {'<=': '>=', '>=': '<='}.get(kind, kind)
+                value = self.b[i] / scale
+                if kind in ('<=', '=') and (high is None or value < high[1]):
+                    high = (i, value)
+                if kind in ('>=', '=') and (low is None or value > low[1]):
+                    low = (i, value)
+            if high is not None and low is not None and low[1] > high[1] + self._tolerance(high[1]):
+                self._infeasible(low[0])
+            keep = {side[0] for side in (high, low) if side is not None}
+            for i, _ in members:
+                if i not in keep:
+                    self.row_active[i] = False
+                    self.removed['duplicate_rows'] += 1
+
+    def reduced(self):
+        """Modelo reduzido (c, A, b, constraints_type, upper), nas colunas x' = x - l"""
+        A = self.A[self.rows][:, self.cols]
+        shift = self.lower[self.cols]
+        b = self.b[self.rows] - A @ shift
+        upper = self.upper[self.cols] - shift
+        constraints_type = list(self.constraints_type[self.rows])
+        return self.c[self.cols], (A if self.sparse else A.toarray()), b, constraints_type, upper
+
+    def solve(self, solve_reduced):
+        """Solução e duais do modelo original
+
+        `solve_reduced(c, A, b, constraints_type, upper)` resolve o modelo
+        reduzido (com 0 <= x' <= upper) e retorna (x, duais). Sem nenhuma linha
+        restante o reduzido é trivial: as colunas que sobram não têm limite
+        superior (as demais saíram como colunas vazias), então x' = 0, ou
+        ilimitado se alguma delas melhora c.
+        """
+        if self.rows.size == 0:
+            if np.any(self.c_max[self.cols] > self._tolerance(self.c_max[self.cols])):
+                raise ValueError("Problema ilimitado")
+            return self.postsolve(np.zeros(self.cols.size), np.zeros(0))
+        return self.postsolve(*solve_reduced(*self.reduced()))
+
+    def postsolve(self, x_reduced, duals_reduced):
+        """Leva (x, duais) do modelo reduzido de volta ao original"""
+        x = np.zeros(self.n)
+        x[self.cols] = np.asarray(x_reduced, dtype=float) + self.lower[self.cols]
+        y = np.zeros(self.m)
+        y[self.rows] = np.asarray(duals_reduced, dtype=float)
+        if self.sense == 'min':
+            y = -y
+
+        for j in self.cols:
+            self._singleton_duals(j, x, y)
+        # Ordem inversa da remoção: quem saiu depois pode estar nas linhas de quem saiu antes
+        for j, value in reversed(self.fixed):
+            x[j] = value
+            self._singleton_duals(j, x, y)
+
+        return x, (-y if self.sense == 'min' else y)
+
+    def _singleton_duals(self, j, x, y):
+        """Dual da linha singleton cujo limite de x_j está ativo: zera o custo reduzido"""
+        if self.lower_row[j] < 0 and self.upper_row[j] < 0:
+            return
+        start, end = self.columns.indptr[j], self.columns.indptr[j + 1]
+        rows, values = self.columns.indices[start:end], self.columns.data[start:end]
+        reduced_cost = self.c_max[j] - values @ y[rows]
+        tolerance = self._tolerance(self.c_max[j])
+        if reduced_cost > tolerance and self.upper_row[j] >= 0 and x[j] >= self.upper[j] - self._tolerance(self.upper[j]):
+            row = self.upper_row[j]
+        elif reduced_cost < -tolerance and self.lower_row[j] >= 0 and x[j] <= self.lower[j] + self._tolerance(self.lower[j]):
+            row = self.lower_row[j]
+        else:
+            return
+        y[row] = reduced_cost / values[rows == row][0]
+
+    def stats(self):
+        """Tamanho original e reduzido, limites superiores e o que cada redução removeu"""
+        return {
+            'rows': self.m,
+            'cols': self.n,
+            'reduced_rows': int(self.rows.size),
+            'reduced_cols': int(self.cols.size),
+            'bounded': int(self.bounded.size),
+            'removed': dict(self.removed),
+        }
@@ -0,0 +1,232 @@
+import time
+
+import numpy as np
+
+
+class Pricing:
+    """Regra de escolha da variável entrante do simplex primal
+
+    Os solvers chamam start(engine) no início de cada laço do simplex,
+    entering(engine) a cada iteração e update(engine, row, entering) logo
+    antes do pivô (com a base ainda antiga), de modo que regras com pesos
+    possam atualizá-los a partir da coluna entrante e da linha pivô. Funciona
+    com TableauEngine e RevisedSimplexEngine. O tempo gasto na precificação
+    é acumulado em `time` para ser reportado junto às iterações. As regras
+    precificam por engine.improving_costs(), em que positivo é atrativo
+    também para as não-básicas no limite superior.
+    """
+
+    name = None
+
+    def __init__(self):
+        self.time = 0.0
+
+    def start(self, engine):
+        pass
+
+    def entering(self, engine):
+        """Índice da coluna entrante ou None se a base atual é ótima"""
+        started = time.perf_counter()
+        try:
+            return self._entering(engine)
+        finally:
+            self.time += time.perf_counter() - started
+
+    def update(self, engine, row, entering):
+        started = time.perf_counter()
+        try:
+            self._update(engine, row, entering)
+        finally:
+            self.time += time.perf_counter() - started
+
+    def _entering(self, engine):
+        raise NotImplementedError
+
+    def _update(self, engine, row, entering):
+        pass
+
+    def stats(self):
+        return {'rule': self.name, 'pricing_time': self.time}
+
+
+class Dantzig(Pricing):
+    """Maior custo reduzido positivo (regra original dos engines)"""
+
+    name = 'dantzig'
+
+    def _entering(self, engine):
+        return engine.entering_variable()
+
+
+class Bland(Pricing):
+    """Regra de Bland: a não-básica atrativa de menor índice
+
+    Junto com o desempate do teste da razão pela básica de menor índice
+    (leaving_row(..., smallest_index=True)) garante que o simplex não cicla;
+    os solvers passam a usá-la quando o objetivo estaciona.
+    """
+
+    name = 'bland'
+
+    def _entering(self, engine):
+        attractive = np.flatnonzero((engine.improving_costs() > engine.tolerance) & ~engine.in_base)
+        return int(attractive[0]) if attractive.size else None
+
+
+class Devex(Pricing):
+    """Devex: custo reduzido normalizado por pesos de referência aproximados
+
+    Escolhe o maior rc_j² / w_j. Os pesos começam em 1 (quadro de referência
+    = não-básicas atuais) e crescem com a linha pivô; quando algum passa de
+    RESET o quadro de referência é reiniciado.
+    """
+
+    name = 'devex'
+    RESET = 1e6
+
+    def __init__(self):
+        super().__init__()
+        self.weights = None
+
+    def start(self, engine):
+        self.weights = np.ones(engine.n_cols)
+
+    def _entering(self, engine):
+        return _best(engine, engine.improving_costs(), self.weights)
+
+    def _update(self, engine, row, entering):
+        column = engine.entering_column(entering)
+        pivot = column[row]
+        ratios = engine.row_product(_unit(engine.m, row)) / pivot
+        weight = self.weights[entering]
+        self.weights = np.maximum(self.weights, ratios ** 2 * weight)
+        self.weights[engine.base[row]] = max(weight / pivot ** 2, 1.0)
+        if self.weights.max() > self.RESET:
+            self.weights[:] = 1.0
+
+
+class SteepestEdge(Pricing):
+    """Steepest edge: maior rc_j² / γ_j com γ_j = 1 + ||B^-1 a_j||²
+
+    Os pesos iniciais vêm de engine.edge_weights() e são mantidos pelas
+    recorrências de Goldfarb e Reid, que custam, por iteração, a linha pivô
+    e o produto d^T B^-1 A com a coluna entrante d = B^-1 a_q.
+    """
+
+    name = 'steepest_edge'
+
+    def __init__(self):
+        super().__init__()
+        self.weights = None
+
+    def start(self, engine):
+        self.weights = engine.edge_weights()
+
+    def _entering(self, engine):
+        return _best(engine, engine.improving_costs(), self.weights)
+
+    def _update(self, engine, row, entering):
+        column = engine.entering_column(entering)
+        pivot = column[row]
+        ratios = engine.row_product(_unit(engine.m, row)) / pivot
+        gamma = 1.0 + column @ column
+        weights = self.weights - 2.0 * ratios * engine.row_product(column) + ratios ** 2 * gamma
+        self.weights = np.maximum(weights, 1.0 + ratios ** 2)
+        self.weights[engine.base[row]] = max(gamma / pivot ** 2, 1.0)
+
+
+class PartialPricing(Pricing):
+    """Precificação parcial: as colunas são divididas em `segments` blocos
+
+    Cada iteração precifica só o bloco atual e, se nele não houver custo
+    reduzido atrativo, os seguintes; a otimalidade só é declarada após uma
+    volta completa sem candidatas.
+    """
+
+    name = 'partial'
+
+    def __init__(self, segments=8):
+        super().__init__()
+        self.segments = segments
+        self.current = 0
+
+    def start(self, engine):
+        self.current = 0
+
+    def _entering(self, engine):
+        size = -(-engine.n_cols // self.segments)
+        for k in range(self.segments):
+            segment = (self.current + k) % self.segments
+            columns = np.arange(segment * size, min((segment + 1) * size, engine.n_cols))
+            if not columns.size:
+                continue
+            rc = engine.improving_costs(columns)
+            rc[engine.in_base[columns]] = -np.inf
+            best = int(np.argmax(rc))
+            if rc[best] > engine.tolerance:
+                self.current = segment
+                return int(columns[best])
+        return None
+
+
+class MultiplePricing(Pricing):
+    """Precificação múltipla: lista das `candidates` melhores colunas
+
+    Uma precificação completa escolhe as candidatas; as iterações seguintes
+    reprecificam apenas elas (com a base atual) até nenhuma continuar
+    atrativa, quando uma nova precificação completa refaz a lista.
+    """
+
+    name = 'multiple'
+
+    def __init__(self, candidates=8):
+        super().__init__()
+        self.size = candidates
+        self.candidates = np.array([], dtype=int)
+
+    def start(self, engine):
+        self.candidates = np.array([], dtype=int)
+
+    def _entering(self, engine):
+        if self.candidates.size:
+            rc = engine.improving_costs(self.candidates)
+            attractive = (rc > engine.tolerance) & ~engine.in_base[self.candidates]
+            if attractive.any():
+                self.candidates, rc = self.candidates[attractive], rc[attractive]
+                return int(self.candidates[np.argmax(rc)])
+
+        rc = np.where(engine.in_base, -np.inf, engine.improving_costs())
+        attractive = np.flatnonzero(rc > engine.tolerance)
+        if not attractive.size:
+            self.candidates = attractive
+            return None
+        if attractive.size > self.size:
+            attractive = attractive[np.argpartition(-rc[attractive], self.size)[:self.size]]
+        self.candidates = attractive
+        return int(attractive[np.argmax(rc[attractive])])
+
+
+PRICING_RULES = {rule.name: rule for rule in (Dantzig, Bland, Devex, SteepestEdge, PartialPricing, MultiplePricing)}
+
+
+def make_pricing(rule=None):
+    """Instância da regra pelo nome ('dantzig' por padrão)"""
+    rule = rule or 'dantzig'
+    if rule not in PRICING_RULES:
+        raise ValueError(f"Regra de precificação desconhecida: {rule}")
+    return PRICING_RULES[rule]()
+
+
+def _best(engine, rc, weights):
+    """Não-básica com rc_j > tolerância de maior rc_j² / w_j, ou None"""
+    candidates = (rc > engine.tolerance) & ~engine.in_base
+    if not candidates.any():
+        return None
+    scores = np.where(candidates, rc ** 2 / weights, -np.inf)
+    return int(np.argmax(scores))
+
+
+def _unit(m, row):
+    unit = np.zeros(m)
+    unit[row] = 1.0
+    return unit
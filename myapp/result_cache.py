@@ -0,0 +1,283 @@
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import threading
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from django.conf import settings
+from django.core.cache import InvalidCacheBackendError, caches
+
+from .bounds import Bounds
+from .plot_renderer import plot_options
+from .tasks import parse_matrix
+
+CACHE_ALIAS = 'solver'
+KEY_PREFIX = 'lp-result:'
+LOCK_SUFFIX = ':lock'
+
+# Mantissa preservada ao normalizar os floats (~12 dígitos significativos)
+MANTISSA_BITS = 40
+
+_TYPE_CODES = {'<=': 0, '>=': 1, '=': 2}
+
+# Campos que descrevem a execução que gravou a entrada, não o modelo: não vão
+# para o cache (a chave ignora max_iterations e time_limit)
+RUN_FIELDS = ('iterations',)
+PRICING_RUN_FIELDS = ('iterations', 'solve_time', 'pricing_time')
+
+
+def get_cache():
+    """Cache 'solver' de CACHES (ou o default, se o alias não existir)"""
+    try:
+        return caches[CACHE_ALIAS]
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+def _normalize(values):
+    """Arredonda a mantissa e troca -0.0 por 0.0, para que 0.1 + 0.2 e 0.3 coincidam"""
+    mantissa, exponent = np.frexp(np.asarray(values, dtype=float))
+    scale = float(2 ** MANTISSA_BITS)
+    return np.ldexp(np.round(mantissa * scale) / scale, exponent) + 0.0
+
+
+def _row_offsets(n, constraints_type, b):
+    """Primeira coluna extra de cada restrição, como em SimplexBigM._build_tableau"""
+    constraints_type = np.array(constraints_type, dtype=object)
+    negative = np.asarray(b) < 0
+    is_ge = np.where(negative, constraints_type == '<=', constraints_type == '>=')
+    n_extra = np.where(is_ge, 2, 1)
+    return (n + np.concatenate(([0], np.cumsum(n_extra)[:-1]))).tolist()
+
+
+class CachedProblem:
+    """Chave canônica de um PL e leitura/gravação do seu resultado no cache
+
+    A chave é o sha256 de (tipo de solve, método ou opções do gráfico, sentido,
+    c, A, b, tipos das restrições, limites das variáveis) com os floats normalizados e as linhas em
+    ordem canônica, de modo que o mesmo modelo escrito com as restrições em
+    outra ordem ou com ruído de formatação no último dígito reaproveita o
+    resultado. Como base e
+    var_types dependem da ordem das linhas, a entrada guarda a permutação de
+    quem a gravou e a resposta é remapeada para a ordem de quem a lê. Com
+    presolve e no método gráfico (índices e rótulos R1, R2, ... na geometria
+    e no gráfico) a ordem das linhas entra na chave.
+    """
+
+    def __init__(self, data, kind):
+        self.kind = kind
+        A = parse_matrix(data['A'])
+        A = sp.csr_matrix(A, dtype=float)
+        c = np.array(data['c'], dtype=float)
+        b = np.array(data['b'], dtype=float)
+        m, n = A.shape
+        constraints_type = list(data.get('constraints_type', None) or ['<='] * m)
+        if len(b) != m or len(constraints_type) != m or len(c) != n:
+            raise ValueError("Dimensões incompatíveis")
+
+        self.presolve = False
+        if kind == 'graphical':
+            # O modo e as opções do gráfico mudam a resposta (geometria, imagem
+            # embutida, formato e tamanho)
+            options = dict(plot_options(data.get('plot')), inline=bool(data.get('plot_inline')),
+                           mode=data.get('mode', 'plot'))
+            method = 'graphical:' + json.dumps(options, sort_keys=True)
+        else:
+            method = data.get('method', None) or ('revised' if isinstance(data['A'], dict) else 'bigm')
+            self.presolve = bool(data.get('presolve'))
+            if self.presolve:
+                method += '+presolve'
+            if not data.get('scaling', True):
+                method += '+unscaled'
+            if data.get('pricing', 'dantzig') != 'dantzig':
+                method += f"+pricing:{data['pricing']}"
+
+        # Cada linha vira bytes (tipo, b, colunas e valores não-zeros); a
+        # ordem canônica é a ordem desses bytes
+        A.sum_duplicates()
+        A.sort_indices()
+        values = _normalize(A.data)
+        b_normalized = _normalize(b)
+        rows = []
+        for i in range(m):
+            start, end = A.indptr[i], A.indptr[i + 1]
+            nonzero = values[start:end] != 0
+            rows.append(bytes([_TYPE_CODES.get(constraints_type[i], 3)])
+                        + b_normalized[i:i + 1].tobytes()
+                        + A.indices[start:end][nonzero].astype(np.int64).tobytes()
+                        + values[start:end][nonzero].tobytes())
+        self.permutation = sorted(range(m), key=rows.__getitem__)
+
+        digest = hashlib.sha256()
+        digest.update(f"{kind}|{method}|{data.get('sense', 'max')}|{m}|{n}|".encode())
+        digest.update(_normalize(c).tobytes())
+        if kind == 'bigm':
+            bounds = Bounds(n, data.get('lower', None), data.get('upper', None))
+            if bounds.active:
+                digest.update(b'bounds|' + _normalize(bounds.lower).tobytes() + _normalize(bounds.upper).tobytes())
+        for i in self.permutation:
+            digest.update(len(rows[i]).to_bytes(8, 'little') + rows[i])
+        if kind == 'graphical' or self.presolve:
+            # A base do modelo reduzido e os índices e rótulos das restrições
+            # na geometria e no gráfico não se traduzem entre ordens de linhas:
+            # só reaproveita quem escreveu as restrições na mesma ordem
+            digest.update(np.array(self.permutation, dtype=np.int64).tobytes())
+        self.key = KEY_PREFIX + digest.hexdigest()
+
+        self.offsets = _row_offsets(n, constraints_type, b) if kind == 'bigm' else None
+        self.n = n
+
+    @classmethod
+    def for_request(cls, data, kind):
+        """CachedProblem do payload, ou None se a requisição não deve usar o cache
+
+        Pedidos com rastreamento ou base de partida recebem dados próprios
+        da execução (log, iterações do warm start) e sempre resolvem. Payloads
+        malformados também passam direto, para o solver reportar o erro.
+        """
+        if data.get('trace') or data.get('log') or data.get('base') is not None:
+            return None
+        try:
+            return cls(data, kind)
+        except Exception:
+            return None
+
+    def pack(self, response):
+        """Entrada do cache: a resposta sem os campos da execução e a ordem de linhas de quem a gravou"""
+        stored = {key: value for key, value in response.items() if key not in RUN_FIELDS}
+        if 'pricing' in response:
+            stored['pricing'] = {key: value for key, value in response['pricing'].items()
+                                 if key not in PRICING_RUN_FIELDS}
+        return {'response': stored, 'permutation': self.permutation, 'offsets': self.offsets}
+
+    def unpack(self, entry):
+        """Resposta de uma entrada, na ordem de linhas desta requisição, marcada com "cached": true"""
+        response = dict(entry['response'], cached=True)
+        if self.kind != 'bigm' or entry['permutation'] == self.permutation:
+            return response
+        return self._remap(response, entry['permutation'], entry['offsets'])
+
+    def _remap(self, response, permutation, offsets):
+        """Traduz base, var_types e duais da ordem de linhas de quem gravou para a atual"""
+        column_map = list(range(self.n))
+        column_map += [None] * (len(response['var_types']) - self.n)
+        row_map = {}
+        for stored_row, row in zip(permutation, self.permutation):
+            row_map[stored_row] = row
+            end = offsets[stored_row + 1] if stored_row + 1 < len(offsets) else len(column_map)
+            for t in range(end - offsets[stored_row]):
+                column_map[offsets[stored_row] + t] = self.offsets[row] + t
+
+        var_types = list(response['var_types'])
+        for stored_column, column in enumerate(column_map):
+            var_types[column] = response['var_types'][stored_column]
+
+        base = response['base']
+        if len(base) == len(permutation):
+            remapped = [None] * len(base)
+            for stored_row, value in enumerate(base):
+                remapped[row_map[stored_row]] = column_map[value]
+        else:
+            # Duas fases com linhas redundantes removidas: sem linha associada
+            remapped = sorted(column_map[value] for value in base)
+
+        remapped_response = dict(response, base=remapped, var_types=var_types)
+        if 'duals' in response:
+            duals = list(response['duals'])
+            for stored_row, value in enumerate(response['duals']):
+                duals[row_map[stored_row]] = value
+            remapped_response['duals'] = duals
+        return remapped_response
+
+
+# Solves em andamento neste processo: chave -> Future com a entrada do cache
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+async def solve_once(problem, compute):
+    """Resposta do cache ou de um único compute() por chave (single-flight)
+
+    Requisições idênticas simultâneas no mesmo processo aguardam o Future da
+    primeira; entre processos, quem consegue criar a trava (cache.add, que é
+    atômico) na tabela de travas do cache resolve e os demais aguardam o
+    resultado aparecer. Com o backend LocMem a trava é por processo; com um
+    backend compartilhado (arquivo, banco, Redis) vale para todos os workers.
+    Se quem resolvia falha, os que esperavam no mesmo processo recebem o mesmo
+    erro e os de outros processos resolvem por conta própria. Se quem resolvia
+    é cancelado (o cliente desconectou), os que esperavam tentam de novo e um
+    deles passa a resolver; o cancelamento de quem espera não afeta os demais.
+    Só quem de fato resolveu recebe iterações e tempos; as demais respostas
+    vêm da entrada do cache, com "cached": true.
+    """
+    while True:
+        entry = await get_cache().aget(problem.key)
+        if entry is not None:
+            return problem.unpack(entry)
+
+        with _inflight_lock:
+            future = _inflight.get(problem.key)
+            leader = future is None
+            if leader:
+                future = _inflight[problem.key] = concurrent.futures.Future()
+
+        if not leader:
+            # shield: cancelar esta espera não cancela o Future compartilhado
+            entry = await asyncio.shield(asyncio.wrap_future(future))
+            if entry is None:
+                continue  # quem resolvia foi cancelado
+            return problem.unpack(entry)
+
+        try:
+            entry, response = await _solve_locked(problem, compute)
+        except asyncio.CancelledError:
+            future.set_result(None)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(entry)
+        finally:
+            with _inflight_lock:
+                del _inflight[problem.key]
+        return response if response is not None else problem.unpack(entry)
+
+
+async def _solve_locked(problem, compute):
+    """Resolve sob a trava entre processos ou aguarda quem já a detém
+
+    Devolve (entrada, resposta), com resposta None se outro solve gravou a entrada.
+    """
+    cache = get_cache()
+    lock_key = problem.key + LOCK_SUFFIX
+    # A trava expira sozinha caso o processo que a criou morra no meio do solve
+    lock_timeout = (getattr(settings, 'SOLVER_TIMEOUT', None) or 30) + 30
+
+    while True:
+        if await cache.aadd(lock_key, time.time(), lock_timeout):
+            try:
+                entry = await cache.aget(problem.key)
+                if entry is not None:
+                    return entry, None
+                response = await compute()
+                entry = problem.pack(response)
+                # Paradas por limite de iterações/tempo não são o resultado do modelo
+                if response.get('status') != 'limit_reached':
+                    await cache.aset(problem.key, entry)
+                return entry, response
+            finally:
+                await cache.adelete(lock_key)
+
+        delay = 0.01
+        while True:
+            await asyncio.sleep(delay)
+            delay = min(2 * delay, 0.25)
+            entry = await cache.aget(problem.key)
+            if entry is not None:
+                return entry, None
+            if await cache.aget(lock_key) is None:
+                break  # trava liberada sem resultado: tentar resolver
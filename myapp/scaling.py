@@ -0,0 +1,126 @@
+import numpy as np
+import scipy.sparse as sp
+
+
+class Scaling:
+    """Escala de linhas e colunas de A aplicada antes do simplex
+
+    O modelo escalado é max (C c)·x' sujeito a (R A C) x' <= R b, com R e C
+    diagonais positivas: a solução volta como x = C x', os duais como
+    y = R y' e o valor ótimo não muda. Assim as tolerâncias absolutas dos
+    engines (1e-8 nos pivôs e custos reduzidos, 1e-6 na factibilidade das
+    artificiais) passam a valer para linhas e colunas de magnitude ~1.
+
+    Os fatores são potências de 2, de modo que escalar e desescalar não
+    introduz erro de arredondamento.
+    """
+
+    # Razão max|a_ij| / min|a_ij| (não-zeros) a partir da qual A é escalada
+    THRESHOLD = 100.0
+    # Passadas de média geométrica (param antes se a razão deixar de cair)
+    PASSES = 8
+
+    def __init__(self, rows, cols, ratio=1.0, scaled_ratio=1.0):
+        self.rows = np.asarray(rows, dtype=float)
+        self.cols = np.asarray(cols, dtype=float)
+        self.ratio = float(ratio)
+        self.scaled_ratio = float(scaled_ratio)
+        self.active = bool(np.any(self.rows != 1.0) or np.any(self.cols != 1.0))
+
+    @classmethod
+    def identity(cls, m, n):
+        return cls(np.ones(m), np.ones(n))
+
+    @classmethod
+    def for_matrix(cls, A, threshold=THRESHOLD, passes=PASSES):
+        """Fatores para A (densa ou scipy.sparse); identidade se A já é equilibrada
+
+        Passadas alternadas de média geométrica (linha e depois coluna
+        divididas por sqrt(max·min) dos seus módulos) seguidas de uma
+        equilibração final (maior módulo de cada linha e coluna ~1).
+        """
+        m, n = A.shape
+        row_index, col_index, magnitudes = _entries(A)
+        if magnitudes.size == 0:
+            return cls.identity(m, n)
+        ratio = _ratio(magnitudes)
+        if ratio <= threshold:
+            return cls(np.ones(m), np.ones(n), ratio, ratio)
+
+        def scaled():
+            return magnitudes * rows[row_index] * cols[col_index]
+
+        rows, cols = np.ones(m), np.ones(n)
+        current = ratio
+        for _ in range(passes):
+            high, low = _extremes(row_index, scaled(), m)
+            rows /= np.sqrt(high * low)
+            high, low = _extremes(col_index, scaled(), n)
+            cols /= np.sqrt(high * low)
+            improved = _ratio(scaled())
+            if improved > 0.9 * current:
+                break
+            current = improved
+
+        rows /= _extremes(row_index, scaled(), m)[0]
+        cols /= _extremes(col_index, scaled(), n)[0]
+
+        rows, cols = _power_of_two(rows), _power_of_two(cols)
+        return cls(rows, cols, ratio, _ratio(scaled()))
+
+    def matrix(self, A):
+        """R A C, no mesmo formato de A"""
+        if not self.active:
+            return A
+        if sp.issparse(A):
+            return (sp.diags(self.rows) @ A @ sp.diags(self.cols)).asformat(A.format)
+        return A * self.rows[:, None] * self.cols[None, :]
+
+    def model(self, c, A, b):
+        """(C c, R A C, R b)"""
+        return c * self.cols, self.matrix(A), b * self.rows
+
+    def upper(self, u):
+        """Limites superiores das variáveis escaladas, u' = C^-1 u"""
+        return u / self.cols
+
+    def solution(self, x):
+        """x = C x' (variáveis originais)"""
+        return x * self.cols
+
+    def duals(self, y):
+        """y = R y' (duais das restrições originais)"""
+        return y * self.rows
+
+    def stats(self):
+        return {'active': self.active, 'ratio': self.ratio, 'scaled_ratio': self.scaled_ratio}
+
+
+def _entries(A):
+    """(linha, coluna, |a_ij|) dos não-zeros de A"""
+    if sp.issparse(A):
+        A = sp.coo_matrix(A)
+        keep = A.data != 0
+        return A.row[keep], A.col[keep], np.abs(A.data[keep]).astype(float)
+    A = np.asarray(A, dtype=float)
+    row_index, col_index = np.nonzero(A)
+    return row_index, col_index, np.abs(A[row_index, col_index])
+
+
+def _ratio(magnitudes):
+    return float(magnitudes.max() / magnitudes.min())
+
+
+def _extremes(index, magnitudes, size):
+    """Maior e menor módulo não-zero por linha (ou coluna); 1 nas vazias"""
+    high = np.zeros(size)
+    low = np.full(size, np.inf)
+    np.maximum.at(high, index, magnitudes)
+    np.minimum.at(low, index, magnitudes)
+    empty = np.isinf(low)
+    high[empty] = low[empty] = 1.0
+    return high, low
+
+
+def _power_of_two(factors):
+    return np.exp2(np.round(np.log2(factors)))
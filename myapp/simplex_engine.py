@@ -0,0 +1,598 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse.linalg import splu
+
+from .trace import tableau_snapshot
+
+# Resultado de leaving_row quando a entrante chega ao próprio limite superior
+# antes de qualquer básica sair: troca de limite, sem pivô
+BOUND_FLIP = -1
+
+
+class TableauEngine:
+    """Núcleo vetorizado do simplex em tableau (compartilhado pelos solvers)
+
+    Mantém o tableau, o vetor b, os custos estendidos e a base. A base é
+    guardada tanto como lista de índices (linha -> variável básica) quanto
+    como máscara booleana, de modo que custos reduzidos, teste da razão e
+    pivotamento são operações sobre arrays inteiros.
+
+    Com `upper` as colunas têm limites superiores nativos 0 <= x_j <= u_j
+    (simplex com variáveis canalizadas): as não-básicas ficam no limite
+    inferior ou no superior (`at_upper`), b guarda os valores x_B e o teste
+    da razão considera as básicas que sobem até u_j e a troca de limite da
+    própria entrante (BOUND_FLIP).
+    """
+
+    def __init__(self, tableau, c, b, base, tolerance=1e-8, upper=None, at_upper=None):
+        # O tableau se adensa com os pivôs: matrizes esparsas são convertidas
+        if sp.issparse(tableau):
+            tableau = tableau.toarray()
+        self.tableau = np.array(tableau, dtype=float)
+        self.c = np.array(c, dtype=float)
+        self.b = np.array(b, dtype=float)
+        self.base = np.array(base, dtype=int)
+        self.tolerance = tolerance
+
+        self.m, self.n_cols = self.tableau.shape
+        self.in_base = np.zeros(self.n_cols, dtype=bool)
+        self.in_base[self.base] = True
+        _init_bounds(self, upper, at_upper)
+
+    def reduced_costs(self, columns=None):
+        """Custos reduzidos c_j - c_B · coluna_j (zero para as básicas)
+
+        Com `columns` só essas colunas são precificadas (precificação parcial).
+        """
+        if columns is not None:
+            rc = self.c[columns] - self.c[self.base] @ self.tableau[:, columns]
+            rc[self.in_base[columns]] = 0.0
+            return rc
+        rc = self.c - self.c[self.base] @ self.tableau
+        rc[self.in_base] = 0.0
+        return rc
+
+    def improving_costs(self, columns=None):
+        """Custos reduzidos no sentido de melhora (-rc_j nas não-básicas em u_j)"""
+        return _improving(self, self.reduced_costs(columns), columns)
+
+    def entering_variable(self, rc=None):
+        """Maior custo reduzido atrativo (regra de Dantzig) ou None se ótimo"""
+        if rc is None:
+            rc = self.improving_costs()
+        candidates = np.where(self.in_base, -np.inf, rc)
+        entering = int(np.argmax(candidates))
+        if candidates[entering] <= self.tolerance:
+            return None
+        return entering
+
+    def entering_column(self, entering):
+        """Coluna d = B^-1 a_q da variável entrante"""
+        return self.tableau[:, entering]
+
+    def row_product(self, vector):
+        """vector^T B^-1 A para todas as colunas (com e_r, a linha r do tableau)"""
+        return vector @ self.tableau
+
+    def edge_weights(self):
+        """Pesos exatos de steepest edge, 1 + ||B^-1 a_j||²"""
+        return 1.0 + (self.tableau ** 2).sum(axis=0)
+
+    def leaving_row(self, entering, smallest_index=False):
+        """Teste da razão mínima; None indica problema ilimitado
+
+        Com smallest_index=True os empates saem pela básica de menor índice
+        (a metade do teste da razão da regra de Bland). Com limites
+        superiores pode retornar BOUND_FLIP (ver flip()).
+        """
+        if self.bounded:
+            return _bounded_ratio_test(self, entering, self.tableau[:, entering], smallest_index)
+        return _ratio_test(self.b, self.tableau[:, entering], self.base, self.tolerance, smallest_index)
+
+    def flip(self, entering):
+        """Leva a não-básica `entering` ao outro limite, sem trocar a base"""
+        _flip(self, entering, self.tableau[:, entering])
+
+    def pivot(self, row, entering):
+        """Pivotamento de Gauss-Jordan em (row, entering) e atualização da base"""
+        _move(self, row, entering, self.tableau[:, entering])
+        pivot = self.tableau[row, entering]
+        self.tableau[row] /= pivot
+
+        # Eliminação completa da coluna entrante (sem descartar fatores
+        # pequenos, o que deixaria o tableau inconsistente e pode ciclar)
+        factors = self.tableau[:, entering].copy()
+        factors[row] = 0.0
+        self.tableau -= np.outer(factors, self.tableau[row])
+        self.tableau[:, entering] = 0.0
+        self.tableau[row, entering] = 1.0
+
+        leaving = int(self.base[row])
+        self.in_base[leaving] = False
+        self.in_base[entering] = True
+        self.base[row] = entering
+        return leaving
+
+    def dual_leaving_row(self):
+        """Linha com o b mais negativo (simplex dual) ou None se primal factível"""
+        row = int(np.argmin(self.b))
+        if self.b[row] >= -self.tolerance:
+            return None
+        return row
+
+    def dual_entering_variable(self, row, rc=None):
+        """Teste da razão dual na linha dada; None indica problema infactível
+
+        Entre as não-básicas com coeficiente negativo na linha, escolhe a de
+        menor |c_j - z_j| / |a_rj|, preservando a factibilidade dual.
+        """
+        if rc is None:
+            rc = self.reduced_costs()
+        coefficients = self.tableau[row]
+        eligible = (coefficients < -self.tolerance) & ~self.in_base
+        if not eligible.any():
+            return None
+
+        ratios = np.full(self.n_cols, np.inf)
+        ratios[eligible] = np.abs(rc[eligible] / coefficients[eligible])
+        return int(np.argmin(ratios))
+
+    def add_row(self, coefficients, rhs, cost=0.0):
+        """Acrescenta a restrição coefficients·x + s = rhs com nova coluna básica s
+
+        A linha é expressa na base atual (eliminando as colunas básicas), de
+        modo que a base continua dual factível; se o novo b for negativo o
+        simplex dual repara a factibilidade primal.
+        """
+        coefficients = np.append(np.asarray(coefficients, dtype=float), 1.0)
+        weights = coefficients[self.base]
+        self.tableau = np.hstack([self.tableau, np.zeros((self.m, 1))])
+        row = coefficients - weights @ self.tableau
+        self.tableau = np.vstack([self.tableau, row])
+        rhs = rhs - weights @ self.b
+        if self.bounded:
+            rhs -= coefficients[:-1][self.at_upper] @ self.upper[self.at_upper]
+        self.b = np.append(self.b, rhs)
+        self.c = np.append(self.c, cost)
+        self.upper = np.append(self.upper, np.inf)
+        self.at_upper = np.append(self.at_upper, False)
+
+        new_col = self.n_cols
+        self.base = np.append(self.base, new_col)
+        self.in_base = np.append(self.in_base, True)
+        self.m, self.n_cols = self.tableau.shape
+        return new_col
+
+    def remove(self, row, columns):
+        """Remove uma linha e colunas (que devem ser nulas nas demais linhas)"""
+        keep_rows = np.ones(self.m, dtype=bool)
+        keep_rows[row] = False
+        keep_cols = np.ones(self.n_cols, dtype=bool)
+        keep_cols[columns] = False
+        new_index = np.cumsum(keep_cols) - 1
+
+        self.tableau = self.tableau[np.ix_(keep_rows, keep_cols)]
+        self.b = self.b[keep_rows]
+        self.c = self.c[keep_cols]
+        self.upper = self.upper[keep_cols]
+        self.at_upper = self.at_upper[keep_cols]
+        self.base = new_index[self.base[keep_rows]]
+        self.in_base = self.in_base[keep_cols]
+        self.m, self.n_cols = self.tableau.shape
+        return new_index
+
+    def set_basis(self, base, at_upper=None):
+        """Reescreve o tableau na base dada (B^-1 aplicado de uma só vez)
+
+        `at_upper` (colunas não-básicas em u_j) substitui o estado atual dos
+        limites. Retorna False, sem alterar o estado, se a base for singular.
+        """
+        base = np.array(base, dtype=int)
+        lu = lu_factor(self.tableau[:, base])
+        if _is_singular(lu[0]):
+            return False
+
+        b = self.b
+        if at_upper is not None:
+            moved = np.zeros(self.n_cols, dtype=bool)
+            moved[at_upper] = True
+            delta = np.where(moved, self.upper, 0.0) - np.where(self.at_upper, self.upper, 0.0)
+            changed = np.flatnonzero(moved != self.at_upper)
+            b = b - self.tableau[:, changed] @ delta[changed]
+            self.at_upper = moved
+        self.tableau = lu_solve(lu, self.tableau)
+        self.b = lu_solve(lu, b)
+        # Não-básicas em u_j que entram na base levam o seu valor para x_B
+        entered = self.at_upper[base]
+        if entered.any():
+            self.b[entered] += self.upper[base[entered]]
+            self.at_upper[base] = False
+        self.base = base
+        self.in_base[:] = False
+        self.in_base[base] = True
+        return True
+
+    def solution(self):
+        """Valores de todas as variáveis na solução básica atual"""
+        solution = np.zeros(self.n_cols)
+        if self.bounded:
+            solution[self.at_upper] = self.upper[self.at_upper]
+        solution[self.base] = self.b
+        return solution
+
+    def objective_value(self):
+        value = self.c[self.base] @ self.b
+        if self.bounded:
+            value += self.c[self.at_upper] @ self.upper[self.at_upper]
+        return float(value)
+
+
+def _ratio_test(b, column, base, tolerance, smallest_index=False):
+    """Linha de menor b_i / d_i entre os d_i positivos; None se não houver
+
+    Com smallest_index os empates (razões iguais dentro da tolerância) são
+    desfeitos pela variável básica de menor índice.
+    """
+    positive = column > tolerance
+    if not positive.any():
+        return None
+
+    ratios = np.full(column.shape[0], np.inf)
+    ratios[positive] = b[positive] / column[positive]
+    row = int(np.argmin(ratios))
+    if smallest_index:
+        ties = np.flatnonzero(ratios <= ratios[row] + tolerance)
+        row = int(ties[np.argmin(base[ties])])
+    return row
+
+
+def _init_bounds(engine, upper, at_upper):
+    """Limites superiores das colunas (∞ = sem limite) e não-básicas em u_j"""
+    engine.upper = np.full(engine.n_cols, np.inf) if upper is None else np.array(upper, dtype=float)
+    engine.at_upper = np.zeros(engine.n_cols, dtype=bool) if at_upper is None else np.array(at_upper, dtype=bool)
+    engine.bounded = bool(np.isfinite(engine.upper).any())
+    engine._leaving = None  # (entrante, linha, sai em u_j?) do último teste da razão
+
+
+def _improving(engine, rc, columns=None):
+    """rc com o sinal trocado nas não-básicas em u_j, que melhoram ao diminuir
+
+    Positivo significa atrativo em qualquer caso, de modo que as regras de
+    precificação não precisam saber de limites.
+    """
+    if not engine.bounded:
+        return rc
+    at_upper = engine.at_upper if columns is None else engine.at_upper[columns]
+    return np.where(at_upper, -rc, rc)
+
+
+def _bounded_ratio_test(engine, entering, column, smallest_index=False):
+    """Teste da razão com limites superiores sobre a coluna d = B^-1 a_q
+
+    A entrante se afasta do seu limite (sobe de 0 ou desce de u_q) e x_B
+    varia de -passo·d ou +passo·d: as básicas que caem param em 0 e as que
+    sobem em u_j. Se u_q vem antes de todas as razões retorna BOUND_FLIP;
+    None indica ilimitação. A linha escolhida e o limite em que a básica
+    sai ficam em engine._leaving para o pivô seguinte.
+    """
+    tolerance = engine.tolerance
+    step = -column if engine.at_upper[entering] else column
+    upper = engine.upper[engine.base]
+    falling = step > tolerance
+    rising = (step < -tolerance) & np.isfinite(upper)
+
+    ratios = np.full(column.shape[0], np.inf)
+    ratios[falling] = engine.b[falling] / step[falling]
+    ratios[rising] = (upper[rising] - engine.b[rising]) / -step[rising]
+    row = int(np.argmin(ratios))
+    if engine.upper[entering] <= ratios[row]:
+        return BOUND_FLIP if np.isfinite(engine.upper[entering]) else None
+    if smallest_index:
+        ties = np.flatnonzero(ratios <= ratios[row] + tolerance)
+        row = int(ties[np.argmin(engine.base[ties])])
+    engine._leaving = (entering, row, bool(rising[row]))
+    return row
+
+
+def _flip(engine, entering, column):
+    """x_q passa de um limite ao outro e x_B acompanha (x_B -= Δ·d)"""
+    delta = -engine.upper[entering] if engine.at_upper[entering] else engine.upper[entering]
+    engine.b -= delta * column
+    engine.at_upper[entering] = not engine.at_upper[entering]
+
+
+def _move(engine, row, entering, column):
+    """Atualiza x_B para a troca de base em (row, entering)
+
+    x_q varia a partir do limite em que estava até a básica da linha `row`
+    chegar ao limite apontado pelo último teste da razão (0 se o pivô não
+    veio dele, como na expulsão de artificiais ou no simplex dual). Sem
+    limites é a atualização usual θ = b_r / d_r.
+    """
+    leaving = engine.base[row]
+    to_upper = engine._leaving == (entering, row, True)
+    engine._leaving = None
+    target = engine.upper[leaving] if to_upper else 0.0
+    start = engine.upper[entering] if engine.at_upper[entering] else 0.0
+
+    theta = (engine.b[row] - target) / column[row]
+    engine.b -= theta * column
+    engine.b[row] = start + theta
+    engine.at_upper[entering] = False
+    engine.at_upper[leaving] = to_upper
+
+
+def _is_singular(U, tolerance=1e-11):
+    """Verifica a diagonal do fator U de uma fatoração LU"""
+    diagonal = np.abs(np.diag(U))
+    return diagonal.size > 0 and diagonal.min() <= tolerance * max(diagonal.max(), 1.0)
+
+
+class RevisedSimplexEngine:
+    """Simplex revisado com base fatorada (LU + forma produto da inversa)
+
+    Expõe a mesma interface de TableauEngine, mas não atualiza o tableau:
+    guarda apenas a matriz de restrições original, a fatoração LU da base
+    inicial e um arquivo de etas (uma por pivô). A cada iteração os custos
+    reduzidos são obtidos com BTRAN (y = c_B B^-1) e somente a coluna
+    entrante é calculada com FTRAN (d = B^-1 a_q). Após `refactor_every`
+    pivôs a base é refatorada e as etas são descartadas.
+
+    Se A for uma matriz scipy.sparse ela permanece esparsa (CSC): a base é
+    fatorada com SuperLU e a precificação é um produto esparso A^T y, de modo
+    que memória e custo por iteração acompanham o número de não-zeros.
+
+    Limites superiores (`upper`) funcionam como em TableauEngine.
+    """
+
+    def __init__(self, A, c, b, base, tolerance=1e-8, refactor_every=50, upper=None):
+        self.sparse = sp.issparse(A)
+        if self.sparse:
+            self.A = sp.csc_matrix(A, dtype=float)
+        else:
+            self.A = np.array(A, dtype=float)
+        self.c = np.array(c, dtype=float)
+        self.b_original = np.array(b, dtype=float)
+        self.base = np.array(base, dtype=int)
+        self.tolerance = tolerance
+        self.refactor_every = refactor_every
+
+        self.m, self.n_cols = self.A.shape
+        self.in_base = np.zeros(self.n_cols, dtype=bool)
+        self.in_base[self.base] = True
+        _init_bounds(self, upper, None)
+
+        self._column = None  # coluna entrante (FTRAN) do último teste da razão
+        self.refactor()
+
+    def refactor(self):
+        """Refatora B = A[:, base] e recalcula x_B = B^-1 (b - A_U u_U)"""
+        if self.sparse:
+            self.lu = splu(self.A[:, self.base].tocsc())
+        else:
+            self.lu = lu_factor(self.A[:, self.base])
+        self.etas = []
+        rhs = self.b_original
+        if self.at_upper.any():
+            columns = np.flatnonzero(self.at_upper)
+            rhs = rhs - self.A[:, columns] @ self.upper[columns]
+        self.b = self.ftran(rhs)
+
+    def set_basis(self, base, at_upper=None):
+        """Troca a base (e as não-básicas em u_j) e refatora; False (estado mantido) se for singular"""
+        previous, previous_upper = self.base, self.at_upper.copy()
+        self.base = np.array(base, dtype=int)
+        if at_upper is not None:
+            self.at_upper = np.zeros(self.n_cols, dtype=bool)
+            self.at_upper[at_upper] = True
+        self.at_upper[self.base] = False
+        try:
+            self.refactor()
+            singular = not self.sparse and _is_singular(self.lu[0])
+        except RuntimeError:  # SuperLU: matriz exatamente singular
+            singular = True
+        if singular:
+            self.base, self.at_upper = previous, previous_upper
+            self.refactor()
+            return False
+
+        self.in_base[:] = False
+        self.in_base[self.base] = True
+        return True
+
+    def _lu_solve(self, rhs, trans=False):
+        if self.sparse:
+            return self.lu.solve(rhs, trans='T' if trans else 'N')
+        return lu_solve(self.lu, rhs, trans=1 if trans else 0)
+
+    def column(self, j):
+        """Coluna j da matriz de restrições como vetor denso"""
+        if self.sparse:
+            return self.A[:, j].toarray().ravel()
+        return self.A[:, j]
+
+    def ftran(self, column):
+        """Resolve B x = column usando LU e as etas acumuladas"""
+        x = self._lu_solve(np.array(column, dtype=float))
+        for row, eta in self.etas:
+            pivot = x[row] / eta[row]
+            x -= pivot * eta
+            x[row] = pivot
+        return x
+
+    def btran(self, row_vector):
+        """Resolve y B = row_vector aplicando as etas em ordem reversa"""
+        y = np.array(row_vector, dtype=float)
+        for row, eta in reversed(self.etas):
+            y[row] = (y[row] - y @ eta + y[row] * eta[row]) / eta[row]
+        return self._lu_solve(y, trans=True)
+
+    def reduced_costs(self, columns=None):
+        """Custos reduzidos c - y A precificados a partir dos multiplicadores
+
+        Com `columns` só essas colunas são precificadas (precificação parcial).
+        """
+        y = self.btran(self.c[self.base])
+        if columns is not None:
+            rc = self.c[columns] - self.A[:, columns].T @ y
+            rc[self.in_base[columns]] = 0.0
+            return rc
+        rc = self.c - self.A.T @ y
+        rc[self.in_base] = 0.0
+        return rc
+
+    def improving_costs(self, columns=None):
+        """Custos reduzidos no sentido de melhora (-rc_j nas não-básicas em u_j)"""
+        return _improving(self, self.reduced_costs(columns), columns)
+
+    def entering_column(self, entering):
+        """Coluna d = B^-1 a_q (reaproveita a FTRAN do último teste da razão)"""
+        if self._column is None or self._column[0] != entering:
+            self._column = (entering, self.ftran(self.column(entering)))
+        return self._column[1]
+
+    def row_product(self, vector):
+        """vector^T B^-1 A para todas as colunas: BTRAN e uma precificação"""
+        return self.A.T @ self.btran(vector)
+
+    def edge_weights(self):
+        """Pesos de steepest edge 1 + ||a_j||²
+
+        Exatos na base inicial (identidade de folgas/artificiais); após um
+        warm start servem de quadro de referência, como no Devex.
+        """
+        if self.sparse:
+            return 1.0 + np.asarray(self.A.multiply(self.A).sum(axis=0)).ravel()
+        return 1.0 + (self.A ** 2).sum(axis=0)
+
+    def entering_variable(self, rc=None):
+        """Maior custo reduzido atrativo (regra de Dantzig) ou None se ótimo"""
+        if rc is None:
+            rc = self.improving_costs()
+        candidates = np.where(self.in_base, -np.inf, rc)
+        entering = int(np.argmax(candidates))
+        if candidates[entering] <= self.tolerance:
+            return None
+        return entering
+
+    def leaving_row(self, entering, smallest_index=False):
+        """Teste da razão sobre a coluna d = B^-1 a_q; None indica ilimitação"""
+        column = self.ftran(self.column(entering))
+        self._column = (entering, column)
+        if self.bounded:
+            return _bounded_ratio_test(self, entering, column, smallest_index)
+        return _ratio_test(self.b, column, self.base, self.tolerance, smallest_index)
+
+    def flip(self, entering):
+        """Leva a não-básica `entering` ao outro limite, sem trocar a base"""
+        _flip(self, entering, self.entering_column(entering))
+
+    def pivot(self, row, entering):
+        """Troca de base: atualiza x_B, registra a eta e refatora se preciso"""
+        column = self.entering_column(entering)
+        self._column = None
+        _move(self, row, entering, column)
+
+        leaving = int(self.base[row])
+        self.in_base[leaving] = False
+        self.in_base[entering] = True
+        self.base[row] = entering
+
+        self.etas.append((row, column))
+        if len(self.etas) >= self.refactor_every:
+            self.refactor()
+        return leaving
+
+    def solution(self):
+        """Valores de todas as variáveis na solução básica atual"""
+        solution = np.zeros(self.n_cols)
+        if self.bounded:
+            solution[self.at_upper] = self.upper[self.at_upper]
+        solution[self.base] = self.b
+        return solution
+
+    def objective_value(self):
+        value = self.c[self.base] @ self.b
+        if self.bounded:
+            value += self.c[self.at_upper] @ self.upper[self.at_upper]
+        return float(value)
+
+
+class PrimalSimplex:
+    """Laço do simplex primal compartilhado pelos solvers (SimplexBigM, SimplexStandard)
+
+    A classe que o usa fornece `trace`, `pricing`, `fallback` (Bland),
+    `limits` e o contador `iterations`; o laço trabalha sobre qualquer engine
+    deste módulo. Objetivo estacionado por STALL_PIVOTS pivôs passa à regra
+    de Bland até voltar a melhorar; limits.check levanta LimitReached e quem
+    chamou preenche `partial` com a base em que o laço parou.
+    """
+
+    # Pivôs seguidos sem melhora do objetivo antes de recorrer à regra de Bland
+    STALL_PIVOTS = 50
+
+    def _snapshot(self, engine, initial=False):
+        """Emite o estado do engine apenas se o sink pedir instantâneos"""
+        if self.trace is not None and self.trace.snapshots:
+            self.trace.emit(tableau_snapshot(engine, initial))
+
+    def _run_simplex(self, engine):
+        """Itera o simplex primal até a otimalidade"""
+        iteration = 0
+        self._snapshot(engine, initial=True)
+        self.pricing.start(engine)
+        objective = engine.objective_value()
+        stalled = 0
+
+        while True:
+            iteration += 1
+            self.limits.check(self.iterations, engine)
+
+            # Teste de otimalidade (regra de precificação de self.pricing, ou
+            # a de Bland enquanto o objetivo estiver estacionado)
+            bland = stalled >= self.STALL_PIVOTS or self.pricing.name == 'bland'
+            entering = (self.fallback if bland else self.pricing).entering(engine)
+            if entering is None:
+                if self.trace is not None:
+                    self.trace.emit({'event': 'optimal', 'iteration': iteration,
+                                     'objective': engine.objective_value()})
+                break
+
+            # Variável sainte (teste da razão); None indica ilimitação
+            leaving_idx = engine.leaving_row(entering, smallest_index=bland)
+            if leaving_idx is None:
+                if self.trace is not None:
+                    self.trace.emit({'event': 'unbounded', 'iteration': iteration, 'entering': entering})
+                raise ValueError("Problema ilimitado")
+
+            if leaving_idx == BOUND_FLIP:
+                # A entrante atinge o próprio limite antes de qualquer básica sair
+                engine.flip(entering)
+                leaving = None
+            else:
+                # Pivotamento e atualização da base (e dos pesos da precificação)
+                self.pricing.update(engine, leaving_idx, entering)
+                leaving = engine.pivot(leaving_idx, entering)
+            self.iterations += 1
+
+            # Pivôs degenerados seguidos contam como estacionamento
+            previous, objective = objective, engine.objective_value()
+            if objective > previous + engine.tolerance * max(1.0, abs(previous)):
+                stalled = 0
+            else:
+                stalled += 1
+                if stalled == self.STALL_PIVOTS and self.trace is not None:
+                    self.trace.emit({'event': 'stall', 'iteration': iteration, 'pivots': stalled})
+
+            if self.trace is not None:
+                if leaving is None:
+                    self.trace.emit({'event': 'bound_flip', 'iteration': iteration, 'variable': entering,
+                                     'at_upper': bool(engine.at_upper[entering]),
+                                     'objective': engine.objective_value()})
+                else:
+                    self.trace.emit({'event': 'iteration', 'iteration': iteration, 'entering': entering,
+                                     'leaving': leaving, 'objective': engine.objective_value()})
+                self._snapshot(engine)
+
+        return engine
@@ -0,0 +1,360 @@
+import uuid
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from .big_m import SimplexBigM
+from .graphical_method import GraphicalMethod
+from .half_planes import clip_polygon, merge_pocket, recession_interval
+
+SESSION_PREFIX = 'solve-session:'
+
+
+class SolveSession:
+    """Modelo Big M resolvido e mantido no servidor para edições incrementais
+
+    Guarda o tableau ótimo final (TableauEngine) e, para cada restrição, suas
+    colunas extras, a coluna identidade inicial (cujo conteúdo atual é a coluna
+    correspondente de B^-1), o sinal e o fator de escala aplicados à linha. Após cada edição a base
+    antiga continua dual factível e é reparada pelo simplex dual, seguido de
+    uma limpeza pelo simplex primal quando a edição relaxa o modelo.
+    O sink de rastreamento vale só durante a chamada (a sessão é serializada).
+    """
+
+    def __init__(self, c, A, b, sense='max', constraints_type=None, trace=None, max_iterations=None,
+                 time_limit=None):
+        self.solver = SimplexBigM(c, A, b, sense=sense, constraints_type=constraints_type, method='bigm',
+                                  trace=trace, max_iterations=max_iterations, time_limit=time_limit)
+        try:
+            self.solution, self.optimal_value = self.solver.solve()
+        finally:
+            self.solver.trace = None
+
+        self.engine = self.solver.engine
+        self.sense = sense
+        self.c = self.solver.c_original
+        self.var_types = list(self.solver.var_types)
+        self.constraints = []
+        for i, constraint_type in enumerate(self.solver.constraints_type):
+            self.constraints.append({
+                'type': constraint_type,
+                'rhs': float(self.solver.b_original[i]),
+                'sign': self.solver.row_signs[i],
+                'scale': float(self.solver.scaling.rows[i]),
+                'columns': list(self.solver.row_columns[i]),
+                'identity': self.solver.identity_columns[i],
+            })
+
+    def apply(self, edit, trace=None):
+        """Aplica uma edição {'op': ...} e re-otimiza"""
+        op = edit.get('op')
+        self.solver.trace = trace
+        try:
+            if op == 'set_rhs':
+                self.set_rhs(int(edit['index']), float(edit['value']))
+            elif op == 'add_constraint':
+                self.add_constraint(edit['a'], edit.get('type', '<='), float(edit['b']))
+            elif op == 'remove_constraint':
+                self.remove_constraint(int(edit['index']))
+            else:
+                raise ValueError(f"Edição desconhecida: {op}")
+        finally:
+            self.solver.trace = None
+
+    def set_rhs(self, index, value):
+        """Altera b[index]: x_B += B^-1 e_i · Δb, sem reconstruir o tableau"""
+        constraint = self.constraints[index]
+        delta = constraint['sign'] * constraint['scale'] * (value - constraint['rhs'])
+        self.engine.b += delta * self.engine.tableau[:, constraint['identity']]
+        constraint['rhs'] = value
+        return self.reoptimize()
+
+    def add_constraint(self, a, constraint_type, rhs):
+        """Acrescenta uma restrição (corte) expressa na base atual"""
+        a = np.array(a, dtype=float)
+        if a.shape != (self.solver.n,):
+            raise ValueError("Dimensões incompatíveis entre a nova restrição e c")
+
+        # <= recebe folga; >= é multiplicada por -1 e recebe folga; = recebe
+        # artificial (custo -M), com o sinal escolhido para b >= 0
+        if constraint_type == '<=':
+            sign, cost, var_type = 1.0, 0.0, 'slack'
+        elif constraint_type == '>=':
+            sign, cost, var_type = -1.0, 0.0, 'slack'
+        else:
+            sign, cost, var_type = (1.0 if rhs >= 0 else -1.0), -self.solver.M, 'artificial'
+
+        # Linha nas colunas escaladas, equilibrada por uma potência de 2
+        a = a * self.solver.scaling.cols
+        high = np.abs(a).max()
+        scale = float(np.exp2(-np.round(np.log2(high)))) if high > 0 else 1.0
+
+        coefficients = np.zeros(self.engine.n_cols)
+        coefficients[:self.solver.n] = sign * scale * a
+        column = self.engine.add_row(coefficients, sign * scale * rhs, cost)
+        self.var_types.append(var_type)
+        self.constraints.append({
+            'type': constraint_type,
+            'rhs': rhs,
+            'sign': sign,
+            'scale': scale,
+            'columns': [column],
+            'identity': column,
+        })
+        return self.reoptimize()
+
+    def remove_constraint(self, index):
+        """Remove uma restrição: sua coluna identidade entra na base e a linha sai"""
+        constraint = self.constraints[index]
+        identity = constraint['identity']
+        engine = self.engine
+
+        if not engine.in_base[identity]:
+            # Teste da razão nos dois sentidos: a variável da restrição removida
+            # fica livre, então pode entrar com valor negativo se necessário
+            column = engine.tableau[:, identity]
+            ratios = np.full(engine.m, np.inf)
+            positive = column > engine.tolerance
+            if positive.any():
+                ratios[positive] = engine.b[positive] / column[positive]
+            else:
+                negative = column < -engine.tolerance
+                ratios[negative] = engine.b[negative] / -column[negative]
+            engine.pivot(int(np.argmin(ratios)), identity)
+
+        row = int(np.flatnonzero(engine.base == identity)[0])
+        new_index = engine.remove(row, constraint['columns'])
+
+        removed = set(constraint['columns'])
+        self.var_types = [t for j, t in enumerate(self.var_types) if j not in removed]
+        del self.constraints[index]
+        for other in self.constraints:
+            other['columns'] = [int(new_index[j]) for j in other['columns']]
+            other['identity'] = int(new_index[other['identity']])
+        return self.reoptimize()
+
+    def reoptimize(self):
+        """Simplex dual (factibilidade primal) e depois primal (otimalidade)"""
+        solver = self.solver
+        solver.iterations = 0
+        solver.limits.start()
+        solver._run_dual_simplex(self.engine)
+        solver._run_simplex(self.engine)
+
+        artificial = np.array([t == 'artificial' for t in self.var_types])
+        if np.any(np.abs(self.engine.b[artificial[self.engine.base]]) > 1e-6):
+            raise ValueError("Problema infactível - variável artificial não-zero na solução ótima")
+
+        self.solution = solver.scaling.solution(self.engine.solution()[:solver.n])
+        self.optimal_value = float(self.c @ self.solution)
+        return self.solution, self.optimal_value
+
+    def result(self):
+        return {
+            'solution': self.solution.tolist(),
+            'optimal_value': self.optimal_value,
+            'base': [int(v) for v in self.engine.base],
+            'var_types': self.var_types,
+            'iterations': self.solver.iterations,
+        }
+
+
+class GraphicalSession:
+    """Modelo de 2 variáveis mantido no servidor como o polígono factível
+
+    O polígono é convexo, anti-horário e limitado à caixa [0, R]² (como em
+    half_planes.intersect_half_planes); cada vértice guarda o rótulo da reta
+    da aresta seguinte. Uma restrição nova só recorta o polígono, em O(V). A
+    remoção de uma restrição que não forma aresta não muda nada; a de uma que
+    forma recalcula só o "bolso" do outro lado dela, recortado pelas demais, e
+    o emenda ao polígono. O ótimo sai dos vértices, sem reenumerar pares.
+    """
+
+    # Rótulos das bordas da caixa: x1 >= 0, x2 >= 0 (reais) e x1, x2 <= R (o "infinito")
+    BOX_EDGES = ('x1>=0', 'x2>=0', 'x1<=R', 'x2<=R')
+    OPPOSITE = 'oposto'
+    # Um b maior que RESCALE vezes a escala da caixa obriga a refazê-la
+    RESCALE = 1e3
+
+    def __init__(self, c, A, b, sense='max', constraints_type=None):
+        self.c = [float(v) for v in c]
+        if len(self.c) != 2:
+            raise ValueError("Método gráfico só funciona para 2 variáveis")
+        self.sense = sense
+        constraints_type = constraints_type or ['<='] * len(b)
+        if len(A) != len(b) or len(constraints_type) != len(b):
+            raise ValueError("Dimensões incompatíveis")
+
+        self.rows = []
+        self.lines = {}
+        self.next_label = 0
+        for a, constraint_type, rhs in zip(A, constraints_type, b):
+            self.rows.append(self._new_row(a, constraint_type, float(rhs)))
+        self.rebuild()
+
+    def apply(self, edit):
+        """Aplica uma edição {'op': ...}; o ótimo é recalculado em result()"""
+        op = edit.get('op')
+        if op == 'add_constraint':
+            self.add_constraint(edit['a'], edit.get('type', '<='), float(edit['b']))
+        elif op == 'remove_constraint':
+            self.remove_constraint(int(edit['index']))
+        elif op == 'set_constraint':
+            self.set_constraint(int(edit['index']), edit['a'], edit.get('type', '<='), float(edit['b']))
+        else:
+            raise ValueError(f"Edição desconhecida: {op}")
+
+    def add_constraint(self, a, constraint_type, rhs, index=None):
+        """Acrescenta uma restrição recortando o polígono por seus semiplanos"""
+        row = self._new_row(a, constraint_type, rhs)
+        self.rows.insert(len(self.rows) if index is None else index, row)
+        if abs(rhs) > self.RESCALE * self.scale:
+            # A caixa e as tolerâncias dependem da escala de b
+            self.rebuild()
+            return
+        for label in row['lines']:
+            self.polygon = clip_polygon(self.polygon, self.lines, label, self.tolerance)
+        self.update = 'clip'
+
+    def remove_constraint(self, index):
+        """Remove uma restrição; só o lado de fora das arestas que ela formava é recalculado"""
+        row = self.rows.pop(index)
+        self.update = 'unchanged'
+        remaining = [label for other in self.rows for label in other['lines']]
+        for k, label in enumerate(row['lines']):
+            if self.update != 'rebuild':
+                # Numa igualdade, o outro semiplano da mesma linha ainda vale
+                self._remove_line(label, remaining + row['lines'][k + 1:])
+            del self.lines[label]
+        if self.update == 'rebuild':
+            self.rebuild()
+
+    def set_constraint(self, index, a, constraint_type, rhs):
+        """Troca uma restrição: remoção seguida da inserção na mesma posição"""
+        self.remove_constraint(index)
+        removal = self.update
+        self.add_constraint(a, constraint_type, rhs, index=index)
+        if removal == 'rebuild':
+            self.update = 'rebuild'
+
+    def rebuild(self):
+        """Polígono do zero: a caixa recortada por todos os semiplanos, em O(m·V)"""
+        self.scale = max([1.0] + [abs(row['b']) for row in self.rows])
+        self.tolerance = 1e-9 * self.scale
+        R = 1e6 * self.scale
+        x1, x2, x1_max, x2_max = self.BOX_EDGES
+        self.lines.update({x1: (-1.0, 0.0, 0.0), x2: (0.0, -1.0, 0.0),
+                           x1_max: (1.0, 0.0, R), x2_max: (0.0, 1.0, R)})
+        self.polygon = [((0.0, 0.0), x2), ((R, 0.0), x1_max), ((R, R), x2_max), ((0.0, R), x1)]
+        for row in self.rows:
+            for label in row['lines']:
+                self.polygon = clip_polygon(self.polygon, self.lines, label, self.tolerance)
+        self.update = 'rebuild'
+
+    def _new_row(self, a, constraint_type, rhs):
+        """Restrição original e os rótulos dos seus semiplanos na forma a·x <= b"""
+        a = [float(v) for v in a]
+        if len(a) != 2:
+            raise ValueError("Dimensões incompatíveis entre a nova restrição e c")
+        if constraint_type not in ('<=', '>=', '='):
+            raise ValueError(f"Tipo de restrição inválido: {constraint_type}")
+        half_planes = []
+        if constraint_type in ('<=', '='):
+            half_planes.append((a[0], a[1], rhs))
+        if constraint_type in ('>=', '='):
+            half_planes.append((-a[0], -a[1], -rhs))
+        labels = []
+        for line in half_planes:
+            self.lines[self.next_label] = line
+            labels.append(self.next_label)
+            self.next_label += 1
+        return {'a': a, 'type': constraint_type, 'b': rhs, 'lines': labels}
+
+    def _remove_line(self, label, others):
+        """Tira um semiplano do polígono, dados os rótulos dos que continuam valendo"""
+        polygon = self.polygon
+        a1, a2, b = self.lines[label]
+        if len(polygon) >= 3:
+            active = any(edge == label for _, edge in polygon)
+        else:
+            # Segmento, ponto ou vazio: sem arestas confiáveis, basta tocar a reta
+            norm = np.hypot(a1, a2)
+            active = not polygon or norm <= 1e-15 or any(
+                abs(a1 * x + a2 * y - b) <= self.tolerance * norm for (x, y), _ in polygon)
+        if not active:
+            return
+
+        # Bolso: a caixa do outro lado da reta, recortada pelos demais semiplanos
+        R = 1e6 * self.scale
+        x1, x2, x1_max, x2_max = self.BOX_EDGES
+        self.lines[self.OPPOSITE] = (-a1, -a2, -b)
+        pocket = [((0.0, 0.0), x2), ((R, 0.0), x1_max), ((R, R), x2_max), ((0.0, R), x1)]
+        pocket = clip_polygon(pocket, self.lines, self.OPPOSITE, self.tolerance)
+        for other in others:
+            pocket = clip_polygon(pocket, self.lines, other, self.tolerance)
+            if not pocket:
+                break
+        if not polygon and all(edge != self.OPPOSITE for _, edge in pocket):
+            merged = pocket  # a região inteira ficava do outro lado da reta
+        else:
+            merged = merge_pocket(polygon, pocket, label, self.OPPOSITE, self.tolerance)
+        del self.lines[self.OPPOSITE]
+        if merged is None:
+            self.update = 'rebuild'
+        else:
+            self.polygon = merged
+            self.update = 'local'
+
+    def vertices(self):
+        """Vértices reais do polígono (os que não tocam a borda x1 = R ou x2 = R)"""
+        far = set(self.BOX_EDGES[2:])
+        limit = 1e6 * self.scale * (1 - 1e-9)
+        vertices = []
+        for k, ((x, y), edge) in enumerate(self.polygon):
+            # Em segmentos (igualdades) os rótulos não indicam a borda: olhar a coordenada
+            if edge in far or self.polygon[k - 1][1] in far or max(x, y) >= limit:
+                continue
+            vertices.append((max(x, 0.0) + 0.0, max(y, 0.0) + 0.0))
+        return vertices
+
+    def solve(self, trace=None):
+        """Ótimo sobre os vértices atuais; retorna GraphicalResult"""
+        gm = GraphicalMethod(self.c, [row['a'] for row in self.rows], [row['b'] for row in self.rows],
+                             sense=self.sense, constraints_type=[row['type'] for row in self.rows], trace=trace)
+        vertices = self.vertices()
+        gm.recession = recession_interval(gm.A) if vertices else None
+        return gm._evaluate(vertices)
+
+    def result(self, trace=None):
+        result = self.solve(trace)
+        return {
+            'solution_point': result.point.tolist(),
+            'optimal_value': result.value,
+            'geometry': result.geometry(),
+            'update': self.update,
+        }
+
+
+def save_session(session, session_id=None):
+    """Grava a sessão no cache do Django e retorna seu identificador"""
+    session_id = session_id or uuid.uuid4().hex
+    timeout = getattr(settings, 'SOLVE_SESSION_TIMEOUT', 3600)
+    cache.set(SESSION_PREFIX + session_id, session, timeout)
+    return session_id
+
+
+async def asave_session(session, session_id=None):
+    """save_session para as views assíncronas"""
+    session_id = session_id or uuid.uuid4().hex
+    timeout = getattr(settings, 'SOLVE_SESSION_TIMEOUT', 3600)
+    await cache.aset(SESSION_PREFIX + session_id, session, timeout)
+    return session_id
+
+
+def load_session(session_id):
+    return cache.get(SESSION_PREFIX + session_id)
+
+
+def delete_session(session_id):
+    cache.delete(SESSION_PREFIX + session_id)
@@ -0,0 +1,130 @@
+import asyncio
+import functools
+import json
+import threading
+import time
+
+from .executor import SolverTimeout, run_solver_async
+from .trace import TraceSink, format_event
+
+
+class SolveCancelled(Exception):
+    """O cliente do streaming desconectou antes do fim do solve"""
+
+
+class QueueSink(TraceSink):
+    """Entrega os eventos do solver (numa thread do executor) à resposta assíncrona
+
+    stream_solve o liga ao event loop que consome os eventos. A fila é
+    limitada: se o cliente lê devagar o solver espera por uma vaga, de modo
+    que o servidor nunca acumula o log inteiro. Cada emit também é o ponto em
+    que o solve é interrompido quando o cliente desiste ou o prazo se esgota.
+    """
+
+    def __init__(self, snapshots=False, deadline=None, maxsize=256):
+        self.snapshots = snapshots
+        self.deadline = deadline
+        self.loop = None
+        self.queue = asyncio.Queue()
+        self.slots = threading.Semaphore(maxsize)
+        self.cancelled = threading.Event()
+
+    def emit(self, event):
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise SolverTimeout("Tempo limite excedido - solver cancelado")
+        self.put(event)
+
+    def put(self, item):
+        """Chamado pela thread do solver; bloqueia enquanto a fila estiver cheia"""
+        while not self.slots.acquire(timeout=0.1):
+            if self.cancelled.is_set():
+                raise SolveCancelled("Cliente desconectado")
+        if self.cancelled.is_set():
+            raise SolveCancelled("Cliente desconectado")
+        try:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, item)
+        except RuntimeError:
+            # Event loop já encerrado: ninguém mais vai ler os eventos
+            raise SolveCancelled("Cliente desconectado")
+
+    async def get(self):
+        item = await self.queue.get()
+        self.slots.release()
+        return item
+
+
+async def stream_solve(task, data, sink):
+    """Roda task(data, trace=sink) no executor e gera os eventos à medida que saem
+
+    O solve passa por run_solver_async, isto é, ocupa uma das threads
+    limitadas por SOLVER_ASYNC_WORKERS (as excedentes aguardam na fila). Ele
+    roda sempre inline nessa thread, pois os eventos não atravessam o pool de
+    processos; o prazo de SOLVER_TIMEOUT é verificado pelo sink a cada evento.
+
+    O último evento é {'event': 'result', ...} com a resposta de `task` ou
+    {'event': 'error', 'error': ..., 'status': ...} se o solve falhar.
+    """
+    sink.loop = asyncio.get_running_loop()
+    solve = asyncio.ensure_future(run_solver_async(functools.partial(task, trace=sink), (data,), 0))
+    getter = None
+    try:
+        while True:
+            if getter is None:
+                getter = asyncio.ensure_future(sink.get())
+            await asyncio.wait({getter, solve}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                yield getter.result()
+                getter = None
+            elif solve.done():
+                break
+
+        # Os eventos do solver são enfileirados antes de o resultado ficar
+        # pronto, então o que restou na fila já está todo aqui
+        while not sink.queue.empty():
+            yield await sink.get()
+
+        try:
+            yield dict(solve.result(), event='result')
+        except SolveCancelled:
+            return
+        except SolverTimeout as e:
+            yield {'event': 'error', 'error': str(e), 'status': 504}
+        except Exception as e:
+            yield {'event': 'error', 'error': str(e), 'status': 400}
+    finally:
+        # Gerador fechado (fim normal ou cliente desconectado): parar o solver
+        sink.cancelled.set()
+        if getter is not None:
+            getter.cancel()
+        # O solve interrompido termina sozinho na sua thread; o erro dele
+        # (SolveCancelled) não interessa a mais ninguém
+        solve.add_done_callback(_discard_result)
+
+
+def _discard_result(future):
+    if not future.cancelled():
+        future.exception()
+
+
+async def encode_stream(events, sse=False, text=False):
+    """Serializa os eventos de stream_solve, repassando o fechamento da resposta"""
+    try:
+        async for event in events:
+            yield encode_event(event, sse=sse, text=text)
+    finally:
+        await events.aclose()
+
+
+def encode_event(event, sse=False, text=False):
+    """Serializa um evento como linha NDJSON ou como mensagem SSE
+
+    Com `text` o evento leva também sua linha do log tradicional ('text').
+    """
+    if text:
+        line = format_event(event) if event['event'] not in ('result', 'error') else None
+        if line is not None:
+            event = dict(event, text=line)
+    payload = json.dumps(event)
+    if sse:
+        return f"event: {event['event']}\ndata: {payload}\n\n"
+    return payload + '\n'
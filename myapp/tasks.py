@@ -0,0 +1,183 @@
+import base64
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from django.conf import settings
+
+from .batch import solve_batch
+from .big_m import SimplexBigM
+from .graphical_method import GraphicalMethod
+from .limits import LimitReached
+from .plot_renderer import plot_options
+from .solve_sessions import GraphicalSession, SolveSession
+from .trace import request_sink, trace_response
+
+
+def parse_matrix(A):
+    """Aceita A denso (lista de linhas) ou esparso em triplas
+
+    Formato esparso: {"shape": [m, n], "rows": [...], "cols": [...], "data": [...]}
+    """
+    if isinstance(A, dict):
+        return sp.csr_matrix((A['data'], (A['rows'], A['cols'])), shape=tuple(A['shape']))
+    return A
+
+
+def problem_size(data):
+    """Tamanho do modelo (não-zeros de A) usado para decidir onde resolver"""
+    A = data.get('A', [])
+    if isinstance(A, dict):
+        return len(A.get('data', []))
+    return int(np.size(A))
+
+
+def solve_limits(data):
+    """max_iterations e time_limit do payload, sem passar de SOLVER_MAX_ITERATIONS e SOLVER_TIME_LIMIT"""
+    limits = {}
+    for key, setting, kind in (('max_iterations', 'SOLVER_MAX_ITERATIONS', int),
+                               ('time_limit', 'SOLVER_TIME_LIMIT', float)):
+        values = [kind(v) for v in (data.get(key), getattr(settings, setting, None)) if v is not None]
+        limits[key] = min(values) if values else None
+    return limits
+
+
+def solve_bigm_task(data, trace=None):
+    """Resolve o payload JSON de /bigm/ e devolve o dicionário de resposta
+
+    Função de módulo (picklable) para poder rodar tanto inline quanto num
+    processo do pool de solvers. Com `trace` os eventos vão para esse sink
+    (p.ex. o do endpoint de streaming) e não são repetidos na resposta.
+    Se o solve atinge o limite de iterações ou de tempo a resposta traz
+    "status": "limit_reached" e a melhor base encontrada em vez da ótima.
+    """
+    # Rastreamento só quando pedido ("trace": true e/ou "log": true)
+    sink = trace if trace is not None else request_sink(data)
+    solver = SimplexBigM(data['c'], parse_matrix(data['A']), data['b'],
+                         sense=data.get('sense', 'max'),
+                         constraints_type=data.get('constraints_type', None),
+                         # 'bigm', 'revised' ou 'two_phase' (padrão: 'revised' para A esparso)
+                         method=data.get('method', None),
+                         base=data.get('base', None),  # base ótima de uma solução anterior
+                         trace=sink,
+                         presolve=bool(data.get('presolve', False)),
+                         scaling=bool(data.get('scaling', True)),
+                         # 'dantzig' (padrão), 'devex', 'steepest_edge', 'partial' ou 'multiple'
+                         pricing=data.get('pricing', None),
+                         # Limites por variável, null onde não há (padrão: x >= 0)
+                         lower=data.get('lower', None),
+                         upper=data.get('upper', None),
+                         at_upper=data.get('at_upper', None),  # junto com `base`, se houver limites
+                         **solve_limits(data))
+    started = time.perf_counter()
+    try:
+        solution, optimal_value = solver.solve()
+    except LimitReached as limit:
+        response = dict(limit.partial, status='limit_reached', reason=limit.reason, message=str(limit),
+                        iterations=solver.iterations, warm_started=solver.warm_started,
+                        pricing=dict(solver.pricing.stats(), iterations=solver.iterations,
+                                     solve_time=time.perf_counter() - started))
+        if solver.presolved is not None:
+            response['presolve'] = solver.presolved.stats()
+        if solver.bounds.active:
+            response['at_upper'] = solver.at_upper
+        if trace is None:
+            response.update(trace_response(data, sink))
+        return response
+    elapsed = time.perf_counter() - started
+
+    response = {
+        'status': 'optimal',
+        'solution': solution.tolist(),
+        'optimal_value': optimal_value,
+        'duals': solver.duals.tolist(),
+        'base': solver.base,
+        'var_types': solver.var_types,
+        'iterations': solver.iterations,
+        'warm_started': solver.warm_started,
+        # Custo da regra de precificação: pivôs, tempo precificando e tempo total
+        'pricing': dict(solver.pricing.stats(), iterations=solver.iterations, solve_time=elapsed),
+    }
+    if solver.presolved is not None:
+        # base e var_types referem-se ao modelo reduzido
+        response['presolve'] = solver.presolved.stats()
+    if solver.scaling.active:
+        response['scaling'] = solver.scaling.stats()
+    if solver.bounds.active:
+        # Não-básicas no limite superior (a base sozinha não descreve o vértice)
+        response['at_upper'] = solver.at_upper
+        response['bounds'] = solver.bounds.stats()
+    if trace is None:
+        response.update(trace_response(data, sink))
+    return response
+
+
+def solve_batch_task(data):
+    """Resolve o payload JSON de /bigm/batch/ (picklable, como solve_bigm_task)"""
+    problems = [dict(problem, A=parse_matrix(problem['A'])) if 'A' in problem else problem
+                for problem in data['problems']]
+    return {'results': solve_batch(problems, **solve_limits(data))}
+
+
+def batch_size(data):
+    """Tamanho do lote para run_solver: soma dos tamanhos dos modelos"""
+    return sum(problem_size(problem) for problem in data['problems'])
+
+
+def create_bigm_session_task(data):
+    """Resolve o payload de /bigm/session/; devolve (SolveSession, resposta)
+
+    Picklable como solve_bigm_task: a sessão volta do processo do pool
+    serializada, como seria ao ir para o cache.
+    """
+    sink = request_sink(data)
+    session = SolveSession(data['c'], parse_matrix(data['A']), data['b'],
+                           sense=data.get('sense', 'max'),
+                           constraints_type=data.get('constraints_type', None),
+                           trace=sink, **solve_limits(data))
+    return session, dict(session.result(), **trace_response(data, sink))
+
+
+def create_graphical_session_task(data):
+    """Monta o polígono do payload de /grafico/session/; devolve (GraphicalSession, resposta)"""
+    session = GraphicalSession(data['c'], data['A'], data['b'], sense=data.get('sense', 'max'),
+                               constraints_type=data.get('constraints_type', None))
+    sink = request_sink(data)
+    return session, dict(session.result(sink), **trace_response(data, sink))
+
+
+def solve_graphical_task(data):
+    """Resolve o payload JSON de /grafico/ e devolve a solução
+
+    O gráfico é servido à parte (veja render_plot_task); com "plot_inline":
+    true ele vem embutido em base64, como antes. Com "mode": "geometry" não há
+    gráfico: a resposta traz a geometria ('geometry') para o cliente desenhar. "plot": {"format":
+    "png"|"svg"|"webp", "width", "height", "dpi", "quality"} escolhe o formato
+    e o tamanho (padrão: PNG 12x10 a 100 dpi).
+    """
+    options = plot_options(data.get('plot'))
+    sink = request_sink(data)
+    gm = GraphicalMethod(data['c'], data['A'], data['b'], sense=data.get('sense', 'max'),
+                         constraints_type=data.get('constraints_type', None), trace=sink)
+    result = gm.solve()
+
+    response = {
+        'solution_point': result.point.tolist(),
+        'optimal_value': result.value,
+    }
+    if data.get('mode') == 'geometry':
+        response['geometry'] = result.geometry()
+    elif data.get('plot_inline'):
+        # Gerar gráfico (uma única vez, a partir dos vértices já calculados)
+        image, mime = result.render(options)
+        response['plot_image'] = base64.b64encode(image).decode('utf-8')
+        response['plot_mime'] = mime
+    response.update(trace_response(data, sink))
+    return response
+
+
+def render_plot_task(spec):
+    """Renderiza o gráfico de uma especificação de myapp.plot_store; retorna (bytes, mime)"""
+    gm = GraphicalMethod(spec['c'], spec['A'], spec['b'], sense=spec['sense'],
+                         constraints_type=spec['constraints_type'])
+    return gm.solve().render(spec['plot'])
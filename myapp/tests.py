@@ -1,3 +1,1332 @@
-from django.test import TestCase
+import asyncio
+import contextlib
+import io
+import json
+import threading
+import time
+from unittest import mock
 
-# Create your tests here.
+import matplotlib.pyplot as plt
+import numpy as np
+import scipy.sparse as sp
+from django.conf import settings
+from django.test import AsyncClient, TestCase, override_settings
+from scipy.optimize import linprog
+
+from .batch import solve_batch
+from .big_m import SimplexBigM
+from .bounds import Bounds
+from . import views
+from .executor import SolverPool, SolverTimeout, get_thread_executor, run_solver, run_solver_async
+from .graphical_method import GraphicalMethod, GraphicalResult
+from .half_planes import dedupe_points, enumerate_vertices, intersect_half_planes, recession_interval
+from .limits import LimitReached
+from .models import SimplexStandard
+from .plot_renderer import DEFAULT_OPTIONS, plot_options, render_plot
+from .presolve import Presolve
+from .pricing import PRICING_RULES, make_pricing
+from .result_cache import LOCK_SUFFIX, CachedProblem, get_cache, solve_once
+from .scaling import Scaling
+from .simplex_engine import RevisedSimplexEngine, TableauEngine
+from .solve_sessions import GraphicalSession, SolveSession
+from .streaming import QueueSink, stream_solve
+from .tasks import create_bigm_session_task, parse_matrix, render_plot_task, solve_bigm_task
+from .trace import ListSink, format_trace
+
+# Exemplo dos formulários: max 3x1 + 5x2 com ótimo 36 em (2, 6)
+EXAMPLE = {'c': [3, 5], 'A': [[1, 0], [0, 2], [3, 2]], 'b': [4, 12, 18]}
+
+
+def reference(c, A, b, constraints_type, sense='max'):
+    """Ótimo pelo HiGHS (scipy.optimize.linprog), ou None se infactível/ilimitado"""
+    c, A, b = np.asarray(c, dtype=float), np.asarray(A, dtype=float), np.asarray(b, dtype=float)
+    rows = {'<=': ([], []), '>=': ([], []), '=': ([], [])}
+    for i, constraint_type in enumerate(constraints_type):
+        sign = -1.0 if constraint_type == '>=' else 1.0
+        rows[constraint_type][0].append(sign * A[i])
+        rows[constraint_type][1].append(sign * b[i])
+    A_ub, b_ub = rows['<='][0] + rows['>='][0], rows['<='][1] + rows['>='][1]
+    A_eq, b_eq = rows['='][0], rows['='][1]
+    result = linprog(-c if sense == 'max' else c, A_ub=A_ub or None, b_ub=b_ub or None,
+                     A_eq=A_eq or None, b_eq=b_eq or None, method='highs')
+    if result.status != 0:
+        return None
+    return -result.fun if sense == 'max' else result.fun
+
+
+def random_lp(rng, m, n):
+    """PL factível e limitado: restrições em torno de um ponto x0 >= 0 e uma linha de soma"""
+    A = rng.integers(-5, 10, size=(m, n)).astype(float)
+    A[rng.random((m, n)) < 0.3] = 0
+    x0 = rng.random(n) * 5
+    constraints_type = [str(rng.choice(['<=', '>=', '='], p=[0.5, 0.3, 0.2])) for _ in range(m)]
+    slack = rng.random(m) * 3
+    b = A @ x0 + np.where(np.array(constraints_type) == '<=', slack, 0.0)
+    b -= np.where(np.array(constraints_type) == '>=', slack, 0.0)
+    A = np.vstack([A, np.ones(n)])
+    return rng.integers(-5, 10, size=n).astype(float), A, np.append(b, 100.0), constraints_type + ['<=']
+
+
+class TableauEngineTests(TestCase):
+    def test_pivot_keeps_basis_columns_as_identity(self):
+        engine = TableauEngine([[1.0, 0.0, 1.0, 0.0], [3.0, 2.0, 0.0, 1.0]], [3.0, 5.0, 0.0, 0.0],
+                               [4.0, 18.0], [2, 3])
+        entering = engine.entering_variable()
+        self.assertEqual(entering, 1)
+        row = engine.leaving_row(entering)
+        self.assertEqual(engine.pivot(row, entering), 3)
+
+        np.testing.assert_allclose(engine.tableau[:, engine.base], np.eye(2))
+        np.testing.assert_allclose(engine.solution(), [0.0, 9.0, 4.0, 0.0])
+        self.assertAlmostEqual(engine.objective_value(), 45.0)
+
+
+def post_json(client, url, payload):
+    return client.post(url, data=json.dumps(payload), content_type='application/json')
+
+
+def triplets(A):
+    """A no formato esparso do JSON: {"shape", "rows", "cols", "data"}"""
+    A = sp.coo_matrix(A)
+    return {'shape': list(A.shape), 'rows': A.row.tolist(), 'cols': A.col.tolist(), 'data': A.data.tolist()}
+
+
+def sleep_and_return(seconds, value):
+    """Tarefa de teste para o pool (função de módulo, portanto picklable)"""
+    time.sleep(seconds)
+    return value
+
+
+def run_engine(engine):
+    """Pivota pela regra de Dantzig até a otimalidade e devolve o número de pivôs"""
+    pivots = 0
+    while (entering := engine.entering_variable()) is not None:
+        engine.pivot(engine.leaving_row(entering), entering)
+        pivots += 1
+    return pivots
+
+
+class RevisedSimplexEngineTests(TestCase):
+    def test_same_vertex_as_tableau_engine(self):
+        rng = np.random.default_rng(3)
+        m, n = 12, 20
+        A = np.hstack([rng.integers(0, 10, size=(m, n)).astype(float), np.eye(m)])
+        b = rng.integers(10, 50, size=m).astype(float)
+        c = np.concatenate([rng.integers(1, 10, size=n).astype(float), np.zeros(m)])
+        base = list(range(n, n + m))
+
+        tableau = TableauEngine(A, c, b, base)
+        # Refatorar a cada 3 pivôs exercita tanto as etas quanto a LU
+        revised = RevisedSimplexEngine(A, c, b, base, refactor_every=3)
+        self.assertEqual(run_engine(tableau), run_engine(revised))
+        np.testing.assert_allclose(revised.solution(), tableau.solution(), atol=1e-9)
+        self.assertAlmostEqual(revised.objective_value(), tableau.objective_value())
+
+        revised.refactor()
+        np.testing.assert_allclose(revised.solution(), tableau.solution(), atol=1e-9)
+
+    def test_revised_method_matches_linprog(self):
+        rng = np.random.default_rng(4)
+        for _ in range(20):
+            c, A, b, constraints_type = random_lp(rng, rng.integers(1, 8), rng.integers(1, 8))
+            _, value = SimplexBigM(c, A, b, constraints_type=constraints_type, method='revised').solve()
+            expected = reference(c, A, b, constraints_type)
+            self.assertAlmostEqual(value, expected, delta=1e-6 * max(1.0, abs(expected)))
+
+    def test_unknown_method_is_rejected(self):
+        with self.assertRaisesMessage(ValueError, 'Método desconhecido'):
+            SimplexBigM(**EXAMPLE, method='interior_point')
+
+
+class SimplexBigMTests(TestCase):
+    def test_textbook_example(self):
+        solution, value = SimplexBigM(**EXAMPLE).solve()
+        np.testing.assert_allclose(solution, [2.0, 6.0], atol=1e-9)
+        self.assertAlmostEqual(value, 36.0)
+
+    def test_matches_linprog_on_mixed_constraints(self):
+        rng = np.random.default_rng(1)
+        for _ in range(30):
+            c, A, b, constraints_type = random_lp(rng, rng.integers(1, 6), rng.integers(1, 6))
+            for sense in ('max', 'min'):
+                expected = reference(c, A, b, constraints_type, sense)
+                _, value = SimplexBigM(c, A, b, sense=sense, constraints_type=constraints_type).solve()
+                self.assertAlmostEqual(value, expected, delta=1e-6 * max(1.0, abs(expected)))
+
+    def test_infeasible_and_unbounded_raise(self):
+        with self.assertRaisesMessage(ValueError, 'infactível'):
+            SimplexBigM([1, 1], [[1, 1], [1, 1]], [1, 3], constraints_type=['<=', '>=']).solve()
+        with self.assertRaisesMessage(ValueError, 'ilimitado'):
+            SimplexBigM([1, 1], [[1, -1]], [1]).solve()
+
+
+class SimplexStandardTests(TestCase):
+    def test_matches_linprog(self):
+        rng = np.random.default_rng(2)
+        for _ in range(20):
+            m, n = rng.integers(1, 6, size=2)
+            c = rng.integers(-5, 10, size=n).astype(float)
+            A = rng.integers(0, 10, size=(m, n)).astype(float) + np.eye(m, n)
+            b = rng.integers(1, 30, size=m).astype(float)
+            _, value = SimplexStandard(c, A, b).solve()
+            expected = reference(c, A, b, ['<='] * m)
+            self.assertAlmostEqual(value, expected, delta=1e-6 * max(1.0, abs(expected)))
+
+    def test_requires_canonical_form(self):
+        with self.assertRaisesMessage(ValueError, '<='):
+            SimplexStandard([1, 1], [[1, 1]], [1], constraints_type=['>=']).solve()
+
+
+class TwoPhaseTests(TestCase):
+    def test_costs_larger_than_the_penalty(self):
+        # Com M = 1e6 o Big M prefere manter a artificial a pagar 1e7 por x1
+        data = dict(c=[1e7, 1], A=[[1, 0]], b=[1], sense='min', constraints_type=['>='])
+        with self.assertRaisesMessage(ValueError, 'infactível'):
+            SimplexBigM(**data).solve()
+        solution, value = SimplexBigM(**data, method='two_phase').solve()
+        np.testing.assert_allclose(solution, [1.0, 0.0])
+        self.assertAlmostEqual(value, 1e7)
+
+    def test_matches_linprog(self):
+        rng = np.random.default_rng(5)
+        for _ in range(20):
+            c, A, b, constraints_type = random_lp(rng, rng.integers(1, 8), rng.integers(1, 8))
+            for sense in ('max', 'min'):
+                solver = SimplexBigM(c, A, b, sense=sense, constraints_type=constraints_type, method='two_phase')
+                _, value = solver.solve()
+                expected = reference(c, A, b, constraints_type, sense)
+                self.assertAlmostEqual(value, expected, delta=1e-6 * max(1.0, abs(expected)))
+                self.assertNotIn('artificial', [solver.var_types[j] for j in solver.base])
+
+    def test_redundant_equality_rows(self):
+        solver = SimplexBigM([1, 1], [[1, 1], [2, 2], [1, 0]], [2, 4, 3], constraints_type=['=', '=', '<='],
+                             method='two_phase')
+        _, value = solver.solve()
+        self.assertAlmostEqual(value, 2.0)
+        # A linha repetida sai da base ao final da Fase I
+        self.assertEqual(len(solver.base), 2)
+
+    def test_infeasible(self):
+        with self.assertRaisesMessage(ValueError, 'infactível'):
+            SimplexBigM([1, 1], [[1, 1], [1, 1]], [1, 3], constraints_type=['<=', '>='], method='two_phase').solve()
+
+
+class SparseInputTests(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(6)
+        m, n = 30, 60
+        A = sp.random(m, n, density=0.1, random_state=7, format='csr') * 10
+        self.A = sp.vstack([A, sp.csr_matrix(np.ones((1, n)))]).tocsr()
+        self.c = rng.integers(1, 10, size=n).astype(float)
+        self.b = np.append(rng.integers(5, 20, size=m).astype(float), 50.0)
+
+    def test_sparse_matrix_matches_dense(self):
+        solver = SimplexBigM(self.c, self.A, self.b)
+        self.assertEqual(solver.method, 'revised')
+        self.assertTrue(solver.sparse)
+        _, value = solver.solve()
+        _, dense_value = SimplexBigM(self.c, self.A.toarray(), self.b).solve()
+        self.assertAlmostEqual(value, dense_value, places=6)
+        self.assertAlmostEqual(value, reference(self.c, self.A.toarray(), self.b, ['<='] * len(self.b)), places=6)
+
+    def test_parse_matrix_triplets(self):
+        A = parse_matrix(triplets(self.A))
+        self.assertTrue(sp.issparse(A))
+        np.testing.assert_array_equal(A.toarray(), self.A.toarray())
+        self.assertEqual(parse_matrix([[1, 2]]), [[1, 2]])
+
+    def test_endpoint_accepts_triplets(self):
+        response = post_json(self.client, '/bigm/', {'c': EXAMPLE['c'], 'A': triplets(EXAMPLE['A']),
+                                                     'b': EXAMPLE['b']})
+        self.assertEqual(response.status_code, 200)
+        self.assertAlmostEqual(response.json()['optimal_value'], 36.0)
+
+
+class WarmStartTests(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(8)
+        self.c, self.A, self.b, self.constraints_type = random_lp(rng, 25, 30)
+
+    def test_resolve_from_previous_basis(self):
+        for method in ('bigm', 'revised', 'two_phase'):
+            cold = SimplexBigM(self.c, self.A, self.b, constraints_type=self.constraints_type, method=method)
+            cold.solve()
+
+            # Mesmo modelo com um custo levemente alterado
+            c = self.c.copy()
+            c[0] += 0.5
+            warm = SimplexBigM(c, self.A, self.b, constraints_type=self.constraints_type, method=method,
+                               base=cold.base)
+            _, value = warm.solve()
+            self.assertTrue(warm.warm_started)
+            self.assertLess(warm.iterations, cold.iterations)
+            self.assertAlmostEqual(value, reference(c, self.A, self.b, self.constraints_type), places=6)
+
+    def test_invalid_basis_falls_back_to_cold_start(self):
+        solver = SimplexBigM(**EXAMPLE, base=[0, 0, 1])
+        _, value = solver.solve()
+        self.assertFalse(solver.warm_started)
+        self.assertAlmostEqual(value, 36.0)
+
+    def test_basis_cannot_be_combined_with_presolve(self):
+        with self.assertRaisesMessage(ValueError, 'presolve'):
+            SimplexBigM(**EXAMPLE, base=[2, 1, 0], presolve=True)
+
+    def test_endpoint_round_trip(self):
+        first = post_json(self.client, '/bigm/', EXAMPLE).json()
+        response = post_json(self.client, '/bigm/', dict(EXAMPLE, c=[3, 6], base=first['base']))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['warm_started'])
+        self.assertAlmostEqual(response.json()['optimal_value'], 42.0)
+
+
+class SolveSessionTests(TestCase):
+    def assertOptimal(self, session, c, A, b, constraints_type, sense='max'):
+        expected = reference(c, A, b, constraints_type, sense)
+        self.assertAlmostEqual(session.optimal_value, expected, delta=1e-6 * max(1.0, abs(expected)))
+
+    def test_edits_match_a_fresh_solve(self):
+        rng = np.random.default_rng(9)
+        for sense in ('max', 'min'):
+            c, A, b, constraints_type = random_lp(rng, 8, 6)
+            session = SolveSession(c, A, b, sense=sense, constraints_type=constraints_type)
+            self.assertOptimal(session, c, A, b, constraints_type, sense)
+
+            # Folga maior numa restrição <= (continua factível)
+            row = constraints_type.index('<=')
+            b = b.copy()
+            b[row] += 2.0
+            session.apply({'op': 'set_rhs', 'index': row, 'value': b[row]})
+            self.assertOptimal(session, c, A, b, constraints_type, sense)
+
+            # Corte que exclui o ótimo atual
+            a = rng.integers(0, 5, size=6).astype(float)
+            rhs = 0.99 * float(a @ session.solution)
+            session.apply({'op': 'add_constraint', 'a': a.tolist(), 'type': '<=', 'b': rhs})
+            A, b, constraints_type = np.vstack([A, a]), np.append(b, rhs), constraints_type + ['<=']
+            self.assertOptimal(session, c, A, b, constraints_type, sense)
+
+            session.apply({'op': 'remove_constraint', 'index': 0})
+            A, b, constraints_type = A[1:], b[1:], constraints_type[1:]
+            self.assertOptimal(session, c, A, b, constraints_type, sense)
+
+    def test_infeasible_edit_is_reported(self):
+        session = SolveSession(**EXAMPLE)
+        with self.assertRaisesMessage(ValueError, 'infactível'):
+            session.apply({'op': 'add_constraint', 'a': [1, 1], 'type': '>=', 'b': 100})
+        with self.assertRaisesMessage(ValueError, 'Edição desconhecida'):
+            session.apply({'op': 'rename'})
+
+    def test_endpoints(self):
+        created = post_json(self.client, '/bigm/session/', EXAMPLE)
+        self.assertEqual(created.status_code, 200)
+        session_id = created.json()['session_id']
+
+        response = post_json(self.client, f'/bigm/session/{session_id}/',
+                             {'edits': [{'op': 'set_rhs', 'index': 2, 'value': 12}]})
+        self.assertEqual(response.status_code, 200)
+        # max 3x1 + 5x2 com 3x1 + 2x2 <= 12: ótimo em (0, 6)
+        self.assertAlmostEqual(response.json()['optimal_value'], 30.0)
+
+        self.assertEqual(self.client.delete(f'/bigm/session/{session_id}/').status_code, 200)
+        response = post_json(self.client, f'/bigm/session/{session_id}/', {'edits': []})
+        self.assertEqual(response.status_code, 404)
+
+    def test_failed_edits_are_rolled_back(self):
+        session_id = post_json(self.client, '/bigm/session/', EXAMPLE).json()['session_id']
+        response = post_json(self.client, f'/bigm/session/{session_id}/',
+                             {'edits': [{'op': 'set_rhs', 'index': 2, 'value': 12},
+                                        {'op': 'add_constraint', 'a': [1, 1], 'type': '>=', 'b': 100}]})
+        self.assertEqual(response.status_code, 400)
+
+        # Nenhuma das duas edições ficou: o modelo tem 3 restrições e o ótimo original
+        response = post_json(self.client, f'/bigm/session/{session_id}/', {'edits': []})
+        self.assertAlmostEqual(response.json()['optimal_value'], 36.0)
+        response = post_json(self.client, f'/bigm/session/{session_id}/',
+                             {'edits': [{'op': 'remove_constraint', 'index': 3}]})
+        self.assertEqual(response.status_code, 400)
+
+
+class BatchTests(TestCase):
+    def test_matches_individual_solves_in_order(self):
+        rng = np.random.default_rng(10)
+        problems = []
+        for _ in range(40):
+            # Poucos formatos distintos: vários grupos empilhados
+            c, A, b, constraints_type = random_lp(rng, rng.integers(1, 3), rng.integers(1, 3))
+            problems.append({'c': c, 'A': A, 'b': b, 'constraints_type': constraints_type,
+                             'sense': str(rng.choice(['max', 'min']))})
+
+        for problem, result in zip(problems, solve_batch(problems)):
+            expected = reference(problem['c'], problem['A'], problem['b'], problem['constraints_type'],
+                                 problem['sense'])
+            self.assertEqual(result['status'], 'optimal')
+            self.assertAlmostEqual(result['optimal_value'], expected, delta=1e-6 * max(1.0, abs(expected)))
+
+    def test_failures_stay_per_problem(self):
+        results = solve_batch([EXAMPLE, {'c': [1], 'A': [[1, 2]], 'b': [1]}, {'c': [1, 1], 'A': [[1, -1]], 'b': [1]},
+                               {'c': [1]}])
+        self.assertAlmostEqual(results[0]['optimal_value'], 36.0)
+        self.assertEqual(results[1]['status'], 'error')
+        self.assertEqual(results[2]['error'], 'Problema ilimitado')
+        self.assertIn('Campo obrigatório ausente', results[3]['error'])
+
+    def test_endpoint(self):
+        response = post_json(self.client, '/bigm/batch/', {'problems': [EXAMPLE, dict(EXAMPLE, sense='min')]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['optimal_value'] for r in response.json()['results']], [36.0, 0.0])
+        self.assertEqual(post_json(self.client, '/bigm/batch/', {}).status_code, 400)
+
+
+class SolverPoolTests(TestCase):
+    def setUp(self):
+        self.pool = SolverPool(1, preload=())
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    def test_runs_in_a_worker_process(self):
+        self.assertEqual(self.pool.run(sleep_and_return, (0, 'ok'), timeout=30), 'ok')
+        self.assertEqual(self.pool.run(SimplexBigM(**EXAMPLE).solve, (), timeout=30)[1], 36.0)
+
+    def test_timeout_replaces_the_worker(self):
+        with self.assertRaises(SolverTimeout):
+            self.pool.run(sleep_and_return, (30, None), timeout=0.5)
+        self.assertEqual(len(self.pool._idle), 1)
+        self.assertEqual(self.pool.run(sleep_and_return, (0, 'again'), timeout=30), 'again')
+
+    def test_unpicklable_task_keeps_the_worker(self):
+        worker = self.pool._idle[0]
+        with self.assertRaises(Exception):
+            self.pool.run(lambda: None, (), timeout=30)
+        self.assertEqual(self.pool._idle, [worker])
+        self.assertEqual(self.pool.run(sleep_and_return, (0, 1), timeout=30), 1)
+
+    def test_worker_errors_are_raised(self):
+        with self.assertRaisesMessage(ValueError, 'ilimitado'):
+            self.pool.run(SimplexBigM([1, 1], [[1, -1]], [1]).solve, (), timeout=30)
+
+    def test_session_comes_back_from_the_worker(self):
+        session, response = self.pool.run(create_bigm_session_task, (EXAMPLE,), timeout=30)
+        self.assertEqual(response['optimal_value'], 36.0)
+        session.apply({'op': 'set_rhs', 'index': 2, 'value': 12})
+        self.assertAlmostEqual(session.optimal_value, 30.0)
+
+
+class RunSolverTests(TestCase):
+    @override_settings(SOLVER_INLINE_MAX_SIZE=100)
+    def test_small_models_stay_inline(self):
+        with mock.patch('myapp.executor.get_pool') as get_pool:
+            self.assertEqual(run_solver(sleep_and_return, (0, 'inline'), 6), 'inline')
+        get_pool.assert_not_called()
+
+    @override_settings(SOLVER_INLINE_MAX_SIZE=0, SOLVER_TIMEOUT=7)
+    def test_large_models_go_to_the_pool(self):
+        with mock.patch('myapp.executor.get_pool') as get_pool:
+            get_pool.return_value.run.return_value = 'pool'
+            self.assertEqual(run_solver(sleep_and_return, (0, 'inline'), 6), 'pool')
+        get_pool.return_value.run.assert_called_once_with(sleep_and_return, (0, 'inline'), timeout=7)
+
+    @override_settings(SOLVER_INLINE_MAX_SIZE=0)
+    def test_session_creation_goes_to_the_pool(self):
+        for url in ('/bigm/session/', '/grafico/session/'):
+            with mock.patch('myapp.executor.get_pool') as get_pool:
+                get_pool.return_value.run.side_effect = SolverTimeout('Tempo limite excedido')
+                self.assertEqual(post_json(self.client, url, EXAMPLE).status_code, 504)
+            get_pool.return_value.run.assert_called_once()
+
+
+class TraceTests(TestCase):
+    def test_events_without_printing(self):
+        sink = ListSink()
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            SimplexBigM(**EXAMPLE, trace=sink).solve()
+            SimplexBigM(**EXAMPLE).solve()
+        self.assertEqual(stdout.getvalue(), '')
+
+        events = [event['event'] for event in sink.events]
+        self.assertEqual(events[0], 'start')
+        self.assertEqual(events[-1], 'optimal')
+        self.assertNotIn('snapshot', events)
+        iterations = [event for event in sink.events if event['event'] == 'iteration']
+        self.assertEqual([event['iteration'] for event in iterations], list(range(1, len(iterations) + 1)))
+        self.assertAlmostEqual(sink.events[-1]['objective'], 36.0)
+
+    def test_snapshots_only_when_requested(self):
+        sink = ListSink(snapshots=True)
+        SimplexBigM(**EXAMPLE, trace=sink).solve()
+        snapshots = [event for event in sink.events if event['event'] == 'snapshot']
+        self.assertTrue(snapshots[0]['initial'])
+        self.assertIn('tableau', snapshots[-1])
+        self.assertIn('Solução ótima encontrada!', format_trace(sink.events))
+
+    def test_endpoint_trace_and_log(self):
+        body = post_json(self.client, '/bigm/', dict(EXAMPLE, trace=True, log=True)).json()
+        self.assertEqual(body['trace'][0]['event'], 'start')
+        self.assertEqual(body['log'], format_trace(body['trace']))
+        self.assertNotIn('trace', post_json(self.client, '/bigm/', EXAMPLE).json())
+
+
+class StreamingTests(TestCase):
+    async def stream(self, payload, **headers):
+        response = await AsyncClient().post('/bigm/stream/', data=json.dumps(payload),
+                                            content_type='application/json', headers=headers)
+        self.assertTrue(response.is_async)
+        return response, [chunk.decode() async for chunk in response.streaming_content]
+
+    async def test_ndjson_events_end_with_the_result(self):
+        response, lines = await self.stream(dict(EXAMPLE, log=True))
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        events = [json.loads(line) for line in lines]
+        self.assertEqual(events[0]['event'], 'start')
+        self.assertIn('text', events[1])
+        self.assertEqual(events[-1]['event'], 'result')
+        self.assertAlmostEqual(events[-1]['optimal_value'], 36.0)
+
+    async def test_server_sent_events(self):
+        response, messages = await self.stream(EXAMPLE, Accept='text/event-stream')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertTrue(messages[-1].startswith('event: result\ndata: '))
+
+    async def test_errors_are_the_last_event(self):
+        _, lines = await self.stream(dict(EXAMPLE, method='simplex'))
+        self.assertEqual(json.loads(lines[-1]), {'event': 'error', 'error': 'Método desconhecido: simplex',
+                                                 'status': 400})
+
+    async def test_closing_the_stream_cancels_the_solve(self):
+        sink = QueueSink(snapshots=True, maxsize=1)
+        events = stream_solve(solve_bigm_task, EXAMPLE, sink)
+        self.assertEqual((await events.__anext__())['event'], 'start')
+        await events.aclose()
+        self.assertTrue(sink.cancelled.is_set())
+
+    @override_settings(SOLVER_TIMEOUT=0)
+    async def test_timeout_event(self):
+        _, lines = await self.stream(EXAMPLE)
+        self.assertEqual(json.loads(lines[-1])['status'], 504)
+
+
+class AsyncViewTests(TestCase):
+    def test_solver_views_are_async(self):
+        for view in (views.solve_bigm, views.solve_linear_program, views.solve_bigm_stream, views.solve_bigm_batch):
+            self.assertTrue(asyncio.iscoroutinefunction(view), view.__name__)
+
+    async def test_solves_run_on_the_bounded_executor(self):
+        name = await run_solver_async(lambda: threading.current_thread().name, (), 0)
+        self.assertTrue(name.startswith('solver'))
+        self.assertEqual(get_thread_executor()._max_workers, settings.SOLVER_ASYNC_WORKERS)
+
+    async def test_concurrent_requests(self):
+        client = AsyncClient()
+        problems = [dict(EXAMPLE, b=[4, 12, 18 + k]) for k in range(6)]
+        responses = await asyncio.gather(*(client.post('/bigm/', data=json.dumps(problem),
+                                                       content_type='application/json')
+                                           for problem in problems))
+        for problem, response in zip(problems, responses):
+            self.assertEqual(response.status_code, 200)
+            self.assertAlmostEqual(response.json()['optimal_value'],
+                                   reference(EXAMPLE['c'], EXAMPLE['A'], problem['b'], ['<='] * 3))
+
+    def test_error_status_codes(self):
+        self.assertEqual(self.client.get('/bigm/').status_code, 405)
+        self.assertEqual(self.client.post('/bigm/', data='{', content_type='application/json').status_code, 400)
+        self.assertEqual(post_json(self.client, '/grafico/', {'c': [1, 1]}).status_code, 400)
+
+
+# Modelo com uma linha >= e o mesmo modelo com as linhas em outra ordem e ruído no último dígito
+EXAMPLE_GE = {'c': [3, 5], 'A': [[3, 2], [1, 0], [0, 2], [1, 1]], 'b': [18, 4, 12, -1],
+              'constraints_type': ['<=', '<=', '<=', '>=']}
+EXAMPLE_GE_PERMUTED = {'c': [3.0000000000000004, 5], 'A': [[1, 1], [0, 2], [3, 2], [1, 0]], 'b': [-1, 12, 18, 4.0],
+                       'constraints_type': ['>=', '<=', '<=', '<=']}
+
+
+class ResultCacheTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def test_canonical_key(self):
+        self.assertEqual(CachedProblem(EXAMPLE_GE, 'bigm').key, CachedProblem(EXAMPLE_GE_PERMUTED, 'bigm').key)
+        self.assertNotEqual(CachedProblem(EXAMPLE_GE, 'bigm').key,
+                            CachedProblem(dict(EXAMPLE_GE, method='two_phase'), 'bigm').key)
+        self.assertNotEqual(CachedProblem(EXAMPLE_GE, 'bigm').key, CachedProblem(EXAMPLE_GE, 'graphical').key)
+        self.assertIsNone(CachedProblem.for_request(dict(EXAMPLE_GE, trace=True), 'bigm'))
+
+    def test_hit_under_row_permutation(self):
+        for method in ('bigm', 'revised', 'two_phase'):
+            stored = post_json(self.client, '/bigm/', dict(EXAMPLE_GE, method=method)).json()
+            self.assertNotIn('cached', stored)
+            with mock.patch.object(views, 'run_solver_async', side_effect=AssertionError('cache miss')):
+                hit = post_json(self.client, '/bigm/', dict(EXAMPLE_GE_PERMUTED, method=method)).json()
+            fresh = post_json(self.client, '/bigm/', dict(EXAMPLE_GE_PERMUTED, method=method, trace=True)).json()
+
+            # Base, var_types e duais na ordem de linhas de quem lê
+            self.assertTrue(hit['cached'])
+            for field in ('base', 'var_types'):
+                self.assertEqual(hit[field], fresh[field], f'{method}: {field}')
+            for field in ('solution', 'optimal_value', 'duals'):
+                np.testing.assert_allclose(hit[field], fresh[field], atol=1e-9, err_msg=f'{method}: {field}')
+
+    def test_run_fields_are_not_cached(self):
+        post_json(self.client, '/bigm/', EXAMPLE)
+        hit = post_json(self.client, '/bigm/', EXAMPLE).json()
+        self.assertTrue(hit['cached'])
+        self.assertNotIn('iterations', hit)
+        self.assertEqual(hit['pricing'], {'rule': 'dantzig'})
+
+    def test_limit_reached_is_not_cached(self):
+        limited = post_json(self.client, '/bigm/', dict(EXAMPLE, max_iterations=1)).json()
+        self.assertEqual(limited['status'], 'limit_reached')
+        response = post_json(self.client, '/bigm/', EXAMPLE).json()
+        self.assertEqual(response['status'], 'optimal')
+        self.assertNotIn('cached', response)
+
+
+class SingleFlightTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.problem = CachedProblem(EXAMPLE, 'bigm')
+        self.calls = 0
+
+    async def compute(self):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return solve_bigm_task(EXAMPLE)
+
+    async def test_identical_requests_share_one_solve(self):
+        responses = await asyncio.gather(*(solve_once(self.problem, self.compute) for _ in range(5)))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(sum('cached' not in response for response in responses), 1)
+        self.assertEqual({response['optimal_value'] for response in responses}, {36.0})
+
+        # Depois disso é o cache que responde
+        self.assertTrue((await solve_once(self.problem, self.compute))['cached'])
+        self.assertEqual(self.calls, 1)
+
+    async def test_failure_reaches_waiters_and_releases_the_lock(self):
+        async def failing():
+            self.calls += 1
+            await asyncio.sleep(0.05)
+            raise ValueError('falhou')
+
+        results = await asyncio.gather(*(solve_once(self.problem, failing) for _ in range(3)),
+                                       return_exceptions=True)
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertIsNone(await get_cache().aget(self.problem.key + LOCK_SUFFIX))
+
+        self.assertEqual((await solve_once(self.problem, self.compute))['optimal_value'], 36.0)
+
+    async def test_waits_for_another_process_holding_the_lock(self):
+        cache = get_cache()
+        await cache.aadd(self.problem.key + LOCK_SUFFIX, time.time(), 60)
+
+        async def other_process():
+            await asyncio.sleep(0.1)
+            await cache.aset(self.problem.key, self.problem.pack(solve_bigm_task(EXAMPLE)))
+            await cache.adelete(self.problem.key + LOCK_SUFFIX)
+
+        response, _ = await asyncio.gather(solve_once(self.problem, self.compute), other_process())
+        self.assertEqual(self.calls, 0)
+        self.assertTrue(response['cached'])
+
+    async def test_cancelled_leader_hands_over_to_a_waiter(self):
+        leader = asyncio.ensure_future(solve_once(self.problem, self.compute))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.ensure_future(solve_once(self.problem, self.compute))
+        await asyncio.sleep(0.01)
+        leader.cancel()  # o primeiro cliente desconectou
+
+        response = await waiter
+        self.assertEqual(response['optimal_value'], 36.0)
+        self.assertNotIn('cached', response)
+        self.assertEqual(self.calls, 2)
+        with self.assertRaises(asyncio.CancelledError):
+            await leader
+        self.assertIsNone(await get_cache().aget(self.problem.key + LOCK_SUFFIX))
+
+    async def test_cancelled_waiter_does_not_affect_the_others(self):
+        leader = asyncio.ensure_future(solve_once(self.problem, self.compute))
+        waiters = [asyncio.ensure_future(solve_once(self.problem, self.compute)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        waiters[0].cancel()
+
+        self.assertNotIn('cached', await leader)
+        self.assertTrue((await waiters[1])['cached'])
+        self.assertEqual(self.calls, 1)
+
+
+class GraphicalMethodTests(TestCase):
+    def test_matches_linprog(self):
+        rng = np.random.default_rng(11)
+        for _ in range(30):
+            c, A, b, constraints_type = random_lp(rng, rng.integers(1, 6), 2)
+            for sense in ('max', 'min'):
+                point, value = GraphicalMethod(c, A, b, sense=sense, constraints_type=constraints_type).solve()
+                expected = reference(c, A, b, constraints_type, sense)
+                self.assertAlmostEqual(value, expected, delta=1e-6 * max(1.0, abs(expected)))
+                self.assertAlmostEqual(float(c @ point), value)
+
+    def test_infeasible_and_unbounded(self):
+        with self.assertRaisesMessage(ValueError, 'inviável'):
+            GraphicalMethod([1, 1], [[1, 1], [1, 1]], [1, 3], constraints_type=['<=', '>=']).solve()
+        with self.assertRaisesMessage(ValueError, 'ilimitado'):
+            GraphicalMethod([1, 1], [[1, -1]], [1]).solve()
+        # Região ilimitada com ótimo finito
+        _, value = GraphicalMethod([1, 1], [[1, 1]], [2], sense='min', constraints_type=['>=']).solve()
+        self.assertAlmostEqual(value, 2.0)
+
+    def test_figure_is_drawn_lazily_and_once(self):
+        with mock.patch.object(GraphicalMethod, '_plot_solution', return_value='figura') as plot:
+            result = GraphicalMethod(**EXAMPLE).solve()
+            self.assertIsInstance(result, GraphicalResult)
+            plot.assert_not_called()
+            self.assertEqual(result.figure, 'figura')
+            self.assertEqual(result.figure, 'figura')
+        plot.assert_called_once()
+
+    def test_endpoint_enumerates_vertices_once_and_does_not_plot(self):
+        get_cache().clear()
+        find_vertices = GraphicalMethod._find_vertices
+        with mock.patch.object(GraphicalMethod, '_find_vertices', autospec=True, side_effect=find_vertices) as find, \
+                mock.patch.object(GraphicalMethod, '_plot_solution') as plot:
+            response = post_json(self.client, '/grafico/', EXAMPLE)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['solution_point'], [2.0, 6.0])
+        find.assert_called_once()
+        # O gráfico só é desenhado quando a URL dele é pedida
+        plot.assert_not_called()
+
+
+class PlotRendererTests(TestCase):
+    def test_options_are_validated(self):
+        self.assertEqual(plot_options(), DEFAULT_OPTIONS)
+        self.assertEqual(plot_options({'format': 'svg', 'width': 4})['width'], 4.0)
+        for options, message in (({'format': 'gif'}, 'Formato'), ({'width': 50}, 'Tamanho'),
+                                 ({'dpi': 5000}, 'DPI'), ({'quality': 0}, 'Qualidade')):
+            with self.assertRaisesMessage(ValueError, message):
+                plot_options(options)
+
+    def test_formats_and_size(self):
+        result = GraphicalMethod(**EXAMPLE).solve()
+        png, mime = result.render({'width': 4, 'height': 3, 'dpi': 50})
+        self.assertEqual(mime, 'image/png')
+        self.assertEqual(png[:8], b'\x89PNG\r\n\x1a\n')
+        # Largura e altura do cabeçalho IHDR, em pixels
+        self.assertEqual((int.from_bytes(png[16:20], 'big'), int.from_bytes(png[20:24], 'big')), (200, 150))
+
+        svg, mime = result.render({'format': 'svg', 'width': 4, 'height': 3})
+        self.assertEqual(mime, 'image/svg+xml')
+        self.assertIn(b'<svg', svg[:500])
+
+        webp, mime = result.render({'format': 'webp', 'width': 4, 'height': 3, 'dpi': 50})
+        self.assertEqual((mime, webp[:4], webp[8:12]), ('image/webp', b'RIFF', b'WEBP'))
+
+    def test_figures_are_released(self):
+        figures = []
+
+        def draw(figure):
+            figures.append(figure)
+            figure.subplots().plot([0, 1], [0, 1])
+
+        render_plot(draw, {'width': 2, 'height': 2, 'dpi': 20})
+        # A figura não passa pelo pyplot e sai da renderização sem artistas
+        self.assertEqual(figures[0].axes, [])
+        self.assertEqual(plt.get_fignums(), [])
+
+
+class PlotEndpointTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def test_content_addressed_plot(self):
+        payload = dict(EXAMPLE, plot={'width': 4, 'height': 3, 'dpi': 40})
+        body = post_json(self.client, '/grafico/', payload).json()
+        self.assertNotIn('plot_image', body)
+        self.assertTrue(body['plot_url'].endswith('.png'))
+        self.assertEqual(post_json(self.client, '/grafico/', payload).json()['plot_url'], body['plot_url'])
+        other = post_json(self.client, '/grafico/', dict(payload, plot={'format': 'svg'})).json()
+        self.assertNotEqual(other['plot_url'], body['plot_url'])
+
+        with mock.patch.object(views, 'render_plot_task', side_effect=render_plot_task) as render:
+            first = self.client.get(body['plot_url'])
+            second = self.client.get(body['plot_url'])
+        render.assert_called_once()
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first['Content-Type'], 'image/png')
+        self.assertIn('immutable', first['Cache-Control'])
+        self.assertEqual(first.content, second.content)
+
+        revalidated = self.client.get(body['plot_url'], headers={'If-None-Match': first['ETag']})
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_unknown_plot(self):
+        body = post_json(self.client, '/grafico/', EXAMPLE).json()
+        self.assertEqual(self.client.get(body['plot_url'].replace('.png', '.svg')).status_code, 404)
+        self.assertEqual(self.client.get('/plots/' + '0' * 64 + '.png').status_code, 404)
+
+    def test_inline_plot(self):
+        body = post_json(self.client, '/grafico/', dict(EXAMPLE, plot_inline=True)).json()
+        self.assertNotIn('plot_url', body)
+        self.assertEqual(body['plot_mime'], 'image/png')
+        self.assertTrue(body['plot_image'].startswith('iVBORw0KGgo'))
+
+
+class GeometryModeTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def test_geometry_response(self):
+        body = post_json(self.client, '/grafico/', dict(EXAMPLE, mode='geometry')).json()
+        self.assertNotIn('plot_url', body)
+        self.assertNotIn('plot_image', body)
+        geometry = body['geometry']
+
+        self.assertEqual(geometry['optimum'], [2.0, 6.0])
+        polygon = np.array(geometry['polygon'])
+        self.assertEqual(sorted(map(tuple, polygon)), [(0, 0), (0, 6), (2, 6), (4, 0), (4, 3)])
+        # Anti-horário: área com sinal positiva
+        x, y = polygon[:, 0], polygon[:, 1]
+        self.assertGreater(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)), 0)
+
+        xmin, xmax, ymin, ymax = geometry['box']
+        for constraint in geometry['constraints']:
+            for px, py in constraint['segment']:
+                self.assertTrue(xmin - 1e-9 <= px <= xmax + 1e-9 and ymin - 1e-9 <= py <= ymax + 1e-9)
+        self.assertEqual([line['optimal'] for line in geometry['objective_lines']], [False, False, False, True])
+        self.assertAlmostEqual(geometry['objective_lines'][-1]['value'], 36.0)
+
+    def test_geometry_and_plot_are_cached_apart(self):
+        post_json(self.client, '/grafico/', EXAMPLE)
+        body = post_json(self.client, '/grafico/', dict(EXAMPLE, mode='geometry')).json()
+        self.assertNotIn('cached', body)
+        self.assertIn('geometry', body)
+
+    def test_permuted_rows_are_not_shared(self):
+        post_json(self.client, '/grafico/', dict(EXAMPLE, mode='geometry'))
+        permuted = dict(EXAMPLE, A=[[3, 2], [1, 0], [0, 2]], b=[18, 4, 12], mode='geometry')
+        body = post_json(self.client, '/grafico/', permuted).json()
+        # Índices e rótulos seguem a ordem de linhas desta requisição
+        self.assertNotIn('cached', body)
+        self.assertEqual(body['geometry']['constraints'][0]['label'], 'R1: 3.0x₁ + 2.0x₂ <= 18.0')
+
+        hit = post_json(self.client, '/grafico/', permuted).json()
+        self.assertTrue(hit['cached'])
+        self.assertEqual(hit['geometry'], body['geometry'])
+
+
+class HalfPlaneIntersectionTests(TestCase):
+    def assertSameVertices(self, first, second):
+        self.assertEqual(len(first), len(second))
+        np.testing.assert_allclose(sorted(map(tuple, first)), sorted(map(tuple, second)), atol=1e-7)
+
+    def test_matches_pairwise_enumeration(self):
+        rng = np.random.default_rng(12)
+        for _ in range(50):
+            m = rng.integers(1, 12)
+            A = rng.normal(size=(m, 2))
+            b = np.abs(rng.normal(size=m)) + (A @ (rng.random(2) * 3))
+            self.assertSameVertices(intersect_half_planes(A, b), enumerate_vertices(A, b))
+
+    def test_empty_and_unbounded_regions(self):
+        self.assertEqual(intersect_half_planes([[1, 1], [-1, -1]], [1, -3]), [])
+        self.assertIsNone(recession_interval([[1, 1]]))
+        low, high = recession_interval([[1, -1]])
+        np.testing.assert_allclose(low, [0.5, 0.5])
+        np.testing.assert_allclose(high, [0.0, 1.0])
+        # Região ilimitada: só os vértices de verdade, sem os da caixa interna
+        self.assertSameVertices(intersect_half_planes([[1, -1]], [1]), [(0, 0), (1, 0)])
+
+    def test_many_constraints_match_linprog(self):
+        # Polígono com 200 lados tangentes ao círculo de raio 10 (caminho de semiplanos)
+        angles = np.linspace(0, np.pi / 2, 200)
+        A = np.column_stack([np.cos(angles), np.sin(angles)])
+        b = np.full(200, 10.0)
+        solver = GraphicalMethod([3, 4], A, b)
+        self.assertGreater(solver.m, GraphicalMethod.PAIRWISE_MAX_ROWS)
+        _, value = solver.solve()
+        self.assertAlmostEqual(value, reference([3, 4], A, b, ['<='] * 200), places=6)
+
+
+def brute_force_vertices(A, b, tolerance=1e-9):
+    """Referência: todos os pares de retas resolvidos um a um, com o teste de factibilidade em laço"""
+    L = np.vstack([A, [[-1.0, 0.0], [0.0, -1.0]]])
+    B = np.concatenate([b, [0.0, 0.0]])
+    points = []
+    for i in range(len(B)):
+        for j in range(i + 1, len(B)):
+            M = L[[i, j]]
+            if abs(np.linalg.det(M)) < 1e-12:
+                continue
+            point = np.linalg.solve(M, B[[i, j]])
+            if np.all(L @ point <= B + tolerance * np.maximum(1.0, np.abs(B))):
+                point = np.maximum(point, 0.0) + 0.0
+                if not any(np.allclose(point, q, atol=1e-8) for q in points):
+                    points.append(point)
+    return points
+
+
+class VertexEnumerationTests(TestCase):
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(19)
+        for _ in range(30):
+            m = rng.integers(1, 10)
+            A = rng.integers(-5, 6, size=(m, 2)).astype(float)
+            b = rng.integers(1, 20, size=m).astype(float)
+            found = enumerate_vertices(A, b)
+            expected = brute_force_vertices(A, b)
+            self.assertEqual(len(found), len(expected))
+            np.testing.assert_allclose(sorted(map(tuple, found)), sorted(map(tuple, expected)), atol=1e-7)
+
+    def test_degenerate_vertex_reported_once(self):
+        # Três retas passando por (2, 2) e duas retas paralelas
+        A = np.array([[1.0, 1.0], [1.0, 0.0], [0.0, 1.0], [2.0, 2.0]])
+        b = np.array([4.0, 2.0, 2.0, 8.0])
+        vertices = enumerate_vertices(A, b)
+        np.testing.assert_allclose(sorted(vertices), [(0, 0), (0, 2), (2, 0), (2, 2)], atol=1e-12)
+
+    def test_dedupe_points_across_cell_boundaries(self):
+        tolerance = 1e-8
+        points = [(0.0, 0.0), (-tolerance / 4, tolerance / 4), (1.0, 1.0), (1.0 + tolerance / 2, 1.0), (1.0, 1.0 + 3 * tolerance)]
+        self.assertEqual(dedupe_points(points, tolerance), [(0.0, 0.0), (1.0, 1.0), (1.0, 1.0 + 3 * tolerance)])
+        self.assertEqual(dedupe_points([]), [])
+
+    def test_graphical_method_matches_linprog(self):
+        rng = np.random.default_rng(190)
+        for _ in range(20):
+            c, A, b, constraints_type = random_lp(rng, rng.integers(2, 8), 2)
+            for sense in ('max', 'min'):
+                _, value = GraphicalMethod(c, A, b, sense=sense, constraints_type=constraints_type).solve()
+                self.assertAlmostEqual(value, reference(c, A, b, constraints_type, sense), places=6)
+
+
+def upper_form(rows):
+    """Linhas {'a', 'type', 'b'} reescritas como semiplanos a·x <= b"""
+    A, b = [], []
+    for row in rows:
+        if row['type'] in ('<=', '='):
+            A.append(row['a'])
+            b.append(row['b'])
+        if row['type'] in ('>=', '='):
+            A.append([-v for v in row['a']])
+            b.append(-row['b'])
+    return np.array(A, dtype=float).reshape(-1, 2), np.array(b, dtype=float)
+
+
+class GraphicalSessionTests(TestCase):
+    def assertSameRegion(self, session):
+        expected = enumerate_vertices(*upper_form(session.rows))
+        found = session.vertices()
+        self.assertEqual(len(found), len(expected))
+        np.testing.assert_allclose(sorted(found), sorted(map(tuple, expected)), atol=1e-6)
+
+    def test_random_edits_match_a_fresh_enumeration(self):
+        rng = np.random.default_rng(20)
+        session = GraphicalSession([3, 5], EXAMPLE['A'], EXAMPLE['b'])
+        for _ in range(60):
+            op = rng.choice(['add_constraint', 'remove_constraint', 'set_constraint'])
+            a = rng.integers(-3, 6, size=2).tolist()
+            edit = {'op': str(op), 'a': a, 'type': str(rng.choice(['<=', '>='], p=[0.8, 0.2])),
+                    'b': float(rng.integers(1, 30))}
+            if op != 'add_constraint':
+                if not session.rows:
+                    continue
+                edit['index'] = int(rng.integers(len(session.rows)))
+            session.apply(edit)
+            self.assertSameRegion(session)
+
+    def test_optimum_after_edits(self):
+        session = GraphicalSession([3, 5], EXAMPLE['A'], EXAMPLE['b'])
+        self.assertAlmostEqual(session.result()['optimal_value'], 36.0)
+
+        # Restrição que não forma aresta: nada a recalcular
+        session.apply({'op': 'add_constraint', 'a': [1, 1], 'type': '<=', 'b': 50})
+        session.apply({'op': 'remove_constraint', 'index': 3})
+        self.assertEqual(session.update, 'unchanged')
+
+        session.apply({'op': 'set_constraint', 'index': 2, 'a': [3, 2], 'type': '<=', 'b': 12})
+        result = session.result()
+        self.assertAlmostEqual(result['optimal_value'], 30.0)
+        np.testing.assert_allclose(result['solution_point'], [0, 6], atol=1e-9)
+
+        session.apply({'op': 'remove_constraint', 'index': 2})
+        self.assertEqual(session.update, 'local')
+        self.assertAlmostEqual(session.result()['optimal_value'], 3 * 4 + 5 * 6)
+        self.assertSameRegion(session)
+
+    def test_invalid_edits(self):
+        session = GraphicalSession([3, 5], EXAMPLE['A'], EXAMPLE['b'])
+        with self.assertRaisesMessage(ValueError, 'Tipo de restrição inválido'):
+            session.apply({'op': 'add_constraint', 'a': [1, 1], 'type': '<', 'b': 1})
+        with self.assertRaisesMessage(ValueError, 'Edição desconhecida'):
+            session.apply({'op': 'set_rhs'})
+        session.apply({'op': 'add_constraint', 'a': [1, 1], 'type': '>=', 'b': 100})
+        with self.assertRaisesMessage(ValueError, 'inviável'):
+            session.result()
+
+    def test_endpoints(self):
+        created = post_json(self.client, '/grafico/session/', EXAMPLE)
+        self.assertEqual(created.status_code, 200)
+        session_id = created.json()['session_id']
+        self.assertAlmostEqual(created.json()['optimal_value'], 36.0)
+
+        response = post_json(self.client, f'/grafico/session/{session_id}/',
+                             {'edits': [{'op': 'set_constraint', 'index': 2, 'a': [3, 2], 'type': '<=', 'b': 12}]})
+        self.assertEqual(response.status_code, 200)
+        self.assertAlmostEqual(response.json()['optimal_value'], 30.0)
+        self.assertIn('geometry', response.json())
+
+        # Uma sessão do Big M não vale no endpoint gráfico (nem o contrário)
+        bigm_id = post_json(self.client, '/bigm/session/', EXAMPLE).json()['session_id']
+        self.assertEqual(post_json(self.client, f'/grafico/session/{bigm_id}/', {'edits': []}).status_code, 404)
+        self.assertEqual(post_json(self.client, f'/bigm/session/{session_id}/', {'edits': []}).status_code, 404)
+
+        # Edição que esvazia a região: 400 e a sessão fica como estava
+        response = post_json(self.client, f'/grafico/session/{session_id}/',
+                             {'edits': [{'op': 'add_constraint', 'a': [1, 1], 'type': '>=', 'b': 100}]})
+        self.assertEqual(response.status_code, 400)
+        response = post_json(self.client, f'/grafico/session/{session_id}/', {'edits': []})
+        self.assertAlmostEqual(response.json()['optimal_value'], 30.0)
+
+        self.assertEqual(self.client.delete(f'/grafico/session/{session_id}/').status_code, 200)
+        self.assertEqual(post_json(self.client, f'/grafico/session/{session_id}/', {'edits': []}).status_code, 404)
+
+
+def assertDualCertificate(test, c, A, b, constraints_type, sense, duals, value, tolerance=1e-6):
+    """Duais factíveis para o dual do modelo e b·y igual ao ótimo (dualidade forte)"""
+    A, duals = np.asarray(A, dtype=float), np.asarray(duals, dtype=float)
+    sign = -1.0 if sense == 'min' else 1.0
+    y = sign * duals  # duais do modelo de maximização equivalente
+    test.assertTrue(np.all(A.T @ y >= sign * np.asarray(c, dtype=float) - tolerance))
+    for y_i, constraint_type in zip(y, constraints_type):
+        if constraint_type == '<=':
+            test.assertGreaterEqual(y_i, -tolerance)
+        elif constraint_type == '>=':
+            test.assertLessEqual(y_i, tolerance)
+    test.assertAlmostEqual(float(np.asarray(b, dtype=float) @ duals), value, delta=tolerance * max(1.0, abs(value)))
+
+
+class PresolveTests(TestCase):
+    # Uma linha de cada redução: vazia, singleton, variável fixa, linha dominada e duplicada
+    STRUCTURED = {
+        'c': [3, 5, 1, 0],
+        'A': [[1, 0, 0, 0], [0, 2, 0, 0], [3, 2, 0, 0], [0, 0, 0, 0], [0, 0, 1, 0],
+              [1, 1, 1, 0], [6, 4, 0, 0]],
+        'b': [4, 12, 18, 0, 2, 100, 40],
+        'constraints_type': ['<=', '<=', '<=', '<=', '=', '<=', '<='],
+    }
+
+    def test_structured_model_is_reduced(self):
+        data = self.STRUCTURED
+        reduction = Presolve(data['c'], np.array(data['A'], dtype=float), data['b'],
+                             constraints_type=data['constraints_type'])
+        stats = reduction.stats()
+        self.assertLess(stats['reduced_rows'], stats['rows'])
+        self.assertLess(stats['reduced_cols'], stats['cols'])
+        for name in ('empty_rows', 'singleton_rows', 'fixed_cols', 'empty_cols', 'dominated_rows', 'duplicate_rows'):
+            self.assertGreater(stats['removed'][name], 0, name)
+
+        # O simplex padrão só aceita <=: a igualdade x3 = 2 vira x3 <= 2 (o ótimo é o mesmo)
+        standard = dict(data, constraints_type=['<='] * len(data['b']))
+        for solver_class, data in ((SimplexBigM, data), (SimplexStandard, standard)):
+            solver = solver_class(data['c'], data['A'], data['b'], constraints_type=data['constraints_type'],
+                                  presolve=True)
+            solution, value = solver.solve()
+            self.assertAlmostEqual(value, 38.0)
+            np.testing.assert_allclose(solution[:3], [2, 6, 2], atol=1e-9)
+            assertDualCertificate(self, data['c'], data['A'], data['b'], data['constraints_type'], 'max',
+                                  solver.duals, value)
+
+    def test_random_models_match_linprog(self):
+        rng = np.random.default_rng(21)
+        for k in range(30):
+            c, A, b, constraints_type = random_lp(rng, rng.integers(2, 8), rng.integers(2, 6))
+            # Linhas singleton e repetidas para o presolve ter o que fazer
+            j = rng.integers(A.shape[1])
+            singleton = np.zeros(A.shape[1])
+            singleton[j] = 1.0
+            A = np.vstack([A, singleton, 2 * A[0]])
+            b = np.append(b, [10.0, 2 * b[0]])
+            constraints_type = constraints_type + ['<=', constraints_type[0]]
+            sense = 'min' if k % 2 else 'max'
+            expected = reference(c, A, b, constraints_type, sense)
+            solver = SimplexBigM(c, A, b, sense=sense, constraints_type=constraints_type, presolve=True)
+            solution, value = solver.solve()
+            self.assertAlmostEqual(value, expected, delta=1e-6 * max(1.0, abs(expected)))
+            assertDualCertificate(self, c, A, b, constraints_type, sense, solver.duals, value)
+
+    def test_duals_without_presolve(self):
+        solver = SimplexBigM(**EXAMPLE)
+        solver.solve()
+        np.testing.assert_allclose(solver.duals, [0.0, 1.5, 1.0], atol=1e-12)
+
+    def test_infeasible_and_invalid(self):
+        with self.assertRaisesMessage(ValueError, 'infactível'):
+            SimplexBigM([1, 1], [[1, 0], [1, 0]], [2, 3], constraints_type=['<=', '>='], presolve=True).solve()
+        with self.assertRaisesMessage(ValueError, 'presolve'):
+            SimplexBigM(**EXAMPLE, base=[2, 1, 0], presolve=True)
+
+    def test_endpoint(self):
+        response = post_json(self.client, '/bigm/', dict(self.STRUCTURED, presolve=True))
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertAlmostEqual(body['optimal_value'], 38.0)
+        self.assertEqual(len(body['duals']), len(self.STRUCTURED['b']))
+        self.assertEqual(body['presolve']['rows'], len(self.STRUCTURED['b']))
+
+
+def badly_scaled_lp(rng, m, n):
+    """random_lp com linhas e colunas multiplicadas por potências de 10 de ordens bem diferentes"""
+    c, A, b, constraints_type = random_lp(rng, m, n)
+    rows, cols = 10.0 ** rng.integers(-4, 5, size=len(b)), 10.0 ** rng.integers(-3, 4, size=n)
+    # Troca de variável x = cols·x'' e linhas multiplicadas: o valor ótimo não muda
+    return c * cols, A * rows[:, None] * cols[None, :], b * rows, constraints_type
+
+
+class ScalingTests(TestCase):
+    def test_factors_are_powers_of_two(self):
+        rng = np.random.default_rng(22)
+        _, A, _, _ = badly_scaled_lp(rng, 6, 4)
+        scaling = Scaling.for_matrix(A)
+        self.assertTrue(scaling.active)
+        for factors in (scaling.rows, scaling.cols):
+            np.testing.assert_array_equal(np.log2(factors), np.round(np.log2(factors)))
+        self.assertLess(scaling.scaled_ratio, scaling.ratio)
+
+        # Esparsa dá os mesmos fatores; matriz equilibrada não é escalada
+        sparse = Scaling.for_matrix(sp.csr_matrix(A))
+        np.testing.assert_array_equal(sparse.rows, scaling.rows)
+        np.testing.assert_array_equal(sparse.cols, scaling.cols)
+        self.assertFalse(Scaling.for_matrix(np.array(EXAMPLE['A'], dtype=float)).active)
+
+    def test_scaled_and_unscaled_solves_agree(self):
+        rng = np.random.default_rng(220)
+        for k in range(20):
+            c, A, b, constraints_type = badly_scaled_lp(rng, rng.integers(2, 7), rng.integers(2, 5))
+            sense = 'min' if k % 2 else 'max'
+            expected = reference(c, A, b, constraints_type, sense)
+            for method in ('bigm', 'revised', 'two_phase'):
+                solver = SimplexBigM(c, A, b, sense=sense, constraints_type=constraints_type, method=method)
+                solution, value = solver.solve()
+                self.assertAlmostEqual(value, expected, delta=1e-6 * max(1.0, abs(expected)))
+                assertDualCertificate(self, c, A, b, constraints_type, sense, solver.duals, value)
+
+    def test_standard_simplex(self):
+        c, A, b = [3e3, 5e-2], [[1e-2, 0], [0, 2e3], [3e-2, 2e3]], [4e-2, 12e3, 18e-2 + 12e3]
+        scaled = SimplexStandard(c, A, b)
+        unscaled = SimplexStandard(c, A, b, scaling=False)
+        self.assertTrue(scaled.scaling.active)
+        self.assertFalse(unscaled.scaling.active)
+        value = scaled.solve()[1]
+        self.assertAlmostEqual(value, unscaled.solve()[1])
+        self.assertAlmostEqual(value, reference(c, A, b, ['<='] * 3), places=6)
+
+    def test_endpoint_reports_scaling(self):
+        rng = np.random.default_rng(221)
+        c, A, b, constraints_type = badly_scaled_lp(rng, 4, 3)
+        payload = {'c': c.tolist(), 'A': A.tolist(), 'b': b.tolist(), 'constraints_type': constraints_type}
+        body = post_json(self.client, '/bigm/', payload).json()
+        self.assertTrue(body['scaling']['active'])
+        self.assertNotIn('scaling', post_json(self.client, '/bigm/', dict(payload, scaling=False)).json())
+
+
+class PricingTests(TestCase):
+    def test_every_rule_reaches_the_optimum(self):
+        rng = np.random.default_rng(23)
+        problems = [random_lp(rng, rng.integers(3, 9), rng.integers(3, 8)) for _ in range(8)]
+        for rule in PRICING_RULES:
+            for method in ('bigm', 'revised', 'two_phase'):
+                for k, (c, A, b, constraints_type) in enumerate(problems):
+                    sense = 'min' if k % 2 else 'max'
+                    solver = SimplexBigM(c, A, b, sense=sense, constraints_type=constraints_type, method=method,
+                                         pricing=rule)
+                    expected = reference(c, A, b, constraints_type, sense)
+                    self.assertAlmostEqual(solver.solve()[1], expected, delta=1e-6 * max(1.0, abs(expected)),
+                                           msg=f'{rule} / {method}')
+            self.assertAlmostEqual(SimplexStandard(EXAMPLE['c'], EXAMPLE['A'], EXAMPLE['b'], pricing=rule).solve()[1], 36.0)
+
+    def test_unknown_rule(self):
+        self.assertEqual(make_pricing(None).name, 'dantzig')
+        with self.assertRaisesMessage(ValueError, 'Regra de precificação desconhecida'):
+            SimplexBigM(**EXAMPLE, pricing='random')
+        response = post_json(self.client, '/bigm/', dict(EXAMPLE, pricing='random'))
+        self.assertEqual(response.status_code, 400)
+
+    def test_endpoint_reports_the_rule(self):
+        body = post_json(self.client, '/bigm/', dict(EXAMPLE, pricing='steepest_edge')).json()
+        self.assertAlmostEqual(body['optimal_value'], 36.0)
+        self.assertEqual(body['pricing']['rule'], 'steepest_edge')
+        self.assertGreater(body['pricing']['iterations'], 0)
+
+
+# Exemplo de Beale: cicla com a regra de Dantzig sem desempate
+BEALE = {'c': [0.75, -20, 0.5, -6], 'A': [[0.25, -8, -1, 9], [0.5, -12, -0.5, 3], [0, 0, 1, 0]], 'b': [0, 0, 1]}
+
+
+class SolveLimitsTests(TestCase):
+    def test_cycling_example_terminates(self):
+        for method in ('bigm', 'revised', 'two_phase'):
+            sink = ListSink()
+            solver = SimplexBigM(**BEALE, method=method, trace=sink)
+            self.assertAlmostEqual(solver.solve()[1], 1.25)
+            self.assertEqual(sum(event['event'] == 'stall' for event in sink.events), 1, method)
+
+        sink = ListSink()
+        self.assertAlmostEqual(SimplexStandard(**BEALE, trace=sink).solve()[1], 1.25)
+        self.assertIn('stall', [event['event'] for event in sink.events])
+
+        for result in solve_batch([BEALE, BEALE]):
+            self.assertEqual(result['status'], 'optimal')
+            self.assertAlmostEqual(result['optimal_value'], 1.25)
+
+    def test_iteration_limit_returns_a_resumable_base(self):
+        rng = np.random.default_rng(24)
+        c, A, b, constraints_type = random_lp(rng, 30, 25)
+        expected = reference(c, A, b, constraints_type)
+        for method in ('bigm', 'revised', 'two_phase'):
+            solver = SimplexBigM(c, A, b, constraints_type=constraints_type, method=method, max_iterations=5)
+            with self.assertRaises(LimitReached) as raised:
+                solver.solve()
+            self.assertEqual(raised.exception.reason, 'iterations')
+            partial = raised.exception.partial
+            self.assertEqual(len(partial['base']), len(b))
+            if partial['feasible']:
+                self.assertLessEqual(partial['objective'], expected + 1e-6)
+
+            resumed = SimplexBigM(c, A, b, constraints_type=constraints_type, method=method, base=partial['base'])
+            self.assertAlmostEqual(resumed.solve()[1], expected, delta=1e-6 * max(1.0, abs(expected)))
+
+        with self.assertRaises(LimitReached) as raised:
+            SimplexStandard(c=[3, 5], A=EXAMPLE['A'], b=EXAMPLE['b'], max_iterations=1).solve()
+        self.assertTrue(raised.exception.partial['feasible'])
+
+    def test_time_limit(self):
+        with self.assertRaises(LimitReached) as raised:
+            SimplexBigM(**EXAMPLE, time_limit=0).solve()
+        self.assertEqual(raised.exception.reason, 'time')
+        self.assertIn('Limite de tempo', str(raised.exception))
+
+    def test_endpoint_status(self):
+        get_cache().clear()
+        body = post_json(self.client, '/bigm/', dict(EXAMPLE, max_iterations=1)).json()
+        self.assertEqual((body['status'], body['reason'], body['iterations']), ('limit_reached', 'iterations', 1))
+        self.assertIn('base', body)
+
+        # O limite do servidor vale mesmo se o payload pedir mais
+        with override_settings(SOLVER_MAX_ITERATIONS=1):
+            body = post_json(self.client, '/bigm/', dict(EXAMPLE, max_iterations=100)).json()
+        self.assertEqual(body['status'], 'limit_reached')
+
+        # Paradas por limite não vão para o cache: sem limite o modelo é resolvido de verdade
+        body = post_json(self.client, '/bigm/', EXAMPLE).json()
+        self.assertEqual(body['status'], 'optimal')
+        self.assertNotIn('cached', body)
+
+    def test_batch_limits(self):
+        results = solve_batch([EXAMPLE, BEALE, dict(EXAMPLE, c=[1])], max_iterations=1)
+        self.assertEqual([result['status'] for result in results], ['limit_reached', 'limit_reached', 'error'])
+        self.assertEqual(results[0]['reason'], 'iterations')
+        self.assertTrue(results[0]['feasible'])
+
+        # O prazo conta do início do lote
+        for result in solve_batch([EXAMPLE, BEALE], time_limit=0):
+            self.assertEqual((result['status'], result['reason']), ('limit_reached', 'time'))
+
+        response = post_json(self.client, '/bigm/batch/', {'problems': [EXAMPLE, BEALE], 'max_iterations': 1})
+        self.assertEqual([result['status'] for result in response.json()['results']], ['limit_reached'] * 2)
+
+
+def random_bounds(rng, n):
+    """Limites variados: padrão, intervalo, só superior (espelhada) e fixa; None onde não há"""
+    pairs = []
+    for kind in rng.integers(0, 4, size=n):
+        value = float(rng.integers(0, 4))
+        if kind == 0:
+            pairs.append((0.0, None))
+        elif kind == 1:
+            pairs.append((value - 1.0, value + float(rng.integers(1, 4))))
+        elif kind == 2:
+            pairs.append((None, value + 2.0))
+        else:
+            pairs.append((value, value))
+    lower, upper = zip(*pairs)
+    return list(lower), list(upper)
+
+
+def reference_bounded(c, A, b, constraints_type, sense, lower, upper):
+    """Ótimo do HiGHS com os limites passados em `bounds`; None se infactível, inf se ilimitado"""
+    A, b, types = np.asarray(A, dtype=float), np.asarray(b, dtype=float), np.array(constraints_type)
+    sign = -1.0 if sense == 'max' else 1.0
+    A_ub = np.vstack([A[types == '<='], -A[types == '>=']])
+    b_ub = np.concatenate([b[types == '<='], -b[types == '>=']])
+    result = linprog(sign * np.asarray(c, dtype=float), A_ub=A_ub if len(b_ub) else None,
+                     b_ub=b_ub if len(b_ub) else None, A_eq=A[types == '='] if np.any(types == '=') else None,
+                     b_eq=b[types == '='] if np.any(types == '=') else None, bounds=list(zip(lower, upper)),
+                     method='highs')
+    if result.status == 2:
+        return None
+    if result.status == 3:
+        return np.inf
+    return sign * result.fun
+
+
+class BoundsTests(TestCase):
+    def test_random_models_match_linprog(self):
+        rng = np.random.default_rng(25)
+        checked = 0
+        for k in range(40):
+            c, A, b, constraints_type = random_lp(rng, rng.integers(2, 7), rng.integers(2, 6))
+            lower, upper = random_bounds(rng, len(c))
+            sense = 'min' if k % 2 else 'max'
+            expected = reference_bounded(c, A, b, constraints_type, sense, lower, upper)
+            for method in ('bigm', 'revised', 'two_phase'):
+                solver = SimplexBigM(c, A, b, sense=sense, constraints_type=constraints_type, method=method,
+                                     lower=lower, upper=upper)
+                if expected is None or np.isinf(expected):
+                    with self.assertRaisesMessage(ValueError, 'nfactível' if expected is None else 'ilimitado'):
+                        solver.solve()
+                    continue
+                solution, value = solver.solve()
+                self.assertAlmostEqual(value, expected, delta=1e-6 * max(1.0, abs(expected)))
+                for x, l, u in zip(solution, lower, upper):
+                    self.assertTrue((l is None or x >= l - 1e-9) and (u is None or x <= u + 1e-9))
+                checked += 1
+        self.assertGreater(checked, 30)
+
+    def test_warm_start_with_variables_at_upper(self):
+        c, A, b = [3, 5], [[3, 2]], [18]
+        solver = SimplexBigM(c, A, b, upper=[4, 3])
+        solution, value = solver.solve()
+        self.assertAlmostEqual(value, 3 * 4 + 5 * 3)
+        self.assertTrue(solver.at_upper)
+
+        warm = SimplexBigM(c, A, [20], upper=[4, 3], base=solver.base, at_upper=solver.at_upper)
+        self.assertAlmostEqual(warm.solve()[1], 27.0)
+        self.assertTrue(warm.warm_started)
+
+    def test_standard_simplex_and_batch(self):
+        lower, upper = [1, None], [3, 5]
+        expected = reference_bounded(EXAMPLE['c'], EXAMPLE['A'], EXAMPLE['b'], ['<='] * 3, 'max', lower, upper)
+        self.assertAlmostEqual(SimplexStandard(**EXAMPLE, lower=lower, upper=upper).solve()[1], expected)
+        result = solve_batch([dict(EXAMPLE, lower=lower, upper=upper)])[0]
+        self.assertAlmostEqual(result['optimal_value'], expected)
+
+    def test_invalid_bounds(self):
+        with self.assertRaisesMessage(ValueError, 'Variável livre x_2'):
+            Bounds(2, lower=[0, None], upper=[1, None])
+        with self.assertRaisesMessage(ValueError, 'limites inconsistentes na variável x_1'):
+            Bounds(2, lower=[2, 0], upper=[1, None])
+        with self.assertRaisesMessage(ValueError, 'Limite inválido na variável x_1'):
+            Bounds(1, lower=[float('inf')])
+        with self.assertRaisesMessage(ValueError, 'Dimensões incompatíveis'):
+            Bounds(2, upper=[1])
+        self.assertFalse(Bounds(2).active)
+
+    def test_endpoint(self):
+        body = post_json(self.client, '/bigm/', dict(EXAMPLE, lower=[1, None], upper=[3, 5])).json()
+        # x2 = 5 no limite superior e 3x1 + 2x2 <= 18 limita x1 a 8/3
+        self.assertAlmostEqual(body['optimal_value'], 33.0)
+        self.assertEqual(body['bounds'], {'bounded': 1, 'shifted': 2, 'mirrored': 1})
+        self.assertIn('at_upper', body)
+        response = post_json(self.client, '/bigm/', dict(EXAMPLE, lower=[None, 0], upper=[None, 1]))
+        self.assertEqual(response.status_code, 400)
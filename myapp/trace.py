@@ -0,0 +1,243 @@
+import sys
+
+import numpy as np
+
+
+class TraceSink:
+    """Destino dos eventos estruturados emitidos pelos solvers
+
+    Os solvers recebem `trace=None` por padrão e, nesse caso, não montam
+    nenhum evento nem formatam texto algum. Com um sink, cada passo vira um
+    dict como {'event': 'iteration', 'iteration': 3, 'entering': 1, ...};
+    instantâneos do tableau só são anexados se `snapshots` for True.
+    """
+
+    snapshots = False
+
+    def emit(self, event):
+        raise NotImplementedError
+
+
+class ListSink(TraceSink):
+    """Acumula os eventos em memória (um sink por solve, seguro entre threads)"""
+
+    def __init__(self, snapshots=False):
+        self.snapshots = snapshots
+        self.events = []
+
+    def emit(self, event):
+        self.events.append(event)
+
+
+class CallbackSink(TraceSink):
+    """Repassa cada evento para uma função (p.ex. para transmiti-lo ao cliente)"""
+
+    def __init__(self, callback, snapshots=False):
+        self.callback = callback
+        self.snapshots = snapshots
+
+    def emit(self, event):
+        self.callback(event)
+
+
+class PrintSink(TraceSink):
+    """Escreve cada evento como texto, no formato do log tradicional"""
+
+    def __init__(self, stream=None, snapshots=True):
+        self.stream = stream
+        self.snapshots = snapshots
+
+    def emit(self, event):
+        text = format_event(event)
+        if text is not None:
+            print(text, file=self.stream or sys.stdout)
+
+
+def request_sink(data):
+    """Sink para um payload JSON: "trace": true devolve os eventos e "log": true o texto
+
+    Sem nenhum dos dois o solver roda sem rastreamento. Instantâneos do tableau
+    acompanham o log por padrão e podem ser controlados com "snapshots".
+    """
+    if not (data.get('trace') or data.get('log')):
+        return None
+    return ListSink(snapshots=bool(data.get('snapshots', data.get('log', False))))
+
+
+def trace_response(data, sink):
+    """Campos 'trace' e/ou 'log' da resposta, conforme pedidos no payload"""
+    if sink is None:
+        return {}
+    response = {}
+    if data.get('trace'):
+        response['trace'] = sink.events
+    if data.get('log'):
+        response['log'] = format_trace(sink.events)
+    return response
+
+
+def tableau_snapshot(engine, initial=False):
+    """Evento 'snapshot' com o estado atual do engine (tableau ou apenas a base)"""
+    event = {
+        'event': 'snapshot',
+        'initial': initial,
+        'base': [int(v) for v in engine.base],
+        'rhs': engine.b.tolist(),
+        'objective': engine.objective_value(),
+    }
+    if engine.at_upper.any():
+        event['at_upper'] = np.flatnonzero(engine.at_upper).tolist()
+    if hasattr(engine, 'tableau'):
+        event['tableau'] = engine.tableau.tolist()
+        event['reduced_costs'] = engine.reduced_costs().tolist()
+    return event
+
+
+def format_trace(events):
+    """Converte uma lista de eventos no texto do log"""
+    lines = (format_event(event) for event in events)
+    return '\n'.join(line for line in lines if line is not None) + '\n'
+
+
+def format_event(event):
+    kind = event['event']
+
+    if kind == 'start':
+        if event['method'] == 'graphical':
+            return _format_graphical_problem(event)
+        if event['method'] == 'two_phase':
+            text = "\n=== MÉTODO DAS DUAS FASES ==="
+        elif event['method'] == 'standard':
+            text = "\n=== MÉTODO SIMPLEX PADRÃO ==="
+        elif event['method'] == 'minimization':
+            return ("\n=== SIMPLEX PARA MINIMIZAÇÃO ===\n"
+                    "Convertendo problema de minimização para maximização...")
+        else:
+            text = f"\n=== MÉTODO BIG M ===\nUsando M = {event['M']}"
+        if 'artificial' in event:
+            text += f"\nVariáveis artificiais: {[f'x_{v+1}' for v in event['artificial']]}"
+        if event.get('pricing', 'dantzig') != 'dantzig':
+            text += f"\nPrecificação: {event['pricing']}"
+        return text
+
+    if kind == 'presolve':
+        removed = ', '.join(f"{name}: {count}" for name, count in event['removed'].items() if count)
+        return (f"\n=== PRESOLVE ===\n"
+                f"Restrições: {event['rows']} -> {event['reduced_rows']}\n"
+                f"Variáveis: {event['cols']} -> {event['reduced_cols']}"
+                + (f"\nLimites superiores (sem linhas extras): {event['bounded']}" if event.get('bounded') else "")
+                + (f"\nRemovidas: {removed}" if removed else ""))
+
+    if kind == 'scaling':
+        return (f"\n=== ESCALA ===\n"
+                f"Razão max/min dos coeficientes de A: {event['ratio']:.3g} -> {event['scaled_ratio']:.3g}\n"
+                f"(o tableau abaixo está escalado; a solução é desescalada ao final)")
+
+    if kind == 'bounds':
+        return (f"\n=== LIMITES DAS VARIÁVEIS ===\n"
+                f"Limites superiores: {event['bounded']}, deslocadas: {event['shifted']}, "
+                f"espelhadas: {event['mirrored']}\n"
+                f"(o tableau abaixo está em x' = x - l ou x' = u - x, com 0 <= x' <= u - l)")
+
+    if kind == 'phase':
+        return f"\n=== FASE {'I' * event['phase']} ==="
+
+    if kind == 'warm_start':
+        if event['accepted']:
+            return f"Partindo da base fornecida: {[f'x_{v+1}' for v in event['base']]}"
+        if event['reason'] == 'invalid':
+            return "Base de partida inválida - usando a base inicial"
+        return "Base de partida singular ou infactível - usando a base inicial"
+
+    if kind == 'iteration':
+        return (f"\n--- Iteração {event['iteration']} ---\n"
+                f"Variável entrante: x_{event['entering'] + 1}\n"
+                f"Variável sainte: x_{event['leaving'] + 1}")
+
+    if kind == 'bound_flip':
+        side = 'superior' if event['at_upper'] else 'inferior'
+        return (f"\n--- Iteração {event['iteration']} ---\n"
+                f"Variável x_{event['variable'] + 1} passa ao limite {side} (sem troca de base)")
+
+    if kind == 'dual_iteration':
+        return (f"\n--- Iteração dual {event['iteration']} ---\n"
+                f"Variável sainte: x_{event['leaving'] + 1}\n"
+                f"Variável entrante: x_{event['entering'] + 1}")
+
+    if kind == 'unbounded':
+        return (f"\n--- Iteração {event['iteration']} ---\n"
+                f"Variável entrante: x_{event['entering'] + 1}")
+
+    if kind == 'stall':
+        return f"\nObjetivo estacionado há {event['pivots']} pivôs - usando a regra de Bland"
+
+    if kind == 'limit':
+        return f"\n=== LIMITE ATINGIDO ===\n{event['message']}"
+
+    if kind == 'optimal':
+        return f"\n--- Iteração {event['iteration']} ---\nSolução ótima encontrada!"
+
+    if kind == 'snapshot':
+        return _format_snapshot(event)
+
+    if kind == 'conversion':
+        return (f"\nConversão concluída:\n"
+                f"Valor da maximização: {event['max_value']:.6f}\n"
+                f"Valor da minimização: {event['min_value']:.6f}")
+
+    if kind == 'unbounded_region':
+        return ("ATENÇÃO: A região factível pode ser ilimitada!\n"
+                "Verificando se a função objetivo é limitada...")
+
+    if kind == 'vertices':
+        return f"\nVértices da região factível ({event['count']} encontrados):"
+
+    if kind == 'vertex':
+        return (f"Vértice {event['index']}: ({event['point'][0]:.4f}, {event['point'][1]:.4f}) "
+                f"-> f = {event['value']:.4f}")
+
+    if kind == 'graphical_optimal':
+        return (f"\nSolução ótima: x₁ = {event['point'][0]:.4f}, x₂ = {event['point'][1]:.4f}\n"
+                f"Valor ótimo: f* = {event['value']:.4f}")
+
+    return None
+
+
+def _format_snapshot(event):
+    lines = ["Tableau inicial:"] if event['initial'] else []
+
+    if 'tableau' not in event:
+        lines.append("\nBase:")
+        for var, value in zip(event['base'], event['rhs']):
+            lines.append(f"x_{var+1} = {value:.3f}")
+        lines.append(f"z = {event['objective']:.3f}")
+        lines.extend(_format_at_upper(event))
+        return '\n'.join(lines)
+
+    tableau = np.asarray(event['tableau'])
+    lines.append("\nTableau:")
+    lines.append("Base\t" + "".join(f"x_{j+1}\t" for j in range(tableau.shape[1])) + "RHS")
+    for var, row, value in zip(event['base'], tableau, event['rhs']):
+        lines.append(f"x_{var+1}\t" + "".join(f"{v:.3f}\t" for v in row) + f"{value:.3f}")
+    lines.append("z\t" + "".join(f"{rc:.3f}\t" for rc in event['reduced_costs']) + f"{event['objective']:.3f}")
+    lines.extend(_format_at_upper(event))
+    return '\n'.join(lines)
+
+
+def _format_at_upper(event):
+    if not event.get('at_upper'):
+        return []
+    return ["No limite superior: " + ", ".join(f"x_{j+1}" for j in event['at_upper'])]
+
+
+def _format_graphical_problem(event):
+    c = event['c']
+    lines = [
+        "\n=== MÉTODO GRÁFICO ===",
+        f"Problema: {'Minimizar' if event['sense'] == 'min' else 'Maximizar'} f(x) = {c[0]}x₁ + {c[1]}x₂",
+        "Sujeito a:",
+    ]
+    for a, constraint_type, b in zip(event['A'], event['constraints_type'], event['b']):
+        lines.append(f"  {a[0]}x₁ + {a[1]}x₂ {constraint_type} {b}")
+    lines.append("  x₁, x₂ ≥ 0")
+    return '\n'.join(lines)
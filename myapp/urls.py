@@ -3,5 +3,12 @@ from . import views
 
 urlpatterns = [
     path('grafico/', views.solve_linear_program, name='solve'),
+    path('grafico/session/', views.create_graphical_session, name='create_graphical_session'),
+    path('grafico/session/<str:session_id>/', views.graphical_session, name='graphical_session'),
+    path('plots/<str:plot_id>.<str:extension>', views.plot_image, name='plot_image'),
     path('bigm/', views.solve_bigm, name='solve_bigm'),  
+    path('bigm/stream/', views.solve_bigm_stream, name='solve_bigm_stream'),
+    path('bigm/batch/', views.solve_bigm_batch, name='solve_bigm_batch'),
+    path('bigm/session/', views.create_bigm_session, name='create_bigm_session'),
+    path('bigm/session/<str:session_id>/', views.bigm_session, name='bigm_session'),
 ]
\ No newline at end of file
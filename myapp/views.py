@@ -1,86 +1,265 @@
 # myapp/views.py
 
-import io
-import base64
 import json
-import sys
-from django.http import JsonResponse
+import time
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
-from .graphical_method import GraphicalMethod
 from django.shortcuts import render
-from .big_m import SimplexBigM 
+from .executor import SolverTimeout, run_solver_async
+from .plot_renderer import FORMATS
+from .plot_store import load_plot, save_plot_image, store_plot
+from .result_cache import CachedProblem, solve_once
+from .tasks import (batch_size, create_bigm_session_task, create_graphical_session_task, problem_size,
+                    render_plot_task, solve_batch_task, solve_bigm_task, solve_graphical_task)
+from .solve_sessions import GraphicalSession, SolveSession, asave_session, save_session, load_session, delete_session
+from .streaming import QueueSink, encode_stream, stream_solve
+from .trace import request_sink, trace_response
 
 def index(request):
     return render(request, 'main.html')
 
+async def cached_solve(task, data, kind):
+    """Resultado do cache de PLs resolvidos ou do solver, uma vez por modelo
+
+    Requisições idênticas em andamento (mesma chave canônica) compartilham um
+    único solve; veja result_cache.solve_once.
+    """
+    def compute():
+        return run_solver_async(task, (data,), problem_size(data))
+
+    problem = CachedProblem.for_request(data, kind)
+    if problem is None:
+        return await compute()
+    return await solve_once(problem, compute)
+
 @csrf_exempt  
-def solve_linear_program(request):
+async def solve_linear_program(request):
     if request.method == 'POST':
         data = json.loads(request.body)
-        c = data['c']
-        A = data['A']
-        b = data['b']
-        sense = data.get('sense', 'max')
-        constraints_type = data.get('constraints_type', None)
 
         try:
-            gm = GraphicalMethod(c, A, b, sense=sense, constraints_type=constraints_type)
-            point, value = gm.solve()
-
-        # Gerar gráfico e salvar em memória
-            fig = gm._plot_solution(gm._find_vertices(), tuple(point))  # <- aqui está a correção
-            buf = io.BytesIO()
-            fig.savefig(buf, format='png')
-            buf.seek(0)
-            img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-            buf.close()
-
-            return JsonResponse({
-                'solution_point': point.tolist(),
-                'optimal_value': value,
-                'plot_image': img_base64
-            })
+            response = await cached_solve(solve_graphical_task, data, 'graphical')
+            if 'plot_image' not in response and 'geometry' not in response:
+                # O gráfico é buscado à parte, por URL (endereçada pelo conteúdo)
+                plot_id, extension = await store_plot(data)
+                response = dict(response, plot_url=reverse('plot_image', args=[plot_id, extension]))
+            return JsonResponse(response)
+
+        except SolverTimeout as e:
+            return JsonResponse({'error': str(e)}, status=504)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+    return JsonResponse({'message': 'Only POST allowed'}, status=405)
+
+@csrf_exempt
+async def solve_bigm(request):
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+
+            # Modelos grandes vão para o pool de processos (com timeout); a
+            # espera acontece numa thread do executor, fora do event loop
+            return JsonResponse(await cached_solve(solve_bigm_task, data, 'bigm'))
+
+        except SolverTimeout as e:
+            return JsonResponse({'error': str(e)}, status=504)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+    return JsonResponse({'message': 'Only POST allowed'}, status=405)
+
+# Um gráfico nunca muda para um mesmo endereço: o navegador pode guardá-lo para sempre
+PLOT_CACHE_CONTROL = 'public, max-age=31536000, immutable'
 
+async def plot_image(request, plot_id, extension):
+    """Serve o gráfico de /grafico/ pelo seu endereço (sha256 da especificação)
+
+    A imagem é renderizada no primeiro acesso e guardada no cache; o ETag é o
+    próprio endereço, então revalidações respondem 304 sem consultar o cache.
+    """
+    etag = f'"{plot_id}"'
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+    else:
+        entry = await load_plot(plot_id)
+        if entry is None or entry['spec']['plot']['format'] != extension:
+            return JsonResponse({'error': 'Gráfico não encontrado ou expirado'}, status=404)
+
+        image = entry.get('image')
+        if image is None:
+            try:
+                image, _ = await run_solver_async(render_plot_task, (entry['spec'],), 0)
+            except Exception as e:
+                return JsonResponse({'error': str(e)}, status=400)
+            await save_plot_image(plot_id, entry, image)
+        response = HttpResponse(image, content_type=FORMATS[extension])
+
+    response['ETag'] = etag
+    response['Cache-Control'] = PLOT_CACHE_CONTROL
+    return response
+
+@csrf_exempt
+async def solve_bigm_stream(request):
+    """Big M com o progresso transmitido iteração a iteração
+
+    Mesmo corpo de /bigm/. A resposta é NDJSON (um evento por linha) ou
+    server-sent events se o cliente pedir `Accept: text/event-stream`; o
+    último evento é 'result' (a resposta de /bigm/) ou 'error'. Com "log":
+    true cada evento traz também sua linha do log em 'text'. O solve ocupa uma
+    thread do executor (SOLVER_ASYNC_WORKERS) e respeita SOLVER_TIMEOUT a cada
+    evento; a resposta é um iterador assíncrono, sem bufferizar o log.
+    """
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
         except Exception as e:
             return JsonResponse({'error': str(e)}, status=400)
 
+        timeout = getattr(settings, 'SOLVER_TIMEOUT', None)
+        sink = QueueSink(snapshots=bool(data.get('snapshots', data.get('log', False))),
+                         deadline=None if timeout is None else time.monotonic() + timeout)
+        sse = 'text/event-stream' in request.headers.get('Accept', '')
+        text = bool(data.get('log'))
+
+        events = encode_stream(stream_solve(solve_bigm_task, data, sink), sse=sse, text=text)
+        response = StreamingHttpResponse(events, content_type='text/event-stream' if sse else 'application/x-ndjson')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # desliga o buffer de proxies (nginx)
+        return response
+
     return JsonResponse({'message': 'Only POST allowed'}, status=405)
 
 @csrf_exempt
-def solve_bigm(request):
+async def solve_bigm_batch(request):
+    """Resolve uma lista de PLs numa única requisição
+
+    Corpo: {"problems": [{"c": ..., "A": ..., "b": ..., "sense": ..., "constraints_type": ...}, ...]}
+    Resposta: {"results": [...]} na mesma ordem, cada um com 'status' ('optimal',
+    'limit_reached' ou 'error'). max_iterations e time_limit valem para o lote;
+    lotes grandes vão para o pool de processos, com SOLVER_TIMEOUT.
+    """
     if request.method == 'POST':
         try:
             data = json.loads(request.body)
+            return JsonResponse(await run_solver_async(solve_batch_task, (data,), batch_size(data)))
+
+        except SolverTimeout as e:
+            return JsonResponse({'error': str(e)}, status=504)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=400)
 
-            c = data['c']
-            A = data['A']
-            b = data['b']
-            sense = data.get('sense', 'max')
-            constraints_type = data.get('constraints_type', None)
+    return JsonResponse({'message': 'Only POST allowed'}, status=405)
 
-            # Redirecionar stdout para capturar os prints
-            log_buffer = io.StringIO()
-            sys_stdout = sys.stdout
-            sys.stdout = log_buffer
+@csrf_exempt
+async def create_bigm_session(request):
+    """Resolve o modelo e mantém o tableau final no servidor para edições
 
-            # Resolver o problema
-            solver = SimplexBigM(c, A, b, sense=sense, constraints_type=constraints_type)
-            solution, optimal_value = solver.solve()
+    O solve inicial passa por run_solver_async, como /bigm/: modelos grandes
+    vão para o pool de processos, com SOLVER_TIMEOUT.
+    """
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
 
-            # Restaurar o stdout
-            sys.stdout = sys_stdout
+            session, response = await run_solver_async(create_bigm_session_task, (data,), problem_size(data))
+            session_id = await asave_session(session)
+            return JsonResponse(dict(response, session_id=session_id))
+
+        except SolverTimeout as e:
+            return JsonResponse({'error': str(e)}, status=504)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+    return JsonResponse({'message': 'Only POST allowed'}, status=405)
+
+@csrf_exempt
+def bigm_session(request, session_id):
+    """Aplica edições (set_rhs, add_constraint, remove_constraint) e re-otimiza
+
+    Corpo: {"edits": [{"op": "set_rhs", "index": 0, "value": 5}, ...]}
+    As edições de uma requisição valem juntas: se alguma falha (p.ex. deixa o
+    modelo infactível) a resposta é 400 e a sessão continua como estava.
+    """
+    if request.method == 'DELETE':
+        delete_session(session_id)
+        return JsonResponse({'session_id': session_id, 'deleted': True})
+
+    if request.method == 'POST':
+        session = load_session(session_id)
+        if not isinstance(session, SolveSession):
+            return JsonResponse({'error': 'Sessão não encontrada ou expirada'}, status=404)
+
+        try:
+            data = json.loads(request.body)
+            edits = data.get('edits', [data])
+
+            sink = request_sink(data)
+            for edit in edits:
+                session.apply(edit, trace=sink)
+            save_session(session, session_id)
+
+            return JsonResponse(dict(session.result(), session_id=session_id, **trace_response(data, sink)))
+
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+    return JsonResponse({'message': 'Only POST or DELETE allowed'}, status=405)
+
+@csrf_exempt
+async def create_graphical_session(request):
+    """Resolve o modelo de 2 variáveis e mantém o polígono factível no servidor
+
+    Como em create_bigm_session, a construção do polígono passa por run_solver_async.
+    """
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+
+            session, response = await run_solver_async(create_graphical_session_task, (data,),
+                                                       problem_size(data))
+            session_id = await asave_session(session)
+            return JsonResponse(dict(response, session_id=session_id))
+
+        except SolverTimeout as e:
+            return JsonResponse({'error': str(e)}, status=504)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+    return JsonResponse({'message': 'Only POST allowed'}, status=405)
+
+@csrf_exempt
+def graphical_session(request, session_id):
+    """Aplica edições (add_constraint, remove_constraint, set_constraint) ao polígono
+
+    Corpo: {"edits": [{"op": "set_constraint", "index": 0, "a": [1, 2], "type": "<=", "b": 8}, ...]}
+    Como em bigm_session, se alguma edição falha ou a região fica vazia a
+    resposta é 400 e a sessão continua como estava.
+    """
+    if request.method == 'DELETE':
+        delete_session(session_id)
+        return JsonResponse({'session_id': session_id, 'deleted': True})
+
+    if request.method == 'POST':
+        session = load_session(session_id)
+        if not isinstance(session, GraphicalSession):
+            return JsonResponse({'error': 'Sessão não encontrada ou expirada'}, status=404)
+
+        try:
+            data = json.loads(request.body)
+            edits = data.get('edits', [data])
 
-            # Pegar conteúdo do log
-            log_text = log_buffer.getvalue()
+            for edit in edits:
+                session.apply(edit)
 
-            return JsonResponse({
-                'solution': solution.tolist(),
-                'optimal_value': optimal_value,
-                'log': log_text  # <-- envia o log para o frontend
-            })
+            sink = request_sink(data)
+            result = session.result(sink)
+            save_session(session, session_id)
+            return JsonResponse(dict(result, session_id=session_id, **trace_response(data, sink)))
 
         except Exception as e:
-            sys.stdout = sys_stdout  # garantir que restaura mesmo com erro
             return JsonResponse({'error': str(e)}, status=400)
 
-    return JsonResponse({'message': 'Only POST allowed'}, status=405)
\ No newline at end of file
+    return JsonResponse({'message': 'Only POST or DELETE allowed'}, status=405)
@@ -121,6 +121,8 @@ document.querySelectorAll('.btn-primary, .btn-secondary').forEach(btn => {
 class LinearProgrammingMethods {
     constructor() {
         this.currentMethod = null;
+        this.graficoModel = null;    // último modelo resolvido pelo método gráfico
+        this.graficoSession = null;  // {id, model}: polígono mantido no servidor
         this.init();
     }
 
@@ -651,20 +653,15 @@ class LinearProgrammingMethods {
             }
         });
     
-        fetch('/api/grafico/', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                c: [c1, c2],
-                A: A,
-                b: b,
-                sense: tipo === 'max' ? 'max' : 'min',  // ajuste conforme seu select
-                constraints_type: constraints_type
-            })
-        })
-        .then(response => response.json())
+        const model = {
+            c: [c1, c2],
+            A: A,
+            b: b,
+            sense: tipo === 'max' ? 'max' : 'min',  // ajuste conforme seu select
+            constraints_type: constraints_type
+        };
+
+        this.solveGrafico(model)
        .then(data => {
         if (data.error) {
             console.error("Erro:", data.error);
@@ -674,14 +671,136 @@ class LinearProgrammingMethods {
 
         alert(`Solução: ponto ${data.solution_point}, valor ótimo ${data.optimal_value}`);
 
-        // Exibir gráfico
-        if (data.plot_image) {
-            const imgTag = `<img src="data:image/png;base64,${data.plot_image}" alt="Gráfico da Solução" style="max-width: 100%; border: 1px solid #ccc; margin-top: 15px;" />`;
+        // Exibir gráfico: desenhado a partir da geometria ou carregado pela URL
+        if (data.geometry) {
+            document.getElementById('grafico-solucao').innerHTML = this.drawGeometry(data.geometry);
+            return;
+        }
+        const plotSrc = data.plot_url || (data.plot_image && `data:${data.plot_mime || 'image/png'};base64,${data.plot_image}`);
+        if (plotSrc) {
+            const imgTag = `<img src="${plotSrc}" loading="lazy" decoding="async" alt="Gráfico da Solução" style="max-width: 100%; border: 1px solid #ccc; margin-top: 15px;" />`;
             document.getElementById('grafico-solucao').innerHTML = imgTag;
         }
     })
     }        
            
+    solveGrafico(model) {
+        // Envio normal pelo /grafico/ (cache, pool de processos); só quando o
+        // usuário adiciona, remove ou edita uma linha a sessão entra em cena
+        // e o servidor apenas recorta o polígono já calculado
+        const post = (url, body) => fetch(url, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(body)
+        });
+        const create = () => post('/grafico/session/', model)
+            .then(response => response.json())
+            .then(data => {
+                this.graficoSession = data.session_id ? { id: data.session_id, model: model } : null;
+                return data;
+            });
+
+        const previous = this.graficoModel;
+        this.graficoModel = model;
+        const edits = previous && this.graficoEdits(previous, model);
+        if (!edits || (edits.length === 0 && !this.graficoSession)) {
+            this.graficoSession = null;
+            return post('/grafico/', { ...model, mode: 'geometry' })  // o gráfico é desenhado aqui no navegador
+                .then(response => response.json());
+        }
+        if (!this.graficoSession) {
+            return create();
+        }
+        const sessionEdits = this.graficoEdits(this.graficoSession.model, model);
+        if (!sessionEdits) {
+            return create();
+        }
+        return post(`/grafico/session/${this.graficoSession.id}/`, { edits: sessionEdits })
+            .then(response => {
+                if (response.status === 404) {
+                    return create();  // sessão expirada
+                }
+                return response.json().then(data => {
+                    if (!data.error) {
+                        this.graficoSession.model = model;
+                    } else {
+                        this.graficoSession = null;
+                    }
+                    return data;
+                });
+            });
+    }
+
+    graficoEdits(previous, model) {
+        // Edições que levam o modelo anterior ao atual, ou null se não for uma só linha
+        if (previous.sense !== model.sense || previous.c.join() !== model.c.join()) {
+            return null;
+        }
+        const rows = m => m.b.map((bi, i) => ({ a: m.A[i], type: m.constraints_type[i], b: bi }));
+        const key = row => `${row.a.join()}|${row.type}|${row.b}`;
+        const before = rows(previous), after = rows(model);
+        let first = 0;
+        while (first < before.length && first < after.length && key(before[first]) === key(after[first])) {
+            first++;
+        }
+        const suffix = (list, from) => list.slice(from).map(key).join(';');
+        if (before.length === after.length) {
+            if (first === before.length) {
+                return [];
+            }
+            return suffix(before, first + 1) === suffix(after, first + 1)
+                ? [{ op: 'set_constraint', index: first, ...after[first] }] : null;
+        }
+        if (after.length === before.length + 1 && first === before.length) {
+            return [{ op: 'add_constraint', ...after[first] }];
+        }
+        if (before.length === after.length + 1 && suffix(before, first + 1) === suffix(after, first)) {
+            return [{ op: 'remove_constraint', index: first }];
+        }
+        return null;
+    }
+
+    drawGeometry(geometry) {
+        // SVG da região factível, restrições, curvas de nível e ótimo (y para cima)
+        const [xmin, xmax, ymin, ymax] = geometry.box;
+        const size = 500;
+        const sx = x => ((x - xmin) / (xmax - xmin) * size).toFixed(2);
+        const sy = y => (size - (y - ymin) / (ymax - ymin) * size).toFixed(2);
+        const colors = ['red', 'purple', 'orange', 'brown', 'pink', 'gray', 'olive'];
+        const line = (segment, attrs) => segment
+            ? `<line x1="${sx(segment[0][0])}" y1="${sy(segment[0][1])}" x2="${sx(segment[1][0])}" y2="${sy(segment[1][1])}" ${attrs}/>`
+            : '';
+
+        const parts = [];
+        parts.push(`<line x1="${sx(xmin)}" y1="${sy(0)}" x2="${sx(xmax)}" y2="${sy(0)}" stroke="#999"/>`);
+        parts.push(`<line x1="${sx(0)}" y1="${sy(ymin)}" x2="${sx(0)}" y2="${sy(ymax)}" stroke="#999"/>`);
+        if (geometry.polygon.length >= 3) {
+            const points = geometry.polygon.map(([x, y]) => `${sx(x)},${sy(y)}`).join(' ');
+            parts.push(`<polygon points="${points}" fill="lightblue" fill-opacity="0.5" stroke="blue" stroke-width="2"><title>Região Factível</title></polygon>`);
+        } else if (geometry.polygon.length === 2) {
+            parts.push(line(geometry.polygon, 'stroke="blue" stroke-width="3"'));
+        }
+        geometry.constraints.forEach(constraint => {
+            const dash = constraint.type === '=' ? '' : 'stroke-dasharray="6 4"';
+            parts.push(line(constraint.segment, `stroke="${colors[constraint.index % colors.length]}" stroke-width="2" ${dash}`)
+                .replace('/>', `><title>${constraint.label}</title></line>`));
+        });
+        geometry.objective_lines.forEach(level => {
+            const style = level.optimal ? '' : 'stroke-dasharray="2 4" stroke-opacity="0.5"';
+            parts.push(line(level.segment, `stroke="green" stroke-width="2" ${style}`)
+                .replace('/>', `><title>f = ${level.value.toFixed(2)}</title></line>`));
+        });
+        geometry.vertices.forEach(([x, y], i) => {
+            parts.push(`<circle cx="${sx(x)}" cy="${sy(y)}" r="4" fill="red"><title>V${i + 1} (${x.toFixed(2)}, ${y.toFixed(2)})</title></circle>`);
+        });
+        if (geometry.optimum) {
+            const [x, y] = geometry.optimum;
+            parts.push(`<circle cx="${sx(x)}" cy="${sy(y)}" r="8" fill="limegreen" stroke="darkgreen" stroke-width="2"><title>Solução Ótima (${x.toFixed(3)}, ${y.toFixed(3)})</title></circle>`);
+        }
+
+        return `<svg viewBox="0 0 ${size} ${size}" style="max-width: 100%; border: 1px solid #ccc; margin-top: 15px; background: white;">${parts.join('')}</svg>`;
+    }
+
     resolverSimplex() {
         console.log('Resolvendo pelo método Simplex...');
         // Aqui seria implementada a lógica de resolução
@@ -739,8 +858,10 @@ class LinearProgrammingMethods {
                 constraints_type.push(tipoRestricao);
             });
 
-            // Enviando dados para o backend Django via POST
-            fetch('/bigm/', {
+            // Enviando dados para o backend Django via POST; o log chega
+            // iteração a iteração (NDJSON) e é exibido à medida que chega
+            this.showBigMProgress();
+            fetch('/bigm/stream/', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
@@ -750,13 +871,23 @@ class LinearProgrammingMethods {
                     A: A,
                     b: b,
                     constraints_type: constraints_type,
+                    log: true,  // o log só é gerado quando pedido
                 }),
             })
-            .then(response => response.json())
-            .then(result => {
-                // Exibir o resultado na tela
-                this.showBigMResult(result);
-            })
+            .then(response => this.readEventStream(response, event => {
+                if (event.event === 'result') {
+                    // Exibir o resultado na tela
+                    this.showBigMResult(event);
+                } else if (event.event === 'error') {
+                    alert(`Erro: ${event.error}`);
+                } else if (event.text) {
+                    this.appendBigMLog(event.text);
+                }
+            }))
+            .catch(error => {
+                console.error('Erro no resolverBigM:', error);
+                alert(`Erro: ${error.message}`);
+            });
 
         } catch (error) {
             console.error('Erro no resolverBigM:', error);
@@ -764,8 +895,63 @@ class LinearProgrammingMethods {
         }
     }
 
+    async readEventStream(response, onEvent) {
+        // Lê uma resposta NDJSON linha a linha, chamando onEvent para cada evento
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const { done, value } = await reader.read();
+            buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            lines.filter(line => line.trim()).forEach(line => onEvent(JSON.parse(line)));
+            if (done) break;
+        }
+        if (buffer.trim()) onEvent(JSON.parse(buffer));
+    }
+
+    showBigMProgress() {
+        const container = document.getElementById('bigm-solution-content');
+        this.bigmLog = '';
+
+        container.innerHTML = `
+            <div style="
+                background-color: #000;
+                color: #00ff00;
+                font-family: 'Courier New', monospace;
+                padding: 15px;
+                border-radius: 6px;
+                white-space: pre-wrap;
+                overflow-x: auto;
+                max-height: 400px;
+            ">
+                <p><strong>Resolvendo...</strong></p>
+                <h4>Log do Algoritmo</h4>
+                <pre id="bigm-log"></pre>
+            </div>
+        `;
+
+        const resultSection = document.getElementById('bigm-result-section');
+        if (resultSection.style.display === 'none') {
+            resultSection.style.display = 'block';
+        }
+    }
+
+    appendBigMLog(text) {
+        this.bigmLog += text + '\n';
+        const pre = document.getElementById('bigm-log');
+        if (pre) pre.textContent += text + '\n';
+    }
+
     showBigMResult(result) {
         const container = document.getElementById('bigm-solution-content');
+        const log = result.log || this.bigmLog;
+        // Parada por limite de iterações/tempo: melhor base encontrada, não o ótimo
+        const summary = result.status === 'limit_reached'
+            ? `<p><strong>Solver interrompido:</strong> ${result.message}</p>
+                <p><strong>Valor do objetivo na base atual${result.feasible ? '' : ' (infactível)'}:</strong> ${result.objective}</p>`
+            : `<p><strong>Valor ótimo:</strong> ${result.optimal_value}</p>`;
     
         container.innerHTML = `
             <div style="
@@ -778,10 +964,10 @@ class LinearProgrammingMethods {
                 overflow-x: auto;
                 max-height: 400px;
             ">
-                <p><strong>Valor ótimo:</strong> ${result.optimal_value}</p>
+                ${summary}
                 <p><strong>Solução (valores das variáveis):</strong> [${result.solution.join(', ')}]</p>
                 <h4>Log do Algoritmo</h4>
-                <pre>${result.log || 'Nenhum log disponível.'}</pre>
+                <pre>${log || 'Nenhum log disponível.'}</pre>
             </div>
         `;
     
@@ -124,3 +124,47 @@ STATICFILES_DIRS = [
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Caches
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# 'solver' holds solved LP results keyed by a canonical hash of the model. LocMem
+# evicts least-recently-used entries past MAX_ENTRIES; point it at a file,
+# database or Redis backend to share results across worker processes.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'solver': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'solver-results',
+        'TIMEOUT': 3600,
+        'OPTIONS': {'MAX_ENTRIES': 1024},
+    },
+}
+
+# Solver settings (myapp)
+
+# Seconds a solve session (tableau kept for incremental edits) stays in the cache
+SOLVE_SESSION_TIMEOUT = 3600
+
+# Worker processes for CPU-heavy solves (0 solves everything in the request thread)
+SOLVER_POOL_WORKERS = 2
+
+# Models with at most this many nonzeros in A are solved inline, skipping dispatch overhead
+SOLVER_INLINE_MAX_SIZE = 2500
+
+# Wall-clock limit in seconds for a pooled solve; the child process is killed when exceeded
+SOLVER_TIMEOUT = 30
+
+# Pivot cap and wall-clock budget (seconds) for a single solve; requests may ask for less
+# via "max_iterations"/"time_limit". The budget stays below SOLVER_TIMEOUT so the solver
+# returns its best basis ("status": "limit_reached") before the pool kills the worker
+SOLVER_MAX_ITERATIONS = 100000
+SOLVER_TIME_LIMIT = 25
+
+# Threads the async views use to run solves off the event loop (bounds in-flight solves per process)
+SOLVER_ASYNC_WORKERS = 8
+
+# Seconds a plot specification (and its rendered image) stays in the 'solver' cache
+PLOT_CACHE_TIMEOUT = 86400